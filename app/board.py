@@ -0,0 +1,294 @@
+import logging
+import threading
+from toy_robot import ToyRobot, DELTA_X, DELTA_Y
+from validation import parse_count
+
+
+def _parse_id(text):
+    """
+    Parse a robot id written with ASCII digits, returning None if it is not one.
+    """
+    if text.isascii() and text.isdigit():
+        try:
+            return int(text)
+        except ValueError:  # longer than sys.get_int_max_str_digits()
+            return None
+
+
+class Board:
+    def __init__(self, board_width=5, board_height=5, quiet=False):
+        """
+        Initialize a board shared by several robots, addressed by integer ids.
+
+        The occupied cells are kept in a dict from cell index (y * board_width + x) to
+        robot id, so collision checks do not depend on the number of robots.
+
+        Parameters:
+        - board_width (int): Width of the board.
+        - board_height (int): Height of the board.
+        - quiet (bool): Create the robots in quiet mode (see ToyRobot).
+        """
+        self.board_width = board_width
+        self.board_height = board_height
+        self.quiet = quiet
+        self.robots = {}
+        self.occupied = {}
+        self.active_id = 1
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def robot(self, robot_id):
+        """
+        Return the robot with the given id, adding it to the board if needed.
+
+        Parameters:
+        - robot_id (int): Id of the robot.
+
+        Returns:
+        - ToyRobot: The robot.
+        """
+        robot = self.robots.get(robot_id)
+        if robot is None:
+            robot = self.robots[robot_id] = ToyRobot(self.board_width, self.board_height, self.quiet)
+        return robot
+
+    def robot_at(self, x, y):
+        """
+        Return the id of the robot standing on a cell.
+
+        Parameters:
+        - x (int): The x-coordinate.
+        - y (int): The y-coordinate.
+
+        Returns:
+        - int: The robot id, or None if the cell is free.
+        """
+        return self.occupied.get(y * self.board_width + x)
+
+    def place(self, robot_id, command):
+        """
+        Place a robot with a PLACE command, unless another robot stands on the cell.
+
+        Parameters:
+        - robot_id (int): Id of the robot.
+        - command (str): PLACE command in the form 'PLACE X,Y,F'.
+        """
+        robot = self.robot(robot_id)
+        result = robot.validator.validate_place(command)
+        if not result['is_valid']:
+            robot.message = result['message']
+            self.logger.error(result['message'])
+            return
+        cell = result['y'] * self.board_width + result['x']
+        previous_cell = robot.y * self.board_width + robot.x if robot.is_placed else None
+        other_id = self._claim(robot_id, cell, previous_cell)
+        if other_id is not None:
+            robot.message = f"Cell ({result['x']}, {result['y']}) is occupied by robot {other_id}."
+            self.logger.error(robot.message)
+            return
+        robot.place_at(result['x'], result['y'], result['facing'])
+
+    def move(self, robot_id, steps=1):
+        """
+        Move a robot forward, one unit at a time, stopping in front of an occupied cell.
+
+        Each unit claims the next cell like a single MOVE, so MOVE N ends where N MOVE
+        commands would.
+
+        Parameters:
+        - robot_id (int): Id of the robot.
+        - steps (int): Number of units to move. Default is 1.
+        """
+        robot = self.robot(robot_id)
+        if not robot.is_placed:
+            robot.move()
+            return
+        index = robot.facing_index
+        x, y = robot.x, robot.y
+        units = 0
+        while units < steps:
+            to_x, to_y = x + DELTA_X[index], y + DELTA_Y[index]
+            if not (0 <= to_x < self.board_width and 0 <= to_y < self.board_height):
+                break
+            other_id = self._claim(robot_id, to_y * self.board_width + to_x, y * self.board_width + x)
+            if other_id is not None:
+                self.logger.warning('Robot %d blocked at (%d, %d) by robot %d', robot_id, x, y, other_id)
+                if not units:
+                    return
+                break
+            x, y = to_x, to_y
+            units += 1
+        # With no unit moved, the robot logs that it stopped at the edge
+        robot.move(units or 1)
+
+    def left(self, robot_id):
+        """
+        Rotate a robot 90 degrees to the left.
+        """
+        self.robot(robot_id).left()
+
+    def right(self, robot_id):
+        """
+        Rotate a robot 90 degrees to the right.
+        """
+        self.robot(robot_id).right()
+
+    def report(self, robot_id):
+        """
+        Report the position and direction of a robot.
+
+        Returns:
+        - str: The report output, or None if the robot is not placed.
+        """
+        return self.robot(robot_id).report()
+
+    def _claim(self, robot_id, cell, previous_cell=None):
+        """
+        Move the occupancy of a robot to a cell, unless another robot stands on it.
+
+        Parameters:
+        - robot_id (int): Id of the robot.
+        - cell (int): Index of the cell to claim.
+        - previous_cell (int): Index of the cell the robot leaves, or None if it is not placed.
+
+        Returns:
+        - int: The id of the robot standing on the cell, or None once the cell is claimed.
+        """
+        other_id = self.occupied.get(cell)
+        if other_id is not None and other_id != robot_id:
+            return other_id
+        if previous_cell is not None:
+            del self.occupied[previous_cell]
+        self.occupied[cell] = robot_id
+
+    def execute(self, command):
+        """
+        Parse and execute a board command.
+
+        Besides the single robot commands, which go to the active robot, the board accepts
+        'ROBOT <id> <command>' to send a command to a given robot and 'SWITCH <id>' to
+        change the active robot.
+
+        Parameters:
+        - command (str): (e.g., 'ROBOT 17 MOVE', 'ROBOT 17 MOVE 3', 'SWITCH 2', 'PLACE 0,0,NORTH', 'REPORT')
+
+        Returns:
+        - bool / str: False for an invalid command, the report output for REPORT
+        """
+        robot_id = self.active_id
+        if command.startswith('ROBOT ') or command.startswith('SWITCH '):
+            parts = command.split(None, 2)
+            robot_id = _parse_id(parts[1]) if len(parts) >= 2 else None
+            if robot_id is None or (parts[0] == 'SWITCH') != (len(parts) == 2):
+                self.logger.error(f"Invalid command: {command}")
+                return False
+            if parts[0] == 'SWITCH':
+                self.active_id = robot_id
+                self.robot(robot_id)
+                return
+            command = parts[2]
+
+        if command.startswith('PLACE'):
+            self.place(robot_id, command)
+        elif command == 'MOVE':
+            self.move(robot_id)
+        elif command.startswith('MOVE '):
+            steps = parse_count(command[5:])
+            if steps is None:
+                self.logger.error(f"Invalid command: {command}")
+                return False
+            self.move(robot_id, steps)
+        elif command == 'LEFT':
+            self.left(robot_id)
+        elif command == 'RIGHT':
+            self.right(robot_id)
+        elif command == 'REPORT':
+            return self.report(robot_id)
+        else:
+            self.logger.error(f"Invalid command: {command}")
+            return False
+
+
+class ConcurrentBoard(Board):
+    def __init__(self, board_width=5, board_height=5, quiet=False, stripes=64):
+        """
+        Initialize a board shared by robots driven from several threads.
+
+        Every robot has its own lock, held for the whole of each of its commands, so
+        commands on different robots run in parallel. The cells are guarded by a fixed
+        number of striped locks (cell index modulo stripes): PLACE and MOVE take the locks
+        of the cell they leave and of the cell they claim, in stripe order, and check and
+        claim the destination while holding them. Locks are always taken robot first, then
+        stripes in increasing order, so they cannot deadlock.
+
+        Send commands with 'ROBOT <id> <command>' from the workers, SWITCH changes the
+        active robot of every thread.
+
+        Parameters:
+        - board_width (int): Width of the board.
+        - board_height (int): Height of the board.
+        - quiet (bool): Create the robots in quiet mode (see ToyRobot).
+        - stripes (int): Number of cell locks. Default is 64, 1 serializes all PLACE and MOVE.
+        """
+        super().__init__(board_width, board_height, quiet)
+        self.stripes = tuple(threading.Lock() for _ in range(stripes))
+        self._robot_locks = {}
+        self._robots_lock = threading.Lock()
+
+    def robot(self, robot_id):
+        """
+        Return the robot with the given id, adding it to the board if needed.
+        """
+        robot = self.robots.get(robot_id)
+        if robot is None:
+            with self._robots_lock:
+                robot = self.robots.get(robot_id)
+                if robot is None:
+                    # The lock is published before the robot, see _locked
+                    self._robot_locks[robot_id] = threading.Lock()
+                    robot = self.robots[robot_id] = ToyRobot(self.board_width, self.board_height, self.quiet)
+        return robot
+
+    def _locked(self, robot_id):
+        """
+        Return the lock of a robot, adding the robot to the board if needed.
+        """
+        lock = self._robot_locks.get(robot_id)
+        if lock is None:
+            self.robot(robot_id)
+            lock = self._robot_locks[robot_id]
+        return lock
+
+    def place(self, robot_id, command):
+        with self._locked(robot_id):
+            super().place(robot_id, command)
+
+    def move(self, robot_id, steps=1):
+        with self._locked(robot_id):
+            super().move(robot_id, steps)
+
+    def left(self, robot_id):
+        with self._locked(robot_id):
+            super().left(robot_id)
+
+    def right(self, robot_id):
+        with self._locked(robot_id):
+            super().right(robot_id)
+
+    def report(self, robot_id):
+        with self._locked(robot_id):
+            return super().report(robot_id)
+
+    def _claim(self, robot_id, cell, previous_cell=None):
+        """
+        Check and claim a cell while holding the stripe locks of both cells.
+        """
+        count = len(self.stripes)
+        first = cell % count
+        second = first if previous_cell is None else previous_cell % count
+        if second < first:
+            first, second = second, first
+        with self.stripes[first]:
+            if second == first:
+                return super()._claim(robot_id, cell, previous_cell)
+            with self.stripes[second]:
+                return super()._claim(robot_id, cell, previous_cell)
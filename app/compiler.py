@@ -0,0 +1,242 @@
+import logging
+from array import array
+from toy_robot import FACINGS
+from validation import TableValidator, parse_count
+
+# Opcodes of a compiled command program.
+OP_PLACE = 0
+OP_MOVE = 1
+OP_LEFT = 2
+OP_RIGHT = 3
+OP_REPORT = 4
+OP_PLACE_ERROR = 5
+OP_INVALID = 6
+OP_MOVE_N = 7
+OP_TURN = 8
+
+_SIMPLE_OPCODES = {
+    'MOVE': OP_MOVE,
+    'LEFT': OP_LEFT,
+    'RIGHT': OP_RIGHT,
+    'REPORT': OP_REPORT,
+}
+
+# Commands that depend on the history of the robot and have no compiled form.
+_HISTORY_COMMANDS = frozenset(['UNDO', 'REDO'])
+
+
+class Program:
+    def __init__(self, board_width=5, board_height=5, obstacles=None):
+        """
+        Initialize an empty program compiled for a board of the specified dimensions.
+
+        The opcodes are stored one byte per command. Commands taking arguments read them
+        in order from the operands array: PLACE reads x, y and the facing index (see
+        toy_robot.FACINGS), MOVE_N reads the number of units, TURN reads the number of
+        clockwise quarter turns, while PLACE_ERROR and INVALID read an index into the
+        messages list.
+
+        Parameters:
+        - board_width (int): Width of the board the PLACE commands were validated against.
+        - board_height (int): Height of the board the PLACE commands were validated against.
+        - obstacles (ObstacleMap): Obstacles the PLACE commands were validated against. Default is None.
+        """
+        self.board_width = board_width
+        self.board_height = board_height
+        self.obstacles = obstacles
+        self.opcodes = array('B')
+        self.operands = array('i')
+        self.messages = []
+
+    def __len__(self):
+        return len(self.opcodes)
+
+    def _add_message(self, opcode, message):
+        self.opcodes.append(opcode)
+        self.operands.append(len(self.messages))
+        self.messages.append(message)
+
+
+def compile_commands(commands, board_width=5, board_height=5, obstacles=None):
+    """
+    Compile a stream of commands into a Program.
+
+    Commands are normalized like the console input (stripped and upper-cased), blank
+    lines are skipped and compilation stops at EXIT. PLACE commands are validated once
+    here so that running the program does no string work. UNDO and REDO depend on the
+    history of the robot, which a program does not keep, so they raise a ValueError
+    rather than being dropped.
+
+    Parameters:
+    - commands (iterable): Command strings, e.g. the lines of a replay file.
+    - board_width (int): Width of the board.
+    - board_height (int): Height of the board.
+    - obstacles (ObstacleMap): Obstacles of the board, PLACE on a blocked cell compiles to
+      a PLACE_ERROR. Default is None.
+
+    Returns:
+    - Program: The compiled program.
+    """
+    if obstacles is not None and (obstacles.board_width, obstacles.board_height) != (board_width, board_height):
+        raise ValueError('Obstacle map is %dx%d, program board is %dx%d.' % (
+            obstacles.board_width, obstacles.board_height, board_width, board_height))
+    program = Program(board_width, board_height, obstacles)
+    validator = TableValidator(board_width, board_height) if obstacles is None else obstacles.validator
+    opcodes = program.opcodes
+    operands = program.operands
+    simple_opcodes = _SIMPLE_OPCODES
+
+    for command in commands:
+        command = command.strip().upper()
+        if not command:
+            continue
+        opcode = simple_opcodes.get(command)
+        if opcode is not None:
+            opcodes.append(opcode)
+        elif command.startswith('MOVE ') and (steps := parse_count(command[5:])) is not None:
+            # Moving further than the board size ends at the edge, which keeps the operand small
+            opcodes.append(OP_MOVE_N)
+            operands.append(min(steps, max(board_width, board_height)))
+        elif command.startswith('PLACE'):
+            result = validator.validate_place(command)
+            if result['is_valid']:
+                opcodes.append(OP_PLACE)
+                operands.extend((result['x'], result['y'], FACINGS.index(result['facing'])))
+            else:
+                program._add_message(OP_PLACE_ERROR, result['message'])
+        elif command == 'EXIT':
+            break
+        elif command.partition(' ')[0] in _HISTORY_COMMANDS:
+            raise ValueError(f"Cannot compile '{command}': UNDO and REDO need the robot history, "
+                             "run the commands with main.py --history instead.")
+        else:
+            program._add_message(OP_INVALID, f"Invalid command: {command}")
+    return program
+
+
+def same_obstacles(obstacles, other):
+    """
+    Check if two obstacle maps (or None for no obstacles) block the same cells.
+    """
+    if obstacles is None or other is None:
+        return obstacles is other
+    return ((obstacles.board_width, obstacles.board_height) == (other.board_width, other.board_height)
+            and obstacles.blocked == other.blocked)
+
+
+def fold_runs(program):
+    """
+    Collapse runs of MOVE and of LEFT/RIGHT commands into single instructions.
+
+    A run of MOVEs becomes one MOVE_N, which moves the robot in one clamped step (the
+    count is capped at the board size, beyond which the robot stays at the edge), and a
+    run of rotations becomes one TURN by the net number of quarter turns modulo 4 (or is
+    dropped when they cancel out). The final robot state is the same as stepping through
+    every command, only the per-command log lines are merged.
+
+    Parameters:
+    - program (Program): Program returned by compile_commands.
+
+    Returns:
+    - Program: A new program with the runs collapsed.
+    """
+    folded = Program(program.board_width, program.board_height, program.obstacles)
+    # As in compile_commands, the robot is at the edge after moving the board size
+    max_steps = max(program.board_width, program.board_height)
+    opcodes = program.opcodes
+    operands = program.operands
+    length = len(opcodes)
+    i = 0
+    k = 0
+    while i < length:
+        opcode = opcodes[i]
+        if opcode == OP_MOVE:
+            start = i
+            while i < length and opcodes[i] == OP_MOVE:
+                i += 1
+            if i - start == 1:
+                folded.opcodes.append(OP_MOVE)
+            else:
+                folded.opcodes.append(OP_MOVE_N)
+                folded.operands.append(min(i - start, max_steps))
+            continue
+        if opcode == OP_LEFT or opcode == OP_RIGHT:
+            start = i
+            quarter_turns = 0
+            while i < length and (opcodes[i] == OP_LEFT or opcodes[i] == OP_RIGHT):
+                quarter_turns += 1 if opcodes[i] == OP_RIGHT else -1
+                i += 1
+            quarter_turns %= 4
+            if i - start == 1:
+                folded.opcodes.append(opcode)
+            elif quarter_turns:
+                folded.opcodes.append(OP_TURN)
+                folded.operands.append(quarter_turns)
+            continue
+
+        if opcode == OP_PLACE_ERROR or opcode == OP_INVALID:
+            folded._add_message(opcode, program.messages[operands[k]])
+            k += 1
+        else:
+            folded.opcodes.append(opcode)
+            if opcode == OP_PLACE:
+                folded.operands.extend(operands[k:k + 3])
+                k += 3
+            elif opcode == OP_MOVE_N or opcode == OP_TURN:
+                folded.operands.append(operands[k])
+                k += 1
+        i += 1
+    return folded
+
+
+def execute(program, robot):
+    """
+    Run a compiled program against a robot.
+
+    Parameters:
+    - program (Program): Program returned by compile_commands.
+    - robot (ToyRobot): Robot on a board with the dimensions and obstacles the program was
+      compiled for.
+
+    Returns:
+    - list: The outputs of the REPORT commands, in order.
+    """
+    if (robot.board_width, robot.board_height) != (program.board_width, program.board_height):
+        raise ValueError('Program was compiled for a %dx%d board, robot board is %dx%d.' % (
+            program.board_width, program.board_height, robot.board_width, robot.board_height))
+    if not same_obstacles(robot.obstacles, program.obstacles):
+        raise ValueError('Program was compiled for other obstacles than the robot board.')
+
+    outputs = []
+    operands = program.operands
+    messages = program.messages
+    move, left, right, report, place_at = robot.move, robot.left, robot.right, robot.report, robot.place_at
+    k = 0
+    for opcode in program.opcodes:
+        if opcode == OP_MOVE:
+            move()
+        elif opcode == OP_LEFT:
+            left()
+        elif opcode == OP_RIGHT:
+            right()
+        elif opcode == OP_PLACE:
+            place_at(operands[k], operands[k + 1], operands[k + 2])
+            k += 3
+        elif opcode == OP_REPORT:
+            output = report()
+            if output:
+                outputs.append(output)
+        elif opcode == OP_MOVE_N:
+            move(operands[k])
+            k += 1
+        elif opcode == OP_TURN:
+            robot.turn(operands[k])
+            k += 1
+        elif opcode == OP_PLACE_ERROR:
+            robot.message = messages[operands[k]]
+            robot.logger.error(robot.message)
+            k += 1
+        else:
+            logging.error(messages[operands[k]])
+            k += 1
+    return outputs
@@ -0,0 +1,223 @@
+from toy_robot import FACINGS, DELTA_X, DELTA_Y
+from journal import X_SHIFT, Y_SHIFT, Y_MASK
+from compiler import OP_PLACE, OP_MOVE, OP_LEFT, OP_RIGHT, OP_REPORT, OP_PLACE_ERROR, OP_INVALID, OP_MOVE_N, OP_TURN
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only RobotFleet needs it
+    np = None
+
+# Opcode used to pad the programs of robots that have already finished.
+OP_NOOP = 255
+
+# Number of operands read by the opcodes taking arguments (see compiler.Program).
+_OPERAND_COUNTS = {OP_PLACE: 3, OP_MOVE_N: 1, OP_TURN: 1, OP_PLACE_ERROR: 1, OP_INVALID: 1}
+
+# Number of (step, robot) commands gathered at once by RobotFleet.run.
+BLOCK_SIZE = 1 << 20
+
+
+class RobotFleet:
+    def __init__(self, size, board_width=5, board_height=5):
+        """
+        Initialize a fleet of independent robots, each on its own board of the specified dimensions.
+
+        The state of every robot is kept in NumPy arrays so that one command per robot is
+        applied to the whole fleet at once. Facing directions are indices into FACINGS and
+        robots that are not placed yet hold -1.
+
+        Parameters:
+        - size (int): Number of robots.
+        - board_width (int): Width of the board.
+        - board_height (int): Height of the board.
+        """
+        if np is None:
+            raise ImportError('RobotFleet requires NumPy to be installed.')
+        self.size = size
+        self.board_width = board_width
+        self.board_height = board_height
+        self.x = np.full(size, -1, dtype=np.int32)
+        self.y = np.full(size, -1, dtype=np.int32)
+        self.facing = np.full(size, -1, dtype=np.int8)
+        self.is_placed = np.zeros(size, dtype=bool)
+        self._delta_x = np.array(DELTA_X, dtype=np.int32)
+        self._delta_y = np.array(DELTA_Y, dtype=np.int32)
+
+    def step(self, opcodes, place_x=None, place_y=None, place_facing=None, counts=None):
+        """
+        Apply one command to every robot, following the same rules as ToyRobot.
+
+        Parameters:
+        - opcodes (ndarray): Opcode for each robot (compiler OP_* values or OP_NOOP).
+        - place_x (ndarray): X-coordinate for the robots with OP_PLACE.
+        - place_y (ndarray): Y-coordinate for the robots with OP_PLACE.
+        - place_facing (ndarray): Facing index for the robots with OP_PLACE.
+        - counts (ndarray): Units for the robots with OP_MOVE_N, quarter turns for OP_TURN.
+
+        Returns:
+        - ndarray: Indices of the placed robots that executed REPORT.
+        """
+        placed = self.is_placed
+
+        mask = opcodes == OP_PLACE
+        if mask.any():
+            self.x[mask] = place_x[mask]
+            self.y[mask] = place_y[mask]
+            self.facing[mask] = place_facing[mask]
+            placed[mask] = True
+
+        mask = (opcodes == OP_MOVE) & placed
+        if mask.any():
+            self._move(mask, 1)
+
+        mask = (opcodes == OP_MOVE_N) & placed
+        if mask.any():
+            self._move(mask, counts[mask])
+
+        mask = (opcodes == OP_LEFT) & placed
+        if mask.any():
+            facing = self.facing[mask]
+            self.facing[mask] = (facing & 4) | ((facing + 3) & 3)
+
+        mask = (opcodes == OP_RIGHT) & placed
+        if mask.any():
+            facing = self.facing[mask]
+            self.facing[mask] = (facing & 4) | ((facing + 1) & 3)
+
+        mask = (opcodes == OP_TURN) & placed
+        if mask.any():
+            facing = self.facing[mask]
+            self.facing[mask] = (facing & 4) | ((facing + counts[mask]) & 3)
+
+        return np.flatnonzero((opcodes == OP_REPORT) & placed)
+
+    def _move(self, mask, steps):
+        # Same partial move as ToyRobot.move: each robot goes as far as the edge allows on
+        # both axes, so a diagonal move stops when either coordinate reaches the edge.
+        facing = self.facing[mask]
+        x = self.x[mask]
+        y = self.y[mask]
+        delta_x = self._delta_x[facing]
+        delta_y = self._delta_y[facing]
+        room_x = np.where(delta_x > 0, self.board_width - 1 - x, np.where(delta_x < 0, x, steps))
+        room_y = np.where(delta_y > 0, self.board_height - 1 - y, np.where(delta_y < 0, y, steps))
+        steps = np.minimum(np.minimum(room_x, room_y), steps)
+        self.x[mask] = x + delta_x * steps
+        self.y[mask] = y + delta_y * steps
+
+    def run(self, programs, block_size=BLOCK_SIZE):
+        """
+        Run one compiled program per robot in lockstep.
+
+        The programs are concatenated into flat arrays, one entry per command, and the
+        commands of the next steps are gathered in blocks of about block_size commands, so
+        memory does not grow with the longest program times the number of robots.
+
+        Parameters:
+        - programs (list): One compiler Program per robot, compiled for this board size
+          without obstacles.
+        - block_size (int): Number of commands gathered per block. Default is BLOCK_SIZE.
+
+        Returns:
+        - list: The REPORT outputs of each robot, one list per robot.
+        """
+        if len(programs) != self.size:
+            raise ValueError('Expected %d programs, got %d.' % (self.size, len(programs)))
+        for program in programs:
+            if (program.board_width, program.board_height) != (self.board_width, self.board_height):
+                raise ValueError('Program was compiled for a %dx%d board, fleet board is %dx%d.' % (
+                    program.board_width, program.board_height, self.board_width, self.board_height))
+            if program.obstacles is not None:
+                raise ValueError('Program was compiled for a board with obstacles, the fleet boards have none.')
+
+        lengths = np.array([len(program) for program in programs], dtype=np.int64)
+        starts = np.cumsum(lengths) - lengths
+        total = int(lengths.sum())
+        # The last entry is an OP_NOOP read by the robots whose program has finished
+        opcodes = np.full(total + 1, OP_NOOP, dtype=np.uint8)
+        opcodes[:total] = np.frombuffer(b''.join(program.opcodes.tobytes() for program in programs), dtype=np.uint8)
+        operands = np.frombuffer(b''.join(program.operands.tobytes() for program in programs), dtype=np.intc)
+
+        # The operands are concatenated in the same order as the opcodes, so the offset of
+        # the first operand of each command is the running sum of the operand counts.
+        operand_counts = np.zeros(256, dtype=np.int64)
+        operand_counts[list(_OPERAND_COUNTS)] = list(_OPERAND_COUNTS.values())
+        widths = operand_counts[opcodes]
+        offsets = np.cumsum(widths) - widths
+
+        place_x = np.zeros(total + 1, dtype=np.int32)
+        place_y = np.zeros(total + 1, dtype=np.int32)
+        place_facing = np.zeros(total + 1, dtype=np.int8)
+        counts = np.zeros(total + 1, dtype=np.int32)
+        mask = opcodes == OP_PLACE
+        at = offsets[mask]
+        place_x[mask] = operands[at]
+        place_y[mask] = operands[at + 1]
+        place_facing[mask] = operands[at + 2]
+        mask = (opcodes == OP_MOVE_N) | (opcodes == OP_TURN)
+        counts[mask] = operands[offsets[mask]]
+
+        outputs = [[] for _ in range(self.size)]
+        length = int(lengths.max(initial=0))
+        rows = max(1, block_size // max(self.size, 1))
+        for first in range(0, length, rows):
+            steps = np.arange(first, min(first + rows, length))[:, np.newaxis]
+            index = np.where(steps < lengths, starts + steps, total)
+            block = (opcodes[index], place_x[index], place_y[index], place_facing[index], counts[index])
+            for row in range(len(steps)):
+                for robot in self.step(*(values[row] for values in block)):
+                    outputs[robot].append(self.report(robot))
+        return outputs
+
+    def report(self, index):
+        """
+        Output the current position and direction of one robot.
+
+        Parameters:
+        - index (int): Index of the robot in the fleet.
+
+        Returns:
+        - str: 'Output: x,y,F', or None if the robot is not placed.
+        """
+        if self.is_placed[index]:
+            return f"Output: {self.x[index]},{self.y[index]},{FACINGS[self.facing[index]]}"
+
+    def robot_state(self, index):
+        """
+        Return the state of one robot using the same values as the ToyRobot attributes.
+
+        Parameters:
+        - index (int): Index of the robot in the fleet.
+
+        Returns:
+        - tuple: (x, y, facing, is_placed), with None for x, y and facing if not placed.
+        """
+        if not self.is_placed[index]:
+            return (None, None, None, False)
+        return (int(self.x[index]), int(self.y[index]), FACINGS[self.facing[index]], True)
+
+    def packed_states(self):
+        """
+        Return the state of every robot packed into an integer, as journal.pack_state does.
+
+        Returns:
+        - ndarray: One int64 packed state per robot.
+        """
+        x = self.x.astype(np.int64)
+        y = self.y.astype(np.int64)
+        facing = self.facing.astype(np.int64)
+        packed = (x << X_SHIFT) | (y << Y_SHIFT) | (facing << 1) | 1
+        return np.where(self.is_placed, packed, 0)
+
+    def load_packed_states(self, states):
+        """
+        Restore the state of every robot from packed integers.
+
+        Parameters:
+        - states (array): One packed state per robot (see packed_states).
+        """
+        states = np.asarray(states, dtype=np.int64)
+        self.is_placed[:] = (states & 1).astype(bool)
+        self.x[:] = np.where(self.is_placed, states >> X_SHIFT, -1)
+        self.y[:] = np.where(self.is_placed, (states >> Y_SHIFT) & Y_MASK, -1)
+        self.facing[:] = np.where(self.is_placed, (states >> 1) & 7, -1)
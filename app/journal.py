@@ -0,0 +1,157 @@
+from array import array
+
+# Layout of a packed state: x in bits 34-62, y in bits 4-33, facing index in bits 1-3
+# and the placed flag in bit 0. A robot that is not placed packs to 0.
+X_SHIFT = 34
+Y_SHIFT = 4
+Y_MASK = (1 << 30) - 1
+
+
+def pack_state(x, y, facing_index, is_placed):
+    """
+    Pack a robot state into a single integer.
+
+    Parameters:
+    - x (int): X-coordinate of the robot.
+    - y (int): Y-coordinate of the robot.
+    - facing_index (int): Facing index of the robot.
+    - is_placed (bool): True if the robot is placed on the board.
+
+    Returns:
+    - int: The packed state.
+    """
+    if not is_placed:
+        return 0
+    return (x << X_SHIFT) | (y << Y_SHIFT) | (facing_index << 1) | 1
+
+
+def unpack_state(state):
+    """
+    Unpack a state packed by pack_state.
+
+    Parameters:
+    - state (int): The packed state.
+
+    Returns:
+    - tuple: (x, y, facing_index, is_placed), or (None, None, -1, False) if not placed.
+    """
+    if not state & 1:
+        return (None, None, -1, False)
+    return (state >> X_SHIFT, (state >> Y_SHIFT) & Y_MASK, (state >> 1) & 7, True)
+
+
+class StateJournal:
+    def __init__(self, capacity=1000, state=0):
+        """
+        Initialize a journal of packed robot states for undo and redo.
+
+        The states are kept in a fixed size ring buffer, so recording, undoing and redoing
+        are O(1) and the memory is bounded: once full, the oldest states are dropped.
+
+        Parameters:
+        - capacity (int): Maximum number of states kept, including the current one.
+        - state (int): The current packed state.
+        """
+        if capacity < 1:
+            raise ValueError('The journal capacity must be at least 1.')
+        self.capacity = capacity
+        self._states = array('q', bytes(8 * capacity))
+        self._states[0] = state
+        self._start = 0
+        self._count = 1
+        self._position = 0
+
+    @property
+    def current(self):
+        """
+        The current packed state.
+        """
+        return self._states[(self._start + self._position) % self.capacity]
+
+    @property
+    def undo_depth(self):
+        """
+        Number of states that can be undone.
+        """
+        return self._position
+
+    @property
+    def redo_depth(self):
+        """
+        Number of states that can be redone.
+        """
+        return self._count - 1 - self._position
+
+    def record(self, state):
+        """
+        Record a new current state, discarding the states that could be redone.
+
+        Parameters:
+        - state (int): The new packed state. Nothing is recorded if it equals the current one.
+        """
+        if state == self.current:
+            return
+        self._count = self._position + 1
+        if self._count == self.capacity:
+            self._start = (self._start + 1) % self.capacity
+        else:
+            self._count += 1
+            self._position += 1
+        self._states[(self._start + self._position) % self.capacity] = state
+
+    def undo(self, steps=1):
+        """
+        Move back in the journal.
+
+        Parameters:
+        - steps (int): Number of states to go back, limited to the undo depth.
+
+        Returns:
+        - int: The packed state to restore.
+        """
+        self._position -= min(steps, self._position)
+        return self.current
+
+    def redo(self, steps=1):
+        """
+        Move forward in the journal after an undo.
+
+        Parameters:
+        - steps (int): Number of states to go forward, limited to the redo depth.
+
+        Returns:
+        - int: The packed state to restore.
+        """
+        self._position += min(steps, self.redo_depth)
+        return self.current
+
+    def export(self):
+        """
+        Return the kept states and the position of the current one, e.g. to save them in
+        a checkpoint (see load).
+
+        Returns:
+        - tuple: (states, position), the states as an array('q') from the oldest to the newest.
+        """
+        states = array('q', (self._states[(self._start + i) % self.capacity] for i in range(self._count)))
+        return states, self._position
+
+    def load(self, states, position):
+        """
+        Replace the kept states with states returned by export.
+
+        If there are more states than the capacity, the oldest ones are dropped, and then
+        the newest ones if the current state would be dropped.
+
+        Parameters:
+        - states (array): The packed states from the oldest to the newest.
+        - position (int): Index of the current state in states.
+        """
+        if not 0 <= position < len(states):
+            raise ValueError('The journal position must be the index of one of the states.')
+        first = min(max(0, len(states) - self.capacity), position)
+        states = states[first:first + self.capacity]
+        self._states[:len(states)] = array('q', states)
+        self._start = 0
+        self._count = len(states)
+        self._position = position - first
@@ -0,0 +1,90 @@
+import argparse
+import asyncio
+import random
+import time
+
+COMMANDS = ['MOVE', 'MOVE', 'LEFT', 'RIGHT', 'REPORT', 'PLACE 1,2,NORTH']
+
+
+async def _client(open_connection, commands, pipeline, latencies):
+    """
+    Send the commands over one connection, `pipeline` commands at a time, recording the
+    latency of every response.
+    """
+    reader, writer = await open_connection()
+    try:
+        for start in range(0, len(commands), pipeline):
+            batch = commands[start:start + pipeline]
+            sent = time.perf_counter()
+            writer.write(('\n'.join(batch) + '\n').encode('ascii'))
+            await writer.drain()
+            for _ in batch:
+                await reader.readline()
+                latencies.append(time.perf_counter() - sent)
+        writer.write(b'EXIT\n')
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_load(host='127.0.0.1', port=8765, path=None, connections=100, commands=1000, pipeline=16, seed=0):
+    """
+    Drive a robot server with concurrent clients and measure the response latency.
+
+    Parameters:
+    - host (str): Server host.
+    - port (int): Server TCP port.
+    - path (str): Server Unix socket path, used instead of host and port.
+    - connections (int): Number of concurrent client connections.
+    - commands (int): Number of commands sent by each connection.
+    - pipeline (int): Number of commands sent before waiting for their responses.
+    - seed (int): Seed of the random command lists.
+
+    Returns:
+    - result (dict): Total commands, commands_per_sec and the p50, p90, p99 and max latencies in milliseconds.
+    """
+    if path:
+        open_connection = lambda: asyncio.open_unix_connection(path)
+    else:
+        open_connection = lambda: asyncio.open_connection(host, port)
+    rng = random.Random(seed)
+    workloads = [['PLACE 0,0,NORTH'] + [rng.choice(COMMANDS) for _ in range(commands - 1)] for _ in range(connections)]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(open_connection, workload, pipeline, latencies) for workload in workloads))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'commands': len(latencies),
+        'commands_per_sec': round(len(latencies) / elapsed),
+        'p50_ms': round(_percentile(latencies, 0.50) * 1000, 3),
+        'p90_ms': round(_percentile(latencies, 0.90) * 1000, 3),
+        'p99_ms': round(_percentile(latencies, 0.99) * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3),
+    }
+
+
+def main(argv=None):
+    """
+    Run the load generator against a running server and print the results.
+    """
+    parser = argparse.ArgumentParser(description='Load generator for the toy robot server.')
+    parser.add_argument('--host', default='127.0.0.1', help='Server host.')
+    parser.add_argument('--port', type=int, default=8765, help='Server TCP port.')
+    parser.add_argument('--unix', help='Server Unix socket path.')
+    parser.add_argument('--connections', type=int, default=100, help='Concurrent connections.')
+    parser.add_argument('--commands', type=int, default=1000, help='Commands per connection.')
+    parser.add_argument('--pipeline', type=int, default=16, help='Commands in flight per connection.')
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run_load(args.host, args.port, args.unix, args.connections, args.commands, args.pipeline))
+    for name, value in result.items():
+        print(f"{name:18} {value:,}")
+
+if __name__ == "__main__":
+    main()
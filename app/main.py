@@ -1,30 +1,141 @@
-import logging 
-from toy_robot import ToyRobot
+import os
+import sys
+from types import SimpleNamespace
+from toy_robot import ToyRobot, get_logger
+from reader import run_file
+from validation import parse_count
+
+# Size hint (in bytes) for each buffered read in batch mode.
+BATCH_READ_SIZE = 1 << 20
+
+# Command handlers by command name, see register_command.
+_handlers = {}
+# Handlers of the commands that also accept an argument, e.g. 'UNDO 3'.
+_argument_handlers = {}
+# Handlers of the commands matched by prefix, e.g. 'PLACE1,1,EAST'.
+_prefix_handlers = {}
+# Handler resolved for each command string seen, up to RESOLVED_CACHE_SIZE commands.
+_resolved = {}
+RESOLVED_CACHE_SIZE = 4096
+
+def register_command(name, handler, takes_argument=False, match_prefix=False):
+    """
+    Registers a command handled by parse_command, replacing any handler of the same name.
+
+    Parameters:
+    :name (str): Command name (e.g., 'MOVE'), in upper case
+    :handler (callable): Called as handler(robot, command) with the whole command.
+        Returns the command output, or False if the command arguments are invalid
+    :takes_argument (bool): True if the command accepts an argument (e.g., 'UNDO 3'),
+        otherwise only the bare name is recognized
+    :match_prefix (bool): True if every command starting with the name is passed to the
+        handler, with or without a space (e.g., 'PLACE1,1,EAST' as well as 'PLACE 1,1,EAST')
+    """
+    _handlers[name] = handler
+    for handlers, enabled in ((_argument_handlers, takes_argument), (_prefix_handlers, match_prefix)):
+        if enabled:
+            handlers[name] = handler
+        else:
+            handlers.pop(name, None)
+    _resolved.clear()
+
+def _invalid(robot, command):
+    return False
+
+def resolve_command(command):
+    """
+    Finds the registered command of a command string, without the cache of parse_command.
+
+    Parameters:
+    :command (str): Command string (e.g., 'MOVE 3')
+
+    Returns:
+        Tuple: (name, handler) of the command, or (None, handler) if the command is not
+        recognized, with a handler returning False
+    """
+    handler = _handlers.get(command)
+    if handler is not None:
+        return command, handler
+    separator = command.find(' ')
+    if separator > 0:
+        handler = _argument_handlers.get(command[:separator])
+        if handler is not None:
+            return command[:separator], handler
+    for name, handler in _prefix_handlers.items():
+        if command.startswith(name):
+            return name, handler
+    return None, _invalid
+
+def _resolve(command):
+    """
+    Finds the handler of a command string and remembers it while the cache has room.
+    """
+    handler = resolve_command(command)[1]
+    if len(_resolved) < RESOLVED_CACHE_SIZE:
+        _resolved[command] = handler
+    return handler
 
 def parse_command(robot, command):
     """
     Parses and executes the robot command.
 
+    The command is looked up in the registered handlers (see register_command), so the
+    cost does not depend on the number of commands. Repeated command strings, such as the
+    same PLACE, skip the lookup of the command name.
+
     Parameters:
     :robot (object): Robot object
-    :command (str): (e.g., 'PLACE 0,0,NORTH', 'MOVE', 'LEFT', 'RIGHT', 'REPORT')
+    :command (str): (e.g., 'PLACE 0,0,NORTH', 'PLACE 1,1,NE', 'MOVE', 'MOVE 3', 'LEFT', 'RIGHT', 'REPORT', 'UNDO 2', 'REDO')
 
     Returns:
-        Bool: True / False / 'Exit'
-    """
-    if command.startswith('PLACE'):
-        robot.place(command)
-    elif command == 'MOVE':
-        robot.move()
-    elif command == 'LEFT':
-        robot.left()
-    elif command == 'RIGHT':
-        robot.right()
-    elif command == 'REPORT':
-        robot.report()
-    else:
-        logging.error(f"Invalid command: {command}")
+        Bool / str: False for an invalid command, the report output for REPORT
+    """
+    handler = _resolved.get(command) or _resolve(command)
+    result = handler(robot, command)
+    if result is False:
+        get_logger().error(f"Invalid command: {command}")
+    return result
+
+def _parse_steps(command, name):
+    """
+    Parses the optional count of a command such as 'UNDO 3'.
+
+    Parameters:
+    :command (str): Command starting with name
+    :name (str): Command name
+
+    Returns:
+        Int: The count (1 when omitted), or None if the count is not a positive integer
+    """
+    if command == name:
+        return 1
+    if command[len(name)] == ' ':
+        return parse_count(command[len(name) + 1:])
+
+def _move(robot, command):
+    if (steps := _parse_steps(command, 'MOVE')) is None:
+        return False
+    robot.move(steps)
+
+def _undo(robot, command):
+    if (steps := _parse_steps(command, 'UNDO')) is None:
+        return False
+    robot.undo(steps)
+
+def _redo(robot, command):
+    if (steps := _parse_steps(command, 'REDO')) is None:
         return False
+    robot.redo(steps)
+
+# The handlers look the robot methods up on every call, so they follow the robot class.
+# Any command starting with PLACE is a PLACE, as in reader.run_file and the compiler.
+register_command('PLACE', lambda robot, command: robot.place(command), match_prefix=True)
+register_command('MOVE', _move, takes_argument=True)
+register_command('LEFT', lambda robot, command: robot.left())
+register_command('RIGHT', lambda robot, command: robot.right())
+register_command('REPORT', lambda robot, command: robot.report())
+register_command('UNDO', _undo, takes_argument=True)
+register_command('REDO', _redo, takes_argument=True)
 
 def _print_commands():
     """
@@ -36,11 +147,11 @@ def _print_commands():
     print("   - Parameters:")
     print("     - X (integer): The X-coordinate of the robot's position (0 to 4).")
     print("     - Y (integer): The Y-coordinate of the robot's position (0 to 4).")
-    print("     - F (string): The direction the robot is facing. Must be one of NORTH, SOUTH, EAST, or WEST.")
+    print("     - F (string): The direction the robot is facing. Must be one of NORTH, SOUTH, EAST, WEST, or a diagonal NE, SE, SW, NW.")
     print("   - Example: PLACE 1,2,EAST")
     print()
-    print("2. MOVE")
-    print("   - Description: Moves the robot one unit forward in the direction it is currently facing. The robot cannot move off the edge of the table.")
+    print("2. MOVE [N]")
+    print("   - Description: Moves the robot N units (1 if N is omitted) forward in the direction it is currently facing. The robot stops at the edge of the table.")
     print()
     print("3. LEFT")
     print("   - Description: Rotates the robot 90 degrees to the left (counterclockwise) without changing its position.")
@@ -51,11 +162,188 @@ def _print_commands():
     print("5. REPORT")
     print("   - Description: Outputs the current position and direction of the robot. The output includes the X-coordinate, Y-coordinate, and the direction symbol.")
     print()
+    print("6. UNDO [N]")
+    print("   - Description: Reverts the last N changes of the robot's position or direction (1 if N is omitted).")
+    print()
+    print("7. REDO [N]")
+    print("   - Description: Reapplies the last N changes reverted with UNDO (1 if N is omitted).")
+    print()
 
-def main():
+def run_batch(stream, out, robot=None, dispatch=None):
+    """
+    Runs the commands read from a stream without prompting, writing REPORT output in bulk.
+
+    Parameters:
+    :stream (file): Text stream with one command per line
+    :out (file): Text stream receiving the REPORT outputs
+    :robot (object): Robot object, a new ToyRobot is created if omitted
+    :dispatch (callable): Called as dispatch(robot, command), parse_command if omitted
+
+    Returns:
+        Int: Number of commands executed
+    """
+    if robot is None:
+        robot = ToyRobot()
+    if dispatch is None:
+        dispatch = parse_command
+    count = 0
+    finished = False
+    while not finished:
+        lines = stream.readlines(BATCH_READ_SIZE)
+        if not lines:
+            break
+        outputs = []
+        for line in lines:
+            command = line.strip().upper()
+            if not command:
+                continue
+            if command == 'EXIT':
+                finished = True
+                break
+            output = dispatch(robot, command)
+            if output:
+                outputs.append(output)
+            count += 1
+        if outputs:
+            out.write('\n'.join(outputs) + '\n')
+    out.flush()
+    return count
+
+def run_checkpointed(path, robot, out, checkpoint_path, checkpoint_every=1000000):
+    """
+    Runs a command file, saving the robot state to a checkpoint file as it goes.
+
+    If the checkpoint file exists, the run resumes from the saved state and position
+    instead of starting over. The checkpoint is removed once the file has been run.
+    REPORT outputs already written after the last checkpoint are written again on resume.
+
+    Parameters:
+    :path (str): Path of the command file
+    :robot (object): Robot object
+    :out (file): Text stream receiving the REPORT outputs
+    :checkpoint_path (str): Path of the checkpoint file
+    :checkpoint_every (int): Number of commands between checkpoints
+
+    Returns:
+        Int: Number of commands executed by this run
+    """
+    from functools import partial
+    from snapshot import save_robot, load_robot
+    start = 0
+    if os.path.exists(checkpoint_path):
+        robot, start = load_robot(checkpoint_path, robot)
+    count = run_file(path, robot, out, parse_command, start, partial(save_robot, robot, checkpoint_path), checkpoint_every)
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return count
+
+# Command line options: (option, type, default, help). bool options are flags.
+_ARGUMENTS = (
+    ('--file', str, None, 'Run the commands in FILE non-interactively ("-" for stdin).'),
+    ('--verbose', bool, False, 'Keep the per-command log output in batch mode.'),
+    ('--checkpoint', str, None, 'Save the progress of --file to CHECKPOINT and resume from it if it exists.'),
+    ('--checkpoint-every', int, 1000000, 'Number of commands between checkpoints.'),
+    ('--metrics', bool, False, 'Write command counts and latency histograms (Prometheus text) to stderr in batch mode (--checkpoint is ignored).'),
+    ('--obstacles', str, None, 'Load the board and its obstacles from an obstacle map file (see obstacles.py).'),
+    ('--trajectory', str, None, 'Record every position of the robot in batch mode to chunk files in TRAJECTORY (see trajectory.py).'),
+    ('--history', int, None, 'Number of states kept for UNDO/REDO (default: 1000 in the console, 0 in batch mode).'),
+)
+
+def _parse_args(argv):
+    """
+    Parses the command line arguments.
+
+    Plain option lists are parsed directly, argparse is only imported for --help and
+    for arguments it has to report as errors, which keeps it off the startup path.
+
+    Parameters:
+    :argv (list): Arguments without the program name
+
+    Returns:
+        Namespace: Parsed arguments
+    """
+    args = _parse_simple_args(argv)
+    if args is not None:
+        return args
+
+    import argparse
+    parser = argparse.ArgumentParser(description='Toy Robot Simulator')
+    for option, kind, default, description in _ARGUMENTS:
+        if kind is bool:
+            parser.add_argument(option, action='store_true', help=description)
+        else:
+            parser.add_argument(option, type=kind, default=default, help=description)
+    return parser.parse_args(argv)
+
+def _parse_simple_args(argv):
+    """
+    Parses '--option value' and '--flag' arguments without argparse.
+
+    Returns:
+        SimpleNamespace: Parsed arguments, or None if argparse has to handle them
+    """
+    options = {option: (option[2:].replace('-', '_'), kind) for option, kind, _, _ in _ARGUMENTS}
+    values = {option[2:].replace('-', '_'): default for option, _, default, _ in _ARGUMENTS}
+    i = 0
+    while i < len(argv):
+        spec = options.get(argv[i])
+        if spec is None:
+            return None
+        name, kind = spec
+        if kind is bool:
+            values[name] = True
+            i += 1
+            continue
+        if i + 1 == len(argv) or (argv[i + 1].startswith('-') and argv[i + 1] != '-'):
+            return None
+        try:
+            values[name] = kind(argv[i + 1])
+        except ValueError:
+            return None
+        i += 2
+    return SimpleNamespace(**values)
+
+def main(argv=None):
     """
     Main function that runs the robot console application.
+
+    Commands are read from --file, or from stdin when it is not a terminal, without
+    the interactive banner. Otherwise the interactive console is started.
     """
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    board = {}
+    if args.obstacles:
+        from obstacles import load_obstacles
+        obstacle_map = load_obstacles(args.obstacles)
+        board = {'board_width': obstacle_map.board_width, 'board_height': obstacle_map.board_height, 'obstacles': obstacle_map}
+    if args.file or not sys.stdin.isatty():
+        if args.trajectory:
+            from trajectory import Trajectory
+            board['trajectory'] = Trajectory.open(args.trajectory)
+        robot = ToyRobot(quiet=not args.verbose, history=args.history or 0, **board)
+        if args.metrics:
+            from metrics import Metrics
+            metrics = Metrics()
+            dispatch = metrics.dispatcher(resolve_command)
+            # The memory-mapped reader is only faster because it runs MOVE/LEFT/RIGHT
+            # without dispatching them; once every command is dispatched to be counted,
+            # buffered line reads are faster.
+            if args.file and args.file != '-':
+                with open(args.file) as stream:
+                    run_batch(stream, sys.stdout, robot, dispatch)
+            else:
+                run_batch(sys.stdin, sys.stdout, robot, dispatch)
+            sys.stderr.write(metrics.to_prometheus())
+        elif args.file and args.file != '-' and args.checkpoint:
+            run_checkpointed(args.file, robot, sys.stdout, args.checkpoint, args.checkpoint_every)
+        elif args.file and args.file != '-':
+            run_file(args.file, robot, sys.stdout, parse_command)
+        else:
+            run_batch(sys.stdin, sys.stdout, robot)
+        if robot.trajectory is not None:
+            robot.trajectory.close()
+        return
+
     print("*****************************************")
     print("*****************************************")
     print("\n \033[1m Welcome to Toy Robot Simulator! \033[0m \n")
@@ -66,8 +354,8 @@ def main():
     print('The robot can be controlled using a set of commands to place it on the table, move it, rotate it, and \nreport its current status. The robot must remain on the table and cannot fall off.')
 
     _print_commands()
-    robot = ToyRobot()
-    print("Enter command (e.g., PLACE X,Y,F, MOVE, LEFT, RIGHT, REPORT), or 'EXIT' to quit:")
+    robot = ToyRobot(history=1000 if args.history is None else args.history, **board)
+    print("Enter command (e.g., PLACE X,Y,F, MOVE [N], LEFT, RIGHT, REPORT, UNDO, REDO), or 'EXIT' to quit:")
 
     while True:
         command = input("> ").upper()
@@ -0,0 +1,208 @@
+from bisect import bisect_left
+from random import Random
+from time import perf_counter_ns
+from toy_robot import get_logger
+
+# Upper bounds (in seconds) of the latency histogram buckets.
+LATENCY_BUCKETS = (1e-6, 2e-6, 5e-6, 1e-5, 2e-5, 5e-5, 1e-4, 2e-4, 5e-4, 1e-3, 1e-2, 1e-1)
+
+_BUCKETS_NS = tuple(int(bound * 1e9) for bound in LATENCY_BUCKETS)
+
+# Number of distinct command strings counted separately, the others are counted together
+# by command name.
+COUNTED_COMMANDS = 4096
+
+
+class Metrics:
+    def __init__(self, sample_every=64, seed=None):
+        """
+        Initialize the command metrics.
+
+        Every command is counted: by name when valid, as invalid, and as a rejected move
+        when a MOVE leaves a placed robot in place. Only the latency is sampled, as timing
+        is the costly part: one command in `sample_every` on average is timed. The gap
+        between samples is random, so a workload repeating a fixed pattern of commands
+        does not always time the same command.
+
+        Parameters:
+        - sample_every (int): Time one command out of this many on average. Default is 64, 1 times every command.
+        - seed (int): Seed of the sampling gaps. Default is None.
+        """
+        self.sample_every = sample_every
+        # Entry of every command string seen (see dispatcher), then of every command
+        # name once COUNTED_COMMANDS strings are counted.
+        self._entries = {}
+        self.latency_buckets = {}
+        self.latency_sum_ns = {}
+        self.latency_count = {}
+        self._random = Random(seed)
+
+    def _next_sample(self):
+        """
+        Return the number of commands until the next timed one, sample_every on average.
+        """
+        return int(self._random.random() * (2 * self.sample_every - 1)) + 1
+
+    def dispatcher(self, resolve=None):
+        """
+        Build a dispatch function running the commands as main.parse_command does and
+        recording the metrics.
+
+        The registered handler of each command string is resolved once and kept with its
+        counters, so a command costs a lookup and a decrement on top of its handler: the
+        counters of a command string are a countdown to its next timed dispatch, plus the
+        commands dispatched before the countdown started. PLACE commands are checked by
+        the validator of the robot the first time they are seen, so a rejected PLACE is
+        counted as invalid.
+
+        Parameters:
+        - resolve (callable): main.resolve_command, which finds the registered handlers.
+          Default is None, main is imported (when main.py runs as a script it passes its own).
+
+        Returns:
+        - callable: Called as dispatch(robot, command), with the same result as main.parse_command.
+        """
+        if resolve is None:
+            from main import resolve_command as resolve
+        self._resolve = resolve
+        entries = self._entries
+        entry_of = self._entry
+        sample = self._sample
+
+        def dispatch(robot, command):
+            # entry: [handler, countdown, scheduled, name, is_move, invalid, rejected_moves]
+            entry = entries.get(command) or entry_of(robot, command)
+            countdown = entry[1] = entry[1] - 1
+            if not countdown:
+                result = sample(entry, robot, command)
+            elif entry[4]:
+                x, y = robot.x, robot.y
+                result = entry[0](robot, command)
+                if x == robot.x and y == robot.y and robot.is_placed and result is None:
+                    entry[6] += 1
+            else:
+                result = entry[0](robot, command)
+            if result is False:
+                entry[5] += 1
+                get_logger().error(f"Invalid command: {command}")
+            return result
+
+        return dispatch
+
+    def _entry(self, robot, command):
+        """
+        Resolve a command string not seen yet and return its entry (see dispatcher).
+        """
+        name, handler = self._resolve(command)
+        if name == 'PLACE' and not robot.validator.validate_place(command)['is_valid']:
+            name = None
+        # Past COUNTED_COMMANDS, the commands are counted together by name and handler, and
+        # resolved again on every dispatch.
+        key = command if len(self._entries) < COUNTED_COMMANDS else (name, handler)
+        entry = self._entries.get(key)
+        if entry is None:
+            gap = self._next_sample()
+            entry = self._entries[key] = [handler, gap, gap, name, name == 'MOVE', 0, 0]
+        return entry
+
+    def _sample(self, entry, robot, command):
+        """
+        Dispatch and time one sampled command, and start the countdown to the next one.
+        """
+        gap = self._next_sample()
+        entry[1] = gap
+        entry[2] += gap
+        x, y = robot.x, robot.y
+        start = perf_counter_ns()
+        result = entry[0](robot, command)
+        elapsed = perf_counter_ns() - start
+        if entry[4] and result is None and x == robot.x and y == robot.y and robot.is_placed:
+            entry[6] += 1
+        if result is not False and entry[3] is not None:
+            self._observe(entry[3], elapsed)
+        return result
+
+    def _observe(self, name, elapsed_ns):
+        """
+        Add a latency sample to the histogram of a command.
+        """
+        buckets = self.latency_buckets.get(name)
+        if buckets is None:
+            buckets = self.latency_buckets[name] = [0] * (len(_BUCKETS_NS) + 1)
+            self.latency_sum_ns[name] = 0
+            self.latency_count[name] = 0
+        buckets[bisect_left(_BUCKETS_NS, elapsed_ns)] += 1
+        self.latency_sum_ns[name] += elapsed_ns
+        self.latency_count[name] += 1
+
+    def snapshot(self):
+        """
+        Return the current metrics.
+
+        Returns:
+        - snapshot (dict): The metrics, all the counts are exact.
+            - total_commands (int): Number of commands dispatched.
+            - commands (dict): Number of valid commands by command name.
+            - invalid_commands (int): Number of invalid commands.
+            - rejected_moves (int): Number of MOVE commands that did not move the robot.
+            - latency (dict): Sampled latency by command name, with count, sum_seconds and
+              buckets, the cumulative count for each bound of LATENCY_BUCKETS then +Inf.
+        """
+        latency = {}
+        for name, buckets in self.latency_buckets.items():
+            cumulative = []
+            total = 0
+            for count in buckets:
+                total += count
+                cumulative.append(total)
+            latency[name] = {
+                'count': self.latency_count[name],
+                'sum_seconds': self.latency_sum_ns[name] / 1e9,
+                'buckets': cumulative,
+            }
+        commands = {}
+        invalid_commands = rejected_moves = 0
+        for _, countdown, scheduled, name, _, invalid, rejected in list(self._entries.values()):
+            count = scheduled - countdown
+            invalid_commands += invalid
+            rejected_moves += rejected
+            if name is None:
+                invalid_commands += count - invalid
+            elif count > invalid:
+                commands[name] = commands.get(name, 0) + count - invalid
+        return {
+            'total_commands': sum(commands.values()) + invalid_commands,
+            'commands': commands,
+            'invalid_commands': invalid_commands,
+            'rejected_moves': rejected_moves,
+            'latency': latency,
+        }
+
+    def to_prometheus(self, prefix='toy_robot'):
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Parameters:
+        - prefix (str): Prefix of the metric names.
+
+        Returns:
+        - str: The metrics text.
+        """
+        snapshot = self.snapshot()
+        lines = [f'# TYPE {prefix}_dispatched_commands_total counter']
+        lines.append(f"{prefix}_dispatched_commands_total {snapshot['total_commands']}")
+        lines.append(f'# TYPE {prefix}_commands_total counter')
+        for name, count in sorted(snapshot['commands'].items()):
+            lines.append(f'{prefix}_commands_total{{command="{name}"}} {count}')
+        lines.append(f'# TYPE {prefix}_invalid_commands_total counter')
+        lines.append(f"{prefix}_invalid_commands_total {snapshot['invalid_commands']}")
+        lines.append(f'# TYPE {prefix}_rejected_moves_total counter')
+        lines.append(f"{prefix}_rejected_moves_total {snapshot['rejected_moves']}")
+        lines.append(f'# TYPE {prefix}_command_latency_seconds histogram')
+        for name, latency in sorted(snapshot['latency'].items()):
+            bounds = [repr(bound) for bound in LATENCY_BUCKETS] + ['+Inf']
+            for bound, count in zip(bounds, latency['buckets']):
+                lines.append(f'{prefix}_command_latency_seconds_bucket{{command="{name}",le="{bound}"}} {count}')
+            lines.append(f'{prefix}_command_latency_seconds_sum{{command="{name}"}} {latency["sum_seconds"]}')
+            lines.append(f'{prefix}_command_latency_seconds_count{{command="{name}"}} {latency["count"]}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,133 @@
+import os
+import sys
+import struct
+from array import array
+from toy_robot import DELTA_X, DELTA_Y
+from validation import TableValidator
+
+# File layout: a fixed header followed by the cell index (y * board_width + x) of every
+# obstacle, stored as little-endian signed 64-bit integers.
+MAGIC = b'TROB'
+VERSION = 1
+_HEADER = struct.Struct('<4sHxxQQQ')
+
+
+class ObstacleMap:
+    def __init__(self, board_width=5, board_height=5, cells=()):
+        """
+        Initialize a board with static obstacles.
+
+        For every facing direction, the number of free cells a robot can move before
+        reaching an obstacle or the edge of the board is precomputed for each cell, so the
+        stopping point of MOVE or MOVE N is a single lookup (see ToyRobot.move). This
+        takes one pass over the board per direction and 32 bytes per cell.
+
+        Parameters:
+        - board_width (int): Width of the board.
+        - board_height (int): Height of the board.
+        - cells (iterable): (x, y) coordinates of the obstacles.
+        """
+        self.board_width = board_width
+        self.board_height = board_height
+        self.blocked = bytearray(board_width * board_height)
+        for x, y in cells:
+            if not (0 <= x < board_width and 0 <= y < board_height):
+                raise ValueError(f'Obstacle ({x}, {y}) is outside the {board_width}x{board_height} board.')
+            self.blocked[y * board_width + x] = 1
+        self.rooms = tuple(self._room(delta_x, delta_y) for delta_x, delta_y in zip(DELTA_X, DELTA_Y))
+        self.validator = TableValidator(board_width, board_height, obstacles=self)
+
+    def _room(self, delta_x, delta_y):
+        """
+        Count, for every cell, the free cells ahead of it in one direction.
+
+        Each line of cells in the direction is walked backwards from the edge, carrying
+        the length of the free run ahead of the current cell.
+        """
+        width, height = self.board_width, self.board_height
+        blocked = self.blocked
+        room = array('i', bytes(4 * width * height))
+        starts = set()
+        if delta_x:
+            edge_x = width - 1 if delta_x > 0 else 0
+            starts.update((edge_x, y) for y in range(height))
+        if delta_y:
+            edge_y = height - 1 if delta_y > 0 else 0
+            starts.update((x, edge_y) for x in range(width))
+        for x, y in starts:
+            run = 0
+            while 0 <= x < width and 0 <= y < height:
+                cell = y * width + x
+                room[cell] = run
+                run = 0 if blocked[cell] else run + 1
+                x -= delta_x
+                y -= delta_y
+        return room
+
+    def is_blocked(self, x, y):
+        """
+        Check if a cell holds an obstacle.
+
+        Parameters:
+        - x (int): The x-coordinate.
+        - y (int): The y-coordinate.
+
+        Returns:
+        - bool: True if the cell is blocked.
+        """
+        return bool(self.blocked[y * self.board_width + x])
+
+    def cells(self):
+        """
+        Yield the (x, y) coordinates of the obstacles, row by row.
+        """
+        width = self.board_width
+        index = self.blocked.find(1)
+        while index >= 0:
+            yield index % width, index // width
+            index = self.blocked.find(1, index + 1)
+
+
+def save_obstacles(path, obstacle_map):
+    """
+    Write an obstacle map to a file.
+
+    Parameters:
+    - path (str): Path of the obstacle file.
+    - obstacle_map (ObstacleMap): The obstacles to save.
+    """
+    width = obstacle_map.board_width
+    cells = array('q', (y * width + x for x, y in obstacle_map.cells()))
+    if sys.byteorder != 'little':
+        cells.byteswap()
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as stream:
+        stream.write(_HEADER.pack(MAGIC, VERSION, width, obstacle_map.board_height, len(cells)))
+        cells.tofile(stream)
+    os.replace(temporary_path, path)
+
+
+def load_obstacles(path):
+    """
+    Read an obstacle file written by save_obstacles.
+
+    Parameters:
+    - path (str): Path of the obstacle file.
+
+    Returns:
+    - ObstacleMap: The obstacles, with their precomputed tables.
+    """
+    with open(path, 'rb') as stream:
+        header = stream.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError(f'{path} is not an obstacle map: file is too short.')
+        magic, version, board_width, board_height, count = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not an obstacle map.')
+        if version != VERSION:
+            raise ValueError(f'Unsupported obstacle map version {version}, expected {VERSION}.')
+        cells = array('q')
+        cells.fromfile(stream, count)
+    if sys.byteorder != 'little':
+        cells.byteswap()
+    return ObstacleMap(board_width, board_height, ((cell % board_width, cell // board_width) for cell in cells))
@@ -0,0 +1,338 @@
+from itertools import islice
+from toy_robot import get_logger
+from validation import TableValidator, parse_count
+from reader import iter_lines
+
+# Number of items in each batch passed from one stage to the next.
+BATCH_SIZE = 1024
+
+# Number of distinct lines and commands whose tokens and validation results are kept.
+CACHE_SIZE = 4096
+
+# Tokens of the blank lines and of EXIT.
+_BLANK = ()
+_EXIT = ('EXIT',)
+
+# Commands taking an optional step count (e.g. 'MOVE 3'), and commands without argument.
+_STEP_COMMANDS = frozenset(['MOVE', 'UNDO', 'REDO'])
+_BARE_COMMANDS = frozenset(['LEFT', 'RIGHT', 'REPORT'])
+
+# A pipeline is a chain of generators passing lists of items (batches):
+#
+#   source   -> raw lines (str or bytes)
+#   tokenize -> (command, name, argument) with the argument text, or None
+#   validate -> (command, name, argument) with the parsed argument: (x, y, facing) for
+#               PLACE, the step count for MOVE/UNDO/REDO, None otherwise
+#   execute  -> (command, name, output, state) with the REPORT output (or None) and the
+#               packed robot state (or None, see execute)
+#   sink     -> consumes the batches, e.g. write_reports
+#
+# A stage is any callable taking the batches of the previous stage and returning new
+# batches, so custom stages can be put anywhere in the chain (see filter_items, map_items
+# and tap).
+
+
+def from_iterable(items, batch_size=BATCH_SIZE):
+    """
+    Source stage batching the items of an iterable, e.g. a list of command strings.
+
+    Parameters:
+    - items (iterable): The items.
+    - batch_size (int): Number of items per batch. Default is BATCH_SIZE.
+
+    Returns:
+    - generator: Lists of at most batch_size items.
+    """
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def from_stream(stream, batch_size=BATCH_SIZE):
+    """
+    Source stage reading the lines of a text or binary stream, e.g. sys.stdin or
+    socket.makefile('rb').
+
+    A batch is complete once batch_size lines have been read, so an interactive source
+    should use a small batch_size.
+
+    Returns:
+    - generator: Lists of lines.
+    """
+    return from_iterable(stream, batch_size)
+
+
+def from_file(path, batch_size=BATCH_SIZE):
+    """
+    Source stage reading the non-blank lines of a file through a memory map (see
+    reader.iter_lines).
+
+    Returns:
+    - generator: Lists of lines as bytes.
+    """
+    return from_iterable(iter_lines(path), batch_size)
+
+
+def tokenize(batches):
+    """
+    Split the lines into command names and argument texts, stopping at EXIT.
+
+    Lines are stripped and upper-cased, blank lines are dropped. The tokens of the
+    first CACHE_SIZE distinct lines are kept, so a repeated line is a single lookup.
+
+    Parameters:
+    - batches (iterable): Lists of lines (str or bytes).
+
+    Returns:
+    - generator: Lists of (command, name, argument) tuples.
+    """
+    cache = {}
+    for lines in batches:
+        tokens = []
+        for line in lines:
+            token = cache.get(line)
+            if token is None:
+                token = _tokenize(line)
+                if len(cache) < CACHE_SIZE:
+                    cache[line] = token
+            if token is _BLANK:
+                continue
+            if token is _EXIT:
+                if tokens:
+                    yield tokens
+                return
+            tokens.append(token)
+        if tokens:
+            yield tokens
+
+
+def _tokenize(line):
+    if line.__class__ is bytes:
+        line = line.decode('utf-8', 'replace')
+    command = line.strip().upper()
+    if not command:
+        return _BLANK
+    if command == 'EXIT':
+        return _EXIT
+    if command.startswith('PLACE'):
+        # Any command starting with PLACE is a PLACE (e.g. 'PLACE1,1,EAST'), as in main.parse_command
+        return (command, 'PLACE', command[5:].strip() or None)
+    name, _, argument = command.partition(' ')
+    return (command, name, argument or None)
+
+
+def _log_invalid(command, message):
+    get_logger().error(message)
+
+
+def validate(batches, validator=None, on_invalid=None):
+    """
+    Parse the arguments of the commands and drop the invalid commands.
+
+    PLACE commands are checked by the validator (bounds, facing and obstacles), so the
+    execute stage places the robot without checking them again.
+
+    Parameters:
+    - batches (iterable): Lists of (command, name, argument) tuples from tokenize.
+    - validator (TableValidator): Validator of the board, e.g. robot.validator. Default is
+      None, the shared validator of a 5x5 board.
+    - on_invalid (callable): Called as on_invalid(command, message) for every invalid
+      command. Default is None, which logs the message as an error.
+
+    Returns:
+    - generator: Lists of (command, name, argument) tuples with parsed arguments.
+    """
+    if validator is None:
+        validator = TableValidator.for_board()
+    if on_invalid is None:
+        on_invalid = _log_invalid
+    validate_place = validator.validate_place
+    # Validated tuple, or error message, of the first CACHE_SIZE distinct commands
+    cache = {}
+    for tokens in batches:
+        valid = []
+        for token in tokens:
+            result = cache.get(token)
+            if result is None:
+                result = _validate(token, validate_place)
+                if len(cache) < CACHE_SIZE:
+                    cache[token] = result
+            if result.__class__ is tuple:
+                valid.append(result)
+            else:
+                on_invalid(token[0], result)
+        if valid:
+            yield valid
+
+
+def _validate(token, validate_place):
+    """
+    Return the validated tuple of a token, or the error message of an invalid command.
+    """
+    command, name, argument = token
+    if name == 'PLACE':
+        result = validate_place(command)
+        if result['is_valid']:
+            return (command, name, (result['x'], result['y'], result['facing']))
+        return result['message']
+    if name in _STEP_COMMANDS:
+        steps = 1 if argument is None else parse_count(argument)
+        if steps is not None:
+            return (command, name, steps)
+    if name in _BARE_COMMANDS and argument is None:
+        return token
+    return f"Invalid command: {command}"
+
+
+def execute(batches, robot, states=False):
+    """
+    Run validated commands on a robot.
+
+    REPORT produces its output as data instead of logging it, and is skipped while the
+    robot is not placed. The other commands log as configured on the robot (see quiet).
+
+    Parameters:
+    - batches (iterable): Lists of (command, name, argument) tuples from validate.
+    - robot (ToyRobot): Robot executing the commands.
+    - states (bool): Add the packed robot state after each command (see ToyRobot.state).
+      Default is False, the state is None.
+
+    Returns:
+    - generator: Lists of (command, name, output, state) tuples.
+    """
+    for commands in batches:
+        place, move, left, right, undo, redo = robot.place_at, robot.move, robot.left, robot.right, robot.undo, robot.redo
+        results = []
+        for command, name, argument in commands:
+            output = None
+            if name == 'MOVE':
+                move(argument)
+            elif name == 'LEFT':
+                left()
+            elif name == 'RIGHT':
+                right()
+            elif name == 'REPORT':
+                if robot.is_placed:
+                    output = f"Output: {robot.x},{robot.y},{robot.facing}"
+            elif name == 'PLACE':
+                place(*argument)
+            elif name == 'UNDO':
+                undo(argument)
+            elif name == 'REDO':
+                redo(argument)
+            results.append((command, name, output, robot.state if states else None))
+        yield results
+
+
+def pipeline(source, *stages):
+    """
+    Chain stages after a source.
+
+    Example:
+        batches = pipeline(from_file(path), tokenize, partial(validate, validator=robot.validator),
+                           partial(execute, robot=robot))
+        write_reports(batches, sys.stdout)
+
+    Parameters:
+    - source (iterable): Batches of the first stage, e.g. from_file(path).
+    - stages (callable): Stages, each called with the batches of the previous one.
+
+    Returns:
+    - iterable: The batches of the last stage.
+    """
+    batches = source
+    for stage in stages:
+        batches = stage(batches)
+    return batches
+
+
+def filter_items(predicate):
+    """
+    Build a stage keeping the items for which predicate(item) is true.
+    """
+    def stage(batches):
+        for batch in batches:
+            batch = [item for item in batch if predicate(item)]
+            if batch:
+                yield batch
+    return stage
+
+
+def map_items(function):
+    """
+    Build a stage replacing every item with function(item).
+    """
+    def stage(batches):
+        for batch in batches:
+            yield [function(item) for item in batch]
+    return stage
+
+
+def tap(function):
+    """
+    Build a stage calling function(batch) on every batch and passing the batch on
+    unchanged, e.g. to count or log the commands.
+    """
+    def stage(batches):
+        for batch in batches:
+            function(batch)
+            yield batch
+    return stage
+
+
+def write_reports(batches, out):
+    """
+    Sink writing the REPORT outputs, one write per batch.
+
+    Parameters:
+    - batches (iterable): Lists of (command, name, output, state) tuples from execute.
+    - out (file): Text stream receiving the outputs.
+
+    Returns:
+    - int: Number of commands executed.
+    """
+    count = 0
+    for results in batches:
+        count += len(results)
+        outputs = [output for _, _, output, _ in results if output is not None]
+        if outputs:
+            out.write('\n'.join(outputs) + '\n')
+    out.flush()
+    return count
+
+
+def collect_states(batches):
+    """
+    Sink returning the robot state after every command (execute with states=True).
+
+    Returns:
+    - list: The packed states.
+    """
+    return [state for results in batches for _, _, _, state in results]
+
+
+def count_commands(batches):
+    """
+    Sink counting the commands by name.
+
+    Returns:
+    - dict: Number of commands by command name.
+    """
+    counts = {}
+    for batch in batches:
+        for item in batch:
+            counts[item[1]] = counts.get(item[1], 0) + 1
+    return counts
+
+
+def drain(batches):
+    """
+    Sink consuming the batches, for pipelines run only for their side effects.
+
+    Returns:
+    - int: Number of items consumed.
+    """
+    return sum(len(batch) for batch in batches)
@@ -0,0 +1,198 @@
+from array import array
+from toy_robot import FACINGS, DELTA_X, DELTA_Y
+
+
+class Planner:
+    def __init__(self, board_width=5, board_height=5, obstacles=None, cache_size=8):
+        """
+        Initialize a planner of shortest MOVE/LEFT/RIGHT sequences on a board.
+
+        A robot state (x, y, facing) is encoded as the integer (y * board_width + x) * 4 + f,
+        where f is the facing index within its group: LEFT and RIGHT keep a cardinal
+        heading cardinal and a diagonal heading diagonal, so each group is searched in its
+        own board_width * board_height * 4 state space. Moves follow ToyRobot.move: one unit,
+        and no move at the edge of the board or in front of an obstacle.
+
+        For every goal, a breadth-first search over the reversed moves gives the number of
+        commands from each state to the goal. These distance tables are kept in a bounded
+        LRU cache, so further queries towards the same goal only follow the table.
+
+        Parameters:
+        - board_width (int): Width of the board.
+        - board_height (int): Height of the board.
+        - obstacles (ObstacleMap): Obstacles of the board. Default is None.
+        - cache_size (int): Number of distance tables kept, each takes 16 bytes per cell. Default is 8.
+        """
+        if obstacles is not None and (obstacles.board_width, obstacles.board_height) != (board_width, board_height):
+            raise ValueError('Obstacle map is %dx%d, planner board is %dx%d.' % (
+                obstacles.board_width, obstacles.board_height, board_width, board_height))
+        self.board_width = board_width
+        self.board_height = board_height
+        self.obstacles = obstacles
+        self.cache_size = cache_size
+        self._tables = {}
+
+    def _encode(self, x, y, facing):
+        """
+        Encode a robot state, returning (state, diagonal).
+        """
+        index = facing if facing.__class__ is int else FACINGS.index(facing)
+        if not (0 <= x < self.board_width and 0 <= y < self.board_height):
+            raise ValueError(f'({x}, {y}) is outside the {self.board_width}x{self.board_height} board.')
+        if self.obstacles is not None and self.obstacles.is_blocked(x, y):
+            raise ValueError(f'Cell ({x}, {y}) is blocked by an obstacle.')
+        return (y * self.board_width + x) * 4 + (index & 3), index >> 2
+
+    def _move(self, state, diagonal):
+        """
+        Return the state reached by MOVE, or None if the robot cannot move.
+        """
+        cell = state >> 2
+        index = (state & 3) | (diagonal << 2)
+        x = cell % self.board_width + DELTA_X[index]
+        y = cell // self.board_width + DELTA_Y[index]
+        if not (0 <= x < self.board_width and 0 <= y < self.board_height):
+            return None
+        cell = y * self.board_width + x
+        if self.obstacles is not None and self.obstacles.blocked[cell]:
+            return None
+        return cell * 4 + (state & 3)
+
+    def distances(self, x, y, facing):
+        """
+        Return the distance table of a goal state.
+
+        Parameters:
+        - x (int): X-coordinate of the goal.
+        - y (int): Y-coordinate of the goal.
+        - facing (str or int): Facing direction of the goal, or its index in FACINGS.
+
+        Returns:
+        - array: array('i') giving, for every encoded state of the goal's facing group, the
+          number of commands to reach the goal, or -1 if it cannot be reached.
+        """
+        key = self._encode(x, y, facing)
+        tables = self._tables
+        table = tables.get(key)
+        if table is not None:
+            tables[key] = tables.pop(key)
+            return table
+        table = self._distance_table(*key)
+        if self.cache_size:
+            tables[key] = table
+            if len(tables) > self.cache_size:
+                del tables[next(iter(tables))]
+        return table
+
+    def _distance_table(self, goal, diagonal):
+        """
+        Breadth-first search from the goal over the reversed LEFT, RIGHT and MOVE commands.
+        """
+        width, height = self.board_width, self.board_height
+        blocked = self.obstacles.blocked if self.obstacles is not None else None
+        table = array('i', [-1]) * (width * height * 4)
+        table[goal] = 0
+        frontier = [goal]
+        distance = 0
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for state in frontier:
+                facing = state & 3
+                base = state - facing
+                # LEFT from the heading on the right and RIGHT from the heading on the left
+                for previous in (base | ((facing + 1) & 3), base | ((facing + 3) & 3)):
+                    if table[previous] < 0:
+                        table[previous] = distance
+                        next_frontier.append(previous)
+                # MOVE from the cell behind
+                index = facing | (diagonal << 2)
+                cell = state >> 2
+                x = cell % width - DELTA_X[index]
+                y = cell // width - DELTA_Y[index]
+                if 0 <= x < width and 0 <= y < height:
+                    cell = y * width + x
+                    previous = cell * 4 + facing
+                    if table[previous] < 0 and (blocked is None or not blocked[cell]):
+                        table[previous] = distance
+                        next_frontier.append(previous)
+            frontier = next_frontier
+        return table
+
+    def distance(self, start, goal):
+        """
+        Return the number of commands of the shortest path between two robot states.
+
+        Parameters:
+        - start (tuple): (x, y, facing) of the robot.
+        - goal (tuple): (x, y, facing) to reach.
+
+        Returns:
+        - int: The number of commands, or None if the goal cannot be reached.
+        """
+        state, diagonal = self._encode(*start)
+        if diagonal != self._encode(*goal)[1]:
+            return None
+        distance = self.distances(*goal)[state]
+        return distance if distance >= 0 else None
+
+    def plan(self, start, goal):
+        """
+        Return a shortest command sequence between two robot states.
+
+        Parameters:
+        - start (tuple): (x, y, facing) of the robot.
+        - goal (tuple): (x, y, facing) to reach.
+
+        Returns:
+        - list: The commands ('MOVE', 'LEFT' or 'RIGHT'), or None if the goal cannot be reached.
+        """
+        state, diagonal = self._encode(*start)
+        if diagonal != self._encode(*goal)[1]:
+            return None
+        table = self.distances(*goal)
+        distance = table[state]
+        if distance < 0:
+            return None
+        commands = []
+        while distance:
+            facing = state & 3
+            base = state - facing
+            moved = self._move(state, diagonal)
+            if moved is not None and table[moved] == distance - 1:
+                commands.append('MOVE')
+                state = moved
+            elif table[base | ((facing + 3) & 3)] == distance - 1:
+                commands.append('LEFT')
+                state = base | ((facing + 3) & 3)
+            else:
+                commands.append('RIGHT')
+                state = base | ((facing + 1) & 3)
+            distance -= 1
+        return commands
+
+    def reachable(self, x, y, facing):
+        """
+        Return the states a robot can reach from a state.
+
+        Parameters:
+        - x (int): X-coordinate of the robot.
+        - y (int): Y-coordinate of the robot.
+        - facing (str or int): Facing direction of the robot, or its index in FACINGS.
+
+        Returns:
+        - bytearray: One visited flag per encoded state of the robot's facing group.
+        """
+        start, diagonal = self._encode(x, y, facing)
+        visited = bytearray(self.board_width * self.board_height * 4)
+        visited[start] = 1
+        stack = [start]
+        while stack:
+            state = stack.pop()
+            facing = state & 3
+            base = state - facing
+            for following in (base | ((facing + 1) & 3), base | ((facing + 3) & 3), self._move(state, diagonal)):
+                if following is not None and not visited[following]:
+                    visited[following] = 1
+                    stack.append(following)
+        return visited
@@ -0,0 +1,128 @@
+import mmap
+from toy_robot import get_logger
+
+# Number of REPORT outputs buffered before they are written out.
+OUTPUT_BUFFER_SIZE = 4096
+
+
+def iter_lines(path, start=0):
+    """
+    Iterate over the non-blank lines of a file through a read-only memory map.
+
+    The file is never read into memory as a whole and the lines are not decoded, so the
+    resident memory stays constant whatever the size of the file.
+
+    Parameters:
+    - path (str): Path of the command file.
+    - start (int): Byte offset to start reading from. Default is 0.
+
+    Returns:
+    - generator: The stripped lines as bytes.
+    """
+    for line, _ in _iter_lines(path, start):
+        yield line
+
+
+def _iter_lines(path, start=0):
+    """
+    Iterate over the non-blank lines of a file with the byte offset following each line.
+    """
+    with open(path, 'rb') as stream:
+        try:
+            buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # an empty file cannot be mapped
+            return
+        with buffer:
+            find = buffer.find
+            end = len(buffer)
+            position = start
+            while position < end:
+                newline = find(b'\n', position)
+                if newline < 0:
+                    newline = end
+                line = buffer[position:newline].strip()
+                position = newline + 1
+                if line:
+                    yield line, position
+
+
+def run_file(path, robot, out, dispatch=None, start=0, checkpoint=None, checkpoint_every=1000000):
+    """
+    Execute the commands of a file on a robot straight from the memory-mapped bytes.
+
+    The common commands are matched as bytes without decoding the line; only PLACE and
+    the other commands are decoded. Execution stops at EXIT.
+
+    Parameters:
+    - path (str): Path of the command file.
+    - robot (ToyRobot): Robot executing the commands.
+    - out (file): Text stream receiving the REPORT outputs.
+    - dispatch (callable): Called as dispatch(robot, command) for the other commands, e.g.
+      main.parse_command. They are logged as invalid if omitted.
+    - start (int): Byte offset to resume from, e.g. the position of a checkpoint.
+    - checkpoint (callable): Called as checkpoint(position) every checkpoint_every commands,
+      with the byte offset following the last executed command. The pending REPORT
+      outputs are written out first.
+    - checkpoint_every (int): Number of commands between checkpoints.
+
+    Returns:
+    - int: Number of commands executed.
+    """
+    handlers = {
+        b'MOVE': robot.move,
+        b'LEFT': robot.left,
+        b'RIGHT': robot.right,
+    }
+    outputs = []
+    count = 0
+    next_checkpoint = checkpoint_every if checkpoint is not None else -1
+    for line, position in _iter_lines(path, start):
+        handler = handlers.get(line)
+        if handler is not None:
+            handler()
+            count += 1
+            if count == next_checkpoint:
+                outputs = _checkpoint(out, outputs, checkpoint, position)
+                next_checkpoint += checkpoint_every
+            continue
+        if not line.startswith(b'PLACE'):
+            line = line.upper()
+            handler = handlers.get(line)
+        if handler is not None:
+            handler()
+        elif line.startswith(b'PLACE'):
+            robot.place(line.decode('ascii', 'replace').upper())
+        elif line == b'EXIT':
+            break
+        else:
+            if line == b'REPORT':
+                output = robot.report()
+            elif dispatch is not None:
+                output = dispatch(robot, line.decode('ascii', 'replace'))
+            else:
+                get_logger().error(f"Invalid command: {line.decode('ascii', 'replace')}")
+                output = None
+            if output:
+                outputs.append(output)
+                if len(outputs) >= OUTPUT_BUFFER_SIZE:
+                    out.write('\n'.join(outputs) + '\n')
+                    outputs = []
+        count += 1
+        if count == next_checkpoint:
+            outputs = _checkpoint(out, outputs, checkpoint, position)
+            next_checkpoint += checkpoint_every
+    if outputs:
+        out.write('\n'.join(outputs) + '\n')
+    out.flush()
+    return count
+
+
+def _checkpoint(out, outputs, checkpoint, position):
+    """
+    Write out the pending outputs, then call the checkpoint function.
+    """
+    if outputs:
+        out.write('\n'.join(outputs) + '\n')
+    out.flush()
+    checkpoint(position)
+    return []
@@ -0,0 +1,80 @@
+import argparse
+import os
+import sys
+from functools import partial
+from multiprocessing import Pool
+from toy_robot import ToyRobot
+from compiler import compile_commands, fold_runs, execute
+
+
+def replay_session(path, board_width=5, board_height=5):
+    """
+    Replay one command file on a new robot.
+
+    Parameters:
+    - path (str): Path of the command file, one command per line.
+    - board_width (int): Width of the board.
+    - board_height (int): Height of the board.
+
+    Returns:
+    - result (dict): The final state and outputs of the session.
+        - path (str): Path of the command file.
+        - x (int): Final x-coordinate (None if never placed).
+        - y (int): Final y-coordinate (None if never placed).
+        - facing (str): Final facing direction (None if never placed).
+        - outputs (list): The REPORT outputs, in order.
+    """
+    with open(path, 'r') as stream:
+        program = fold_runs(compile_commands(stream, board_width, board_height))
+    robot = ToyRobot(board_width, board_height, quiet=True)
+    outputs = execute(program, robot)
+    return {'path': path, 'x': robot.x, 'y': robot.y, 'facing': robot.facing, 'outputs': outputs}
+
+
+def replay_sessions(paths, board_width=5, board_height=5, processes=None):
+    """
+    Replay many independent command files, sharded across a pool of worker processes.
+
+    Only the file paths are sent to the workers, which read the files themselves. The
+    results come back in the order of the paths whatever the number of processes.
+
+    Parameters:
+    - paths (list): Paths of the command files.
+    - board_width (int): Width of the board.
+    - board_height (int): Height of the board.
+    - processes (int): Number of worker processes, defaults to the number of CPUs. With 1
+      the sessions are replayed in the current process.
+
+    Returns:
+    - list: One result dict per path (see replay_session).
+    """
+    replay = partial(replay_session, board_width=board_width, board_height=board_height)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(paths))
+    if processes <= 1:
+        return [replay(path) for path in paths]
+    chunksize = max(1, len(paths) // (processes * 4))
+    with Pool(processes) as pool:
+        return pool.map(replay, paths, chunksize)
+
+
+def main(argv=None):
+    """
+    Replay the command files given on the command line and print the results in order.
+    """
+    parser = argparse.ArgumentParser(description='Replay toy robot sessions in parallel.')
+    parser.add_argument('paths', nargs='+', help='Command files, one session per file.')
+    parser.add_argument('--processes', type=int, help='Number of worker processes (default: number of CPUs).')
+    parser.add_argument('--width', type=int, default=5, help='Board width.')
+    parser.add_argument('--height', type=int, default=5, help='Board height.')
+    args = parser.parse_args(argv)
+
+    lines = []
+    for result in replay_sessions(args.paths, args.width, args.height, args.processes):
+        lines.append(f"{result['path']}: {result['x']},{result['y']},{result['facing']}")
+        lines.extend(f"  {output}" for output in result['outputs'])
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+if __name__ == "__main__":
+    main()
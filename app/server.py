@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import logging
+from toy_robot import ToyRobot, configure_logging
+from main import parse_command
+
+# Maximum number of bytes read from a connection at once.
+READ_SIZE = 1 << 16
+
+# Maximum length of a command line, a longer line closes the connection.
+MAX_LINE_SIZE = 4096
+
+# Maximum number of robot sessions of one connection.
+MAX_SESSIONS = 64
+
+
+class RobotConnection:
+    def __init__(self, board_width=5, board_height=5, max_sessions=MAX_SESSIONS):
+        """
+        Initialize the robot sessions owned by one client connection.
+
+        Every connection starts with session 1. 'SESSION <id>' switches to another session
+        of the same connection, creating it if needed, up to max_sessions sessions.
+
+        Parameters:
+        - board_width (int): Width of the board.
+        - board_height (int): Height of the board.
+        - max_sessions (int): Maximum number of sessions of the connection. Default is MAX_SESSIONS.
+        """
+        self.board_width = board_width
+        self.board_height = board_height
+        self.max_sessions = max_sessions
+        self.sessions = {}
+        self.robot = self._session(1)
+
+    def _session(self, session_id):
+        robot = self.sessions.get(session_id)
+        if robot is None:
+            if len(self.sessions) >= self.max_sessions:
+                return None
+            robot = self.sessions[session_id] = ToyRobot(self.board_width, self.board_height, quiet=True, show_board=False)
+        return robot
+
+    def execute(self, command):
+        """
+        Execute one command and build its response line.
+
+        Parameters:
+        - command (str): Command received from the client.
+
+        Returns:
+        - str: The response: the REPORT output, 'OK', or 'ERROR <message>' for an invalid
+          command or a command the robot ignored (e.g. MOVE before PLACE).
+        """
+        if command.startswith('SESSION '):
+            session_id = command[8:].strip()
+            try:
+                session_id = int(session_id) if session_id.isascii() and session_id.isdigit() else None
+            except ValueError:  # longer than sys.get_int_max_str_digits()
+                session_id = None
+            if session_id is None:
+                return f"ERROR Invalid command: {command}"
+            robot = self._session(session_id)
+            if robot is None:
+                return f"ERROR Too many sessions, the limit is {self.max_sessions} per connection."
+            self.robot = robot
+            return 'OK'
+
+        robot = self.robot
+        robot.message = ''
+        result = parse_command(robot, command)
+        if result is False:
+            return f"ERROR Invalid command: {command}"
+        # The robot sets its message for every command it rejects or ignores
+        if robot.message:
+            return f"ERROR {robot.message}"
+        return result or 'OK'
+
+
+async def handle_client(reader, writer, board_width=5, board_height=5):
+    """
+    Serve one client: newline-delimited commands in, one response line per command out.
+
+    Clients may pipeline commands. All the complete lines of a read are executed and their
+    responses written back with a single write, and the next read waits until the client
+    has drained the responses (backpressure). A line longer than MAX_LINE_SIZE bytes is
+    answered with an error and closes the connection.
+
+    Parameters:
+    - reader (StreamReader): Stream of the client commands.
+    - writer (StreamWriter): Stream of the responses.
+    - board_width (int): Width of the board.
+    - board_height (int): Height of the board.
+    """
+    connection = RobotConnection(board_width, board_height)
+    pending = b''
+    try:
+        while True:
+            data = await reader.read(READ_SIZE)
+            if not data:
+                break
+            lines = (pending + data).split(b'\n')
+            pending = lines.pop()
+            responses = []
+            closing = False
+            for line in lines:
+                command = line.decode('ascii', 'replace').strip().upper()
+                if not command:
+                    continue
+                if command == 'EXIT':
+                    closing = True
+                    break
+                responses.append(connection.execute(command))
+            if not closing and len(pending) > MAX_LINE_SIZE:
+                # Without a limit the partial line would grow, and be copied, on every read
+                responses.append(f'ERROR Line too long, the limit is {MAX_LINE_SIZE} bytes.')
+                closing = True
+            if responses:
+                writer.write(('\n'.join(responses) + '\n').encode('ascii', 'replace'))
+                await writer.drain()
+            if closing:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(host='127.0.0.1', port=8765, path=None, board_width=5, board_height=5):
+    """
+    Start the robot server on a TCP port, or on a Unix socket if a path is given.
+
+    Parameters:
+    - host (str): Interface to listen on.
+    - port (int): TCP port, 0 picks a free port.
+    - path (str): Path of a Unix socket, used instead of host and port.
+    - board_width (int): Width of the board.
+    - board_height (int): Height of the board.
+
+    Returns:
+    - Server: The asyncio server.
+    """
+    async def handler(reader, writer):
+        await handle_client(reader, writer, board_width, board_height)
+
+    if path:
+        return await asyncio.start_unix_server(handler, path=path, backlog=4096)
+    return await asyncio.start_server(handler, host, port, backlog=4096)
+
+
+async def _serve(args):
+    server = await start_server(args.host, args.port, args.unix, args.width, args.height)
+    logging.info('Serving on %s', ', '.join(str(sock.getsockname()) for sock in server.sockets))
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    """
+    Run the robot server until interrupted.
+    """
+    parser = argparse.ArgumentParser(description='Toy robot server.')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on.')
+    parser.add_argument('--port', type=int, default=8765, help='TCP port.')
+    parser.add_argument('--unix', help='Listen on this Unix socket path instead of TCP.')
+    parser.add_argument('--width', type=int, default=5, help='Board width.')
+    parser.add_argument('--height', type=int, default=5, help='Board height.')
+    args = parser.parse_args(argv)
+    configure_logging()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import os
+import sys
+import struct
+from array import array
+from toy_robot import ToyRobot
+from journal import StateJournal
+
+# File layout: a fixed header followed by one packed state (see journal.pack_state) per
+# robot, stored as little-endian signed 64-bit integers. A robot snapshot may end with
+# the UNDO/REDO journal of the robot: the number of states and the current position,
+# then the journal states in the same format.
+MAGIC = b'TRSN'
+VERSION = 1
+_HEADER = struct.Struct('<4sHxxQQQQ')
+_JOURNAL = struct.Struct('<QQ')
+
+
+def save_states(path, states, board_width, board_height, position=0, journal=None):
+    """
+    Write packed robot states to a snapshot file.
+
+    The file is written next to the target and renamed over it, so an interrupted save
+    never leaves a truncated snapshot behind.
+
+    Parameters:
+    - path (str): Path of the snapshot file.
+    - states (array): Packed states as an array('q').
+    - board_width (int): Width of the board.
+    - board_height (int): Height of the board.
+    - position (int): Replay position stored with the snapshot (e.g. a byte offset).
+    - journal (tuple): (states, position) of a robot journal (see StateJournal.export).
+      Default is None, no journal is stored.
+    """
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as stream:
+        stream.write(_HEADER.pack(MAGIC, VERSION, board_width, board_height, position, len(states)))
+        _write_states(stream, states)
+        if journal is not None:
+            stream.write(_JOURNAL.pack(len(journal[0]), journal[1]))
+            _write_states(stream, journal[0])
+    os.replace(temporary_path, path)
+
+
+def _write_states(stream, states):
+    if sys.byteorder != 'little':
+        states = array('q', states)
+        states.byteswap()
+    states.tofile(stream)
+
+
+def _read_states(stream, count):
+    states = array('q')
+    states.fromfile(stream, count)
+    if sys.byteorder != 'little':
+        states.byteswap()
+    return states
+
+
+def load_states(path):
+    """
+    Read a snapshot file written by save_states.
+
+    Parameters:
+    - path (str): Path of the snapshot file.
+
+    Returns:
+    - snapshot (dict): The content of the file.
+        - board_width (int): Width of the board.
+        - board_height (int): Height of the board.
+        - position (int): Replay position stored with the snapshot.
+        - states (array): The packed states as an array('q').
+        - journal (tuple): (states, position) of the robot journal, or None if not stored.
+    """
+    with open(path, 'rb') as stream:
+        header = stream.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError(f'{path} is not a robot snapshot: file is too short.')
+        magic, version, board_width, board_height, position, count = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a robot snapshot.')
+        if version != VERSION:
+            raise ValueError(f'Unsupported snapshot version {version}, expected {VERSION}.')
+        states = _read_states(stream, count)
+        journal = None
+        trailer = stream.read(_JOURNAL.size)
+        if trailer:
+            if len(trailer) != _JOURNAL.size:
+                raise ValueError(f'{path} is not a robot snapshot: journal is truncated.')
+            journal_count, journal_position = _JOURNAL.unpack(trailer)
+            journal = (_read_states(stream, journal_count), journal_position)
+    return {'board_width': board_width, 'board_height': board_height, 'position': position, 'states': states,
+            'journal': journal}
+
+
+def save_robot(robot, path, position=0):
+    """
+    Save the state of one robot, with its UNDO/REDO journal if history is enabled.
+
+    Parameters:
+    - robot (ToyRobot): The robot to save.
+    - path (str): Path of the snapshot file.
+    - position (int): Replay position stored with the snapshot.
+    """
+    journal = robot.journal.export() if robot.journal is not None else None
+    save_states(path, array('q', [robot.state]), robot.board_width, robot.board_height, position, journal)
+
+
+def load_robot(path, robot=None):
+    """
+    Load the state of one robot.
+
+    If the robot keeps a history, its journal is restored from the snapshot, or restarted
+    from the loaded state if the snapshot has no journal.
+
+    Parameters:
+    - path (str): Path of the snapshot file.
+    - robot (ToyRobot): Robot to restore the state into, a new quiet ToyRobot is created if omitted.
+
+    Returns:
+    - tuple: (robot, position).
+    """
+    snapshot = load_states(path)
+    if len(snapshot['states']) != 1:
+        raise ValueError(f"{path} holds {len(snapshot['states'])} robots, expected 1.")
+    if robot is None:
+        robot = ToyRobot(snapshot['board_width'], snapshot['board_height'], quiet=True)
+    elif (robot.board_width, robot.board_height) != (snapshot['board_width'], snapshot['board_height']):
+        raise ValueError('Snapshot was saved for a %dx%d board, robot board is %dx%d.' % (
+            snapshot['board_width'], snapshot['board_height'], robot.board_width, robot.board_height))
+    robot.state = snapshot['states'][0]
+    if robot.journal is not None:
+        if snapshot['journal'] is not None:
+            robot.journal.load(*snapshot['journal'])
+        else:
+            robot.journal = StateJournal(robot.journal.capacity, robot.state)
+    return robot, snapshot['position']
+
+
+def save_fleet(fleet, path, position=0):
+    """
+    Save the state of every robot of a RobotFleet.
+
+    Parameters:
+    - fleet (RobotFleet): The fleet to save.
+    - path (str): Path of the snapshot file.
+    - position (int): Replay position stored with the snapshot.
+    """
+    save_states(path, array('q', fleet.packed_states().tobytes()), fleet.board_width, fleet.board_height, position)
+
+
+def load_fleet(path):
+    """
+    Load a RobotFleet saved with save_fleet.
+
+    Parameters:
+    - path (str): Path of the snapshot file.
+
+    Returns:
+    - tuple: (fleet, position).
+    """
+    # Imported here so that loading a single robot does not pay for the NumPy import
+    from fleet import RobotFleet
+    snapshot = load_states(path)
+    fleet = RobotFleet(len(snapshot['states']), snapshot['board_width'], snapshot['board_height'])
+    fleet.load_packed_states(snapshot['states'])
+    return fleet, snapshot['position']
@@ -1,34 +1,121 @@
-import logging
 from validation import TableValidator
+from journal import StateJournal, pack_state, unpack_state
+
+# Facing directions, with the unit step and board symbol of each one. The cardinal
+# directions come first in clockwise order, then the diagonals in clockwise order, so
+# index 4 + i is the diagonal between the cardinal directions i and i + 1. A robot
+# stores its facing as the index in FACINGS (-1 when not placed).
+FACINGS = ('NORTH', 'EAST', 'SOUTH', 'WEST', 'NE', 'SE', 'SW', 'NW')
+DELTA_X = (0, 1, 0, -1, 1, 1, -1, -1)
+DELTA_Y = (1, 0, -1, 0, 1, -1, -1, 1)
+DIRECTION_SYMBOLS = ('^', '>', 'v', '<', '↗', '↘', '↙', '↖')
+
+# Facing index after a LEFT and after a RIGHT, for every facing index.
+LEFT_OF = (3, 0, 1, 2, 7, 4, 5, 6)
+RIGHT_OF = (1, 2, 3, 0, 5, 6, 7, 4)
+
+# Number of cells shown around the robot when REPORT prints the board.
+BOARD_VIEWPORT_RADIUS = 10
+
+# Value of logging.INFO, so that the logging module is only imported when a log is written.
+INFO = 20
+
+_logging_configured = False
+
+def configure_logging(level=INFO):
+    """
+    Set up the console log output once per process.
+
+    Parameters:
+    - level (int): Log level of the root logger. Default is logging.INFO.
+    """
+    global _logging_configured
+    if not _logging_configured:
+        import logging
+        logging.basicConfig(
+            level=level,  
+            format='%(levelname)s: %(message)s'
+        )
+        _logging_configured = True
+
+def get_logger(name=None):
+    """
+    Return a logger, importing the logging module and setting up the log output on first use.
+
+    Parameters:
+    - name (str): Name of the logger. Default is None, the root logger.
+
+    Returns:
+    - Logger: The logger.
+    """
+    import logging
+    configure_logging()
+    return logging.getLogger(name)
+
+class _LazyLogger:
+    """
+    Class attribute that creates its logger on first access and then replaces itself with it.
+
+    Startup stays free of the logging import for runs that never log, e.g. quiet batch runs.
+    """
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        logger = get_logger(self.name)
+        setattr(owner, 'logger', logger)
+        return logger
 
 class ToyRobot:
-    def __init__(self, board_width=5, board_height=5):
+    __slots__ = ('board_width', 'board_height', 'x', 'y', 'facing_index', 'is_placed', 'message', 'quiet', 'show_board', 'validator', 'journal', 'obstacles', 'trajectory')
+
+    logger = _LazyLogger('ToyRobot')
+
+    def __init__(self, board_width=5, board_height=5, quiet=False, show_board=True, history=0, obstacles=None, trajectory=None):
         """
         Initialize the ToyRobot with a board of the specified dimensions.
         
         Parameters:
         - board_width (int): Width of the board.
         - board_height (int): Height of the board.
+        - quiet (bool): Skip the INFO and WARNING logs of every command (performance mode).
+          Errors are still logged. Default is False.
+        - show_board (bool): Print the cells around the robot on REPORT. Default is True.
+        - history (int): Number of states kept for UNDO/REDO. Default is 0 (disabled).
+        - obstacles (ObstacleMap): Obstacles of the board, which stop the moves and cannot be
+          placed on. Default is None.
+        - trajectory (Trajectory): Records the position of the robot after every PLACE,
+          MOVE, rotation, UNDO and REDO it executes, with MOVE N recording the position it
+          stops at. Default is None.
         """
+        if obstacles is not None and (obstacles.board_width, obstacles.board_height) != (board_width, board_height):
+            raise ValueError('Obstacle map is %dx%d, robot board is %dx%d.' % (
+                obstacles.board_width, obstacles.board_height, board_width, board_height))
         self.board_width = board_width
         self.board_height = board_height
+        self.quiet = quiet
+        self.show_board = show_board
         self.x = None
         self.y = None
-        self.facing = None
+        self.facing_index = -1
         self.is_placed = False
         self.message = ''
-        self.direction_symbols = {
-            'NORTH': '^',  
-            'EAST': '>',   
-            'SOUTH': 'v',  
-            'WEST': '<'    
-        }
-        self.validator = TableValidator(board_width, board_height)
-        self.logger = logging.getLogger(self.__class__.__name__)
-        logging.basicConfig(
-            level=logging.INFO,  
-            format='%(levelname)s: %(message)s'
-        )
+        self.validator = TableValidator.for_board(board_width, board_height) if obstacles is None else obstacles.validator
+        self.obstacles = obstacles
+        self.trajectory = trajectory
+        self.journal = StateJournal(history) if history else None
+
+    @property
+    def facing(self):
+        """
+        The facing direction name of the robot, or None if it is not placed.
+        """
+        index = self.facing_index
+        return FACINGS[index] if index >= 0 else None
+
+    @facing.setter
+    def facing(self, value):
+        self.facing_index = FACINGS.index(value) if value is not None else -1
 
     def place(self, command):
         """
@@ -39,83 +126,247 @@ class ToyRobot:
         """
         result = self.validator.validate_place(command)
         if result['is_valid']:
-            self.x = result['x']
-            self.y = result['y']
-            self.facing = result['facing']
-            self.is_placed = True
-            self.logger.info('Robot placed at (%d, %d) facing %s', self.x, self.y, self.facing)
+            self.place_at(result['x'], result['y'], result['facing'])
 
         else:
             self.message = result['message']
             self.logger.error(result['message'])
 
-    def move(self):
+    def place_at(self, x, y, facing):
         """
-        Move the robot one unit forward in the direction it is currently facing.
+        Place the robot at coordinates that have already been validated.
+
+        Parameters:
+        - x (int): X-coordinate of the robot.
+        - y (int): Y-coordinate of the robot.
+        - facing (str or int): Facing direction of the robot, or its index in FACINGS.
         """
-        if self.validator.validate_placement(self):
+        self.x = x
+        self.y = y
+        self.facing_index = facing if facing.__class__ is int else FACINGS.index(facing)
+        self.is_placed = True
+        if self.journal is not None:
+            self._record()
+        if self.trajectory is not None:
+            self.trajectory.record(x, y, self.facing_index)
+        if not self.quiet:
+            self.logger.info('Robot placed at (%d, %d) facing %s', self.x, self.y, self.facing)
+
+    def move(self, steps=1):
+        """
+        Move the robot forward in the direction it is currently facing.
+
+        The robot moves as many whole units as it can, up to `steps`, and stops at the edge
+        of the table or in front of the first obstacle. A diagonal move stops as soon as
+        either coordinate reaches the edge, so the robot stays on its diagonal. Either way,
+        moving several units at once ends in the same position as repeating MOVE that many
+        times, computed in constant time.
+
+        Parameters:
+        - steps (int): Number of units to move. Default is 1.
+        """
+        if self.is_placed:
             old_x, old_y = self.x, self.y
-            if self.facing == "NORTH" and self.y < self.board_height - 1:
-                self.y += 1
-            elif self.facing == "SOUTH" and self.y > 0:
-                self.y -= 1
-            elif self.facing == "EAST" and self.x < self.board_width - 1:
-                self.x += 1
-            elif self.facing == "WEST" and self.x > 0:
-                self.x -= 1
+            index = self.facing_index
+            obstacles = self.obstacles
+            if obstacles is not None:
+                steps = min(steps, obstacles.rooms[index][old_y * self.board_width + old_x])
+                self.x = old_x + DELTA_X[index] * steps
+                self.y = old_y + DELTA_Y[index] * steps
+            elif index < 4:
+                self.x = min(max(old_x + DELTA_X[index] * steps, 0), self.board_width - 1)
+                self.y = min(max(old_y + DELTA_Y[index] * steps, 0), self.board_height - 1)
             else:
-                self.logger.warning('Move ignored to prevent falling off the table from (%d, %d) facing %s', old_x, old_y, self.facing)
+                delta_x, delta_y = DELTA_X[index], DELTA_Y[index]
+                steps = min(steps,
+                            self.board_width - 1 - old_x if delta_x > 0 else old_x,
+                            self.board_height - 1 - old_y if delta_y > 0 else old_y)
+                self.x = old_x + delta_x * steps
+                self.y = old_y + delta_y * steps
+            if self.journal is not None:
+                self._record()
+            if self.trajectory is not None:
+                self.trajectory.record(self.x, self.y, self.facing_index)
+            if self.quiet:
+                return
+            if self.x == old_x and self.y == old_y:
+                ahead_x, ahead_y = old_x + DELTA_X[index], old_y + DELTA_Y[index]
+                if 0 <= ahead_x < self.board_width and 0 <= ahead_y < self.board_height:
+                    self.logger.warning('Move ignored: blocked by an obstacle at (%d, %d) facing %s', old_x, old_y, self.facing)
+                else:
+                    self.logger.warning('Move ignored to prevent falling off the table from (%d, %d) facing %s', old_x, old_y, self.facing)
                 return
             self.logger.info('Moved from (%d, %d) to (%d, %d), facing %s', old_x, old_y, self.x, self.y, self.facing)
         else:
-            self.logger.error('MOVE command ignored: Robot is not placed on the table.')
+            self.message = 'MOVE command ignored: Robot is not placed on the table.'
+            self.logger.error(self.message)
 
     def left(self):
         """
         Rotate the robot 90 degrees to the left (counterclockwise) without changing its position.
         """
-        if self.validator.validate_placement(self):
-            directions = ["NORTH", "WEST", "SOUTH", "EAST"]
-            old_direction = self.facing
-            self.facing = directions[(directions.index(self.facing) + 1) % 4]
-            self.logger.info('Successfully rotated from %s to %s', old_direction, self.facing)
+        if self.is_placed:
+            old_index = self.facing_index
+            self.facing_index = LEFT_OF[old_index]
+            if self.journal is not None:
+                self._record()
+            if self.trajectory is not None:
+                self.trajectory.record(self.x, self.y, self.facing_index)
+            if not self.quiet:
+                self.logger.info('Successfully rotated from %s to %s', FACINGS[old_index], self.facing)
         else:
-            self.logger.error('LEFT command ignored: Robot is not placed on the table.')
+            self.message = 'LEFT command ignored: Robot is not placed on the table.'
+            self.logger.error(self.message)
 
     def right(self):
         """
         Rotate the robot 90 degrees to the right (clockwise) without changing its position.
         """
-        if self.validator.validate_placement(self):
-            directions = ["NORTH", "EAST", "SOUTH", "WEST"]
-            old_direction = self.facing
-            self.facing = directions[(directions.index(self.facing) + 1) % 4]
-            self.logger.info('Robot successfully rotated from %s to %s', old_direction, self.facing)
+        if self.is_placed:
+            old_index = self.facing_index
+            self.facing_index = RIGHT_OF[old_index]
+            if self.journal is not None:
+                self._record()
+            if self.trajectory is not None:
+                self.trajectory.record(self.x, self.y, self.facing_index)
+            if not self.quiet:
+                self.logger.info('Robot successfully rotated from %s to %s', FACINGS[old_index], self.facing)
+
+        else:
+            self.message = 'RIGHT command ignored: Robot is not placed on the table.'
+            self.logger.error(self.message)
+
+    def turn(self, quarter_turns):
+        """
+        Rotate the robot clockwise by a number of 90 degree turns without changing its position.
 
+        Parameters:
+        - quarter_turns (int): Number of clockwise turns, negative values turn counterclockwise.
+        """
+        if self.is_placed:
+            old_index = self.facing_index
+            self.facing_index = (old_index & 4) | ((old_index + quarter_turns) & 3)
+            if self.journal is not None:
+                self._record()
+            if self.trajectory is not None:
+                self.trajectory.record(self.x, self.y, self.facing_index)
+            if not self.quiet:
+                self.logger.info('Robot successfully rotated from %s to %s', FACINGS[old_index], self.facing)
         else:
-            self.logger.error('RIGHT command ignored: Robot is not placed on the table.')
+            self.message = 'TURN command ignored: Robot is not placed on the table.'
+            self.logger.error(self.message)
+
+    def render_board(self, radius=None):
+        """
+        Render the board with the robot's current position and facing direction, one row at a time.
+
+        The rows are produced lazily from top to bottom, so only one row is held in memory
+        whatever the size of the board. Obstacles are shown as [#].
+
+        Parameters:
+        - radius (int): Only render the cells within this distance of the robot. Default is
+          None, which renders the whole board.
+
+        Returns:
+        - generator: The rows of the board as strings, e.g. '[ ] [^] [ ]'.
+        """
+        left, right, bottom, top = 0, self.board_width - 1, 0, self.board_height - 1
+        if radius is not None and self.is_placed:
+            left, right = max(left, self.x - radius), min(right, self.x + radius)
+            bottom, top = max(bottom, self.y - radius), min(top, self.y + radius)
+        empty_row = ' '.join(['[ ]'] * (right - left + 1))
+        blocked = self.obstacles.blocked if self.obstacles is not None else None
+        for row in range(top, bottom - 1, -1):
+            if blocked is not None:
+                start = row * self.board_width
+                cells = ['[#]' if cell else '[ ]' for cell in blocked[start + left:start + right + 1]]
+            elif self.is_placed and row == self.y:
+                cells = ['[ ]'] * (right - left + 1)
+            else:
+                yield empty_row
+                continue
+            if self.is_placed and row == self.y:
+                cells[self.x - left] = f"[{DIRECTION_SYMBOLS[self.facing_index]}]"
+            yield ' '.join(cells)
+
+    @property
+    def state(self):
+        """
+        The state of the robot packed into a single integer (see journal.pack_state).
+        """
+        return pack_state(self.x, self.y, self.facing_index, self.is_placed)
+
+    @state.setter
+    def state(self, value):
+        self.x, self.y, self.facing_index, self.is_placed = unpack_state(value)
+
+    def _record(self):
+        """
+        Record the current state in the journal.
+        """
+        self.journal.record(pack_state(self.x, self.y, self.facing_index, self.is_placed))
+
+    def undo(self, steps=1):
+        """
+        Revert the last state changes of the robot.
+
+        Parameters:
+        - steps (int): Number of state changes to revert. Default is 1.
+        """
+        if self.journal is None:
+            self.message = 'UNDO command ignored: History is not enabled.'
+            self.logger.error(self.message)
+        elif not self.journal.undo_depth:
+            self.message = 'UNDO command ignored: Nothing to undo.'
+            self.logger.error(self.message)
+        else:
+            steps = min(steps, self.journal.undo_depth)
+            self.state = self.journal.undo(steps)
+            if self.trajectory is not None and self.is_placed:
+                self.trajectory.record(self.x, self.y, self.facing_index)
+            if not self.quiet:
+                self.logger.info('Undid %d change(s), robot at (%s, %s) facing %s', steps, self.x, self.y, self.facing)
+
+    def redo(self, steps=1):
+        """
+        Reapply state changes reverted with undo.
+
+        Parameters:
+        - steps (int): Number of state changes to reapply. Default is 1.
+        """
+        if self.journal is None:
+            self.message = 'REDO command ignored: History is not enabled.'
+            self.logger.error(self.message)
+        elif not self.journal.redo_depth:
+            self.message = 'REDO command ignored: Nothing to redo.'
+            self.logger.error(self.message)
+        else:
+            steps = min(steps, self.journal.redo_depth)
+            self.state = self.journal.redo(steps)
+            if self.trajectory is not None and self.is_placed:
+                self.trajectory.record(self.x, self.y, self.facing_index)
+            if not self.quiet:
+                self.logger.info('Redid %d change(s), robot at (%s, %s) facing %s', steps, self.x, self.y, self.facing)
 
     def _print_board(self):
         """
-        Print the board with the robot's current position and facing direction.
+        Print the board around the robot's current position and facing direction.
         """
         self.logger.info('Current robot location: (%d, %d) %s', self.x, self.y, self.facing)
-        board = [[' ' for _ in range(self.board_width)] for _ in range(self.board_height)]
-        if self.is_placed:
-            board[self.board_height - 1 - self.y][self.x] = self.direction_symbols[self.facing]
-        for row in board:
-            self.logger.info(' '.join(f"[{cell}]" for cell in row))
-        
+        for row in self.render_board(BOARD_VIEWPORT_RADIUS):
+            self.logger.info(row)
 
     def report(self):
         """
         Output the current position and direction of the robot.
         """
         if self.is_placed:
-            symbol = self.direction_symbols.get(self.facing, '?')
             output = f"Output: {self.x},{self.y},{self.facing}"
-            self._print_board()
-            self.logger.info(output)
+            if not self.quiet and self.logger.isEnabledFor(INFO):
+                if self.show_board:
+                    self._print_board()
+                self.logger.info(output)
             return output
         else:
-            self.logger.error('REPORT command ignored: Robot is not placed on the table.')
+            self.message = 'REPORT command ignored: Robot is not placed on the table.'
+            self.logger.error(self.message)
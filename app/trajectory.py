@@ -0,0 +1,216 @@
+import os
+import sys
+import shutil
+import tempfile
+from array import array
+from bisect import bisect_left
+
+# Column types of a trajectory: step, x, y and facing index (see toy_robot.FACINGS).
+# A chunk file stores the full columns one after the other, little-endian.
+COLUMN_TYPES = ('q', 'i', 'i', 'b')
+_RECORD_SIZE = sum(array(typecode).itemsize for typecode in COLUMN_TYPES)
+
+
+class Trajectory:
+    def __init__(self, directory=None, chunk_size=65536):
+        """
+        Initialize an append-only record of robot positions, stored by column.
+
+        Positions are appended to typed arrays (step, x, y, facing). Every chunk_size
+        records the arrays are written to a chunk file and cleared, so memory use stays
+        bounded however long the run. For each cell, the index keeps the chunks in which the
+        robot stood on it, so a query for a cell only reads those chunks.
+
+        Parameters:
+        - directory (str): Directory of the chunk files. Default is None, which uses a
+          temporary directory removed by close(). Use Trajectory.open() to add to the
+          chunks already in a directory.
+        - chunk_size (int): Number of records per chunk. Default is 65536.
+        """
+        self._owns_directory = directory is None
+        self.directory = tempfile.mkdtemp(prefix='trajectory-') if directory is None else directory
+        os.makedirs(self.directory, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.next_step = 0
+        self._columns = tuple(array(typecode) for typecode in COLUMN_TYPES)
+        # First step, last step and record count of every chunk written to disk
+        self._chunk_first = array('q')
+        self._chunk_last = array('q')
+        self._chunk_count = array('q')
+        self._cell_chunks = {}
+        self._loaded = (None, None)
+
+    @classmethod
+    def open(cls, directory, chunk_size=65536):
+        """
+        Open the chunk files written by a previous recording, rebuilding the cell index.
+
+        Parameters:
+        - directory (str): Directory of the chunk files.
+        - chunk_size (int): Number of records per chunk for further recording.
+
+        Returns:
+        - Trajectory: The trajectory, new records are appended after the existing ones.
+        """
+        trajectory = cls(directory, chunk_size)
+        names = sorted(name for name in os.listdir(directory) if name.startswith('chunk-'))
+        for chunk_id, name in enumerate(names):
+            if name != trajectory._chunk_name(chunk_id):
+                raise ValueError(f'Missing trajectory chunk {trajectory._chunk_name(chunk_id)} in {directory}.')
+            count = os.path.getsize(os.path.join(directory, name)) // _RECORD_SIZE
+            steps, xs, ys, _ = trajectory._read_chunk(chunk_id, count)
+            trajectory._add_chunk(steps, count)
+            trajectory._index_chunk(chunk_id, xs, ys)
+            trajectory.next_step = steps[-1] + 1
+        return trajectory
+
+    def __len__(self):
+        return sum(self._chunk_count) + len(self._columns[0])
+
+    def record(self, x, y, facing_index, step=None):
+        """
+        Append a position.
+
+        Parameters:
+        - x (int): X-coordinate of the robot.
+        - y (int): Y-coordinate of the robot.
+        - facing_index (int): Facing index of the robot.
+        - step (int): Step number, increasing. Default is None, the step after the last one.
+        """
+        if step is None:
+            step = self.next_step
+        elif step < self.next_step:
+            raise ValueError(f'Step {step} is before the last recorded step {self.next_step - 1}.')
+        steps, xs, ys, facings = self._columns
+        steps.append(step)
+        xs.append(x)
+        ys.append(y)
+        facings.append(facing_index)
+        self.next_step = step + 1
+        if len(steps) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the records kept in memory to a new chunk file.
+        """
+        steps, xs, ys, _ = self._columns
+        if not steps:
+            return
+        chunk_id = len(self._chunk_count)
+        with open(self._chunk_path(chunk_id), 'wb') as stream:
+            for column in self._columns:
+                if sys.byteorder != 'little':
+                    column = array(column.typecode, column)
+                    column.byteswap()
+                column.tofile(stream)
+        self._add_chunk(steps, len(steps))
+        self._index_chunk(chunk_id, xs, ys)
+        self._columns = tuple(array(typecode) for typecode in COLUMN_TYPES)
+
+    def close(self):
+        """
+        Write the pending records, and remove the chunk files if the directory is temporary.
+        """
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+        else:
+            self.flush()
+
+    def columns(self, start_step=0, stop_step=None):
+        """
+        Yield the columns of the records with start_step <= step < stop_step, chunk by chunk.
+
+        Only the chunks overlapping the range are read.
+
+        Parameters:
+        - start_step (int): First step of the range.
+        - stop_step (int): End of the range (excluded). Default is None, up to the last record.
+
+        Returns:
+        - generator: (steps, x, y, facing) array slices.
+        """
+        if stop_step is None:
+            stop_step = self.next_step
+        for chunk_id in range(bisect_left(self._chunk_last, start_step), len(self._chunk_count)):
+            if self._chunk_first[chunk_id] >= stop_step:
+                return
+            yield self._slice(self._chunk_columns(chunk_id), start_step, stop_step)
+        if self._columns[0]:
+            yield self._slice(self._columns, start_step, stop_step)
+
+    def window(self, start_step=0, stop_step=None):
+        """
+        Yield the records with start_step <= step < stop_step.
+
+        Returns:
+        - generator: (step, x, y, facing_index) tuples.
+        """
+        for steps, xs, ys, facings in self.columns(start_step, stop_step):
+            yield from zip(steps, xs, ys, facings)
+
+    def visits(self, x, y):
+        """
+        Yield the records of the robot standing on a cell, in step order.
+
+        Only the chunks listed in the cell index and the records in memory are read.
+
+        Parameters:
+        - x (int): The x-coordinate.
+        - y (int): The y-coordinate.
+
+        Returns:
+        - generator: (step, facing_index) tuples.
+        """
+        for chunk_id in self._cell_chunks.get((x, y), ()):
+            yield from self._visits_in(self._chunk_columns(chunk_id), x, y)
+        yield from self._visits_in(self._columns, x, y)
+
+    def _visits_in(self, columns, x, y):
+        steps, xs, ys, facings = columns
+        for i, cell_x in enumerate(xs):
+            if cell_x == x and ys[i] == y:
+                yield steps[i], facings[i]
+
+    def _slice(self, columns, start_step, stop_step):
+        steps = columns[0]
+        start = bisect_left(steps, start_step)
+        stop = bisect_left(steps, stop_step, start)
+        return tuple(column[start:stop] for column in columns)
+
+    def _add_chunk(self, steps, count):
+        self._chunk_first.append(steps[0])
+        self._chunk_last.append(steps[-1])
+        self._chunk_count.append(count)
+
+    def _index_chunk(self, chunk_id, xs, ys):
+        for cell in set(zip(xs, ys)):
+            chunks = self._cell_chunks.get(cell)
+            if chunks is None:
+                chunks = self._cell_chunks[cell] = array('i')
+            chunks.append(chunk_id)
+
+    def _chunk_name(self, chunk_id):
+        return f'chunk-{chunk_id:08d}'
+
+    def _chunk_path(self, chunk_id):
+        return os.path.join(self.directory, self._chunk_name(chunk_id))
+
+    def _chunk_columns(self, chunk_id):
+        """
+        Return the columns of a chunk, keeping the last chunk read in memory.
+        """
+        loaded_id, columns = self._loaded
+        if loaded_id != chunk_id:
+            columns = self._read_chunk(chunk_id, self._chunk_count[chunk_id])
+            self._loaded = (chunk_id, columns)
+        return columns
+
+    def _read_chunk(self, chunk_id, count):
+        columns = tuple(array(typecode) for typecode in COLUMN_TYPES)
+        with open(self._chunk_path(chunk_id), 'rb') as stream:
+            for column in columns:
+                column.fromfile(stream, count)
+                if sys.byteorder != 'little':
+                    column.byteswap()
+        return columns
@@ -0,0 +1,186 @@
+from array import array
+from toy_robot import FACINGS, DELTA_X, DELTA_Y, LEFT_OF, RIGHT_OF
+from compiler import OP_PLACE, OP_MOVE, OP_LEFT, OP_RIGHT, OP_REPORT, OP_MOVE_N, OP_TURN
+
+
+class TransitionTable:
+    def __init__(self, board_width=5, board_height=5, obstacles=None, cache_size=8):
+        """
+        Precompute the next state of every robot state for MOVE, LEFT and RIGHT.
+
+        A placed state is the integer (y * board_width + x) * 8 + facing index (see
+        toy_robot.FACINGS), and the extra state board_width * board_height * 8 stands for a
+        robot that is not placed, which every command leaves unchanged. Running a command is
+        then a single array lookup, e.g. state = table.move[state], following the rules of
+        ToyRobot.move: one unit, no move at the edge or in front of an obstacle.
+
+        Repeating a block of commands n times costs O(log n) lookups with repeat(), from the
+        transforms of the block applied 1, 2, 4, ... times, which are built on first use and
+        kept in a bounded LRU cache of blocks. Each transform takes 4 bytes per state.
+
+        Parameters:
+        - board_width (int): Width of the board.
+        - board_height (int): Height of the board.
+        - obstacles (ObstacleMap): Obstacles of the board. Default is None.
+        - cache_size (int): Number of blocks whose transforms are kept. Default is 8.
+        """
+        if obstacles is not None and (obstacles.board_width, obstacles.board_height) != (board_width, board_height):
+            raise ValueError('Obstacle map is %dx%d, transition table is %dx%d.' % (
+                obstacles.board_width, obstacles.board_height, board_width, board_height))
+        self.board_width = board_width
+        self.board_height = board_height
+        self.unplaced = board_width * board_height * 8
+        self.size = self.unplaced + 1
+        self.blocked = blocked = obstacles.blocked if obstacles is not None else None
+
+        states = range(self.size)
+        self.left = array('i', [state - (state & 7) + LEFT_OF[state & 7] for state in states])
+        self.right = array('i', [state - (state & 7) + RIGHT_OF[state & 7] for state in states])
+        self.move = array('i', states)
+        for y in range(board_height):
+            for x in range(board_width):
+                for index in range(8):
+                    to_x, to_y = x + DELTA_X[index], y + DELTA_Y[index]
+                    if 0 <= to_x < board_width and 0 <= to_y < board_height:
+                        cell = to_y * board_width + to_x
+                        if blocked is None or not blocked[cell]:
+                            self.move[(y * board_width + x) * 8 + index] = cell * 8 + index
+        self.left[self.unplaced] = self.right[self.unplaced] = self.unplaced
+        self._tables = {'MOVE': self.move, 'LEFT': self.left, 'RIGHT': self.right}
+        self.cache_size = cache_size
+        self._powers = {}
+
+    def encode(self, x, y, facing):
+        """
+        Encode a placed robot state.
+
+        Parameters:
+        - x (int): X-coordinate of the robot.
+        - y (int): Y-coordinate of the robot.
+        - facing (str or int): Facing direction of the robot, or its index in FACINGS.
+
+        Returns:
+        - int: The state.
+        """
+        return (y * self.board_width + x) * 8 + (facing if facing.__class__ is int else FACINGS.index(facing))
+
+    def decode(self, state):
+        """
+        Decode a state.
+
+        Returns:
+        - tuple: (x, y, facing_index, is_placed), or (None, None, -1, False) if not placed.
+        """
+        if state == self.unplaced:
+            return (None, None, -1, False)
+        cell = state >> 3
+        return (cell % self.board_width, cell // self.board_width, state & 7, True)
+
+    def compose(self, commands):
+        """
+        Build the transform of a block of commands.
+
+        Parameters:
+        - commands (iterable): 'MOVE', 'LEFT' or 'RIGHT' commands.
+
+        Returns:
+        - array: array('i') giving the state reached from every state by running the block.
+        """
+        transform = array('i', range(self.size))
+        for command in commands:
+            table = self._tables[command]
+            transform = array('i', [table[state] for state in transform])
+        return transform
+
+    def repeat(self, state, commands, count):
+        """
+        Run a block of commands count times from a state, in O(log count) lookups.
+
+        Parameters:
+        - state (int): The starting state.
+        - commands (tuple): 'MOVE', 'LEFT' or 'RIGHT' commands.
+        - count (int): Number of times the block is run.
+
+        Returns:
+        - int: The state reached.
+        """
+        commands = tuple(commands)
+        cache = self._powers
+        powers = cache.get(commands)
+        if powers is not None:
+            cache[commands] = cache.pop(commands)
+        else:
+            powers = [self.compose(commands)]
+            if self.cache_size:
+                cache[commands] = powers
+                if len(cache) > self.cache_size:
+                    del cache[next(iter(cache))]
+        bit = 0
+        while count:
+            if bit == len(powers):
+                last = powers[-1]
+                powers.append(array('i', [last[middle] for middle in last]))
+            if count & 1:
+                state = powers[bit][state]
+            count >>= 1
+            bit += 1
+        return state
+
+    def execute(self, program, state=None):
+        """
+        Run a compiled program (see compiler.compile_commands) on a state.
+
+        The result matches compiler.execute on a ToyRobot, without any logging: invalid
+        commands, PLACE on an obstacle and commands given before the first PLACE are
+        skipped.
+
+        Parameters:
+        - program (Program): Program compiled for a board of the same dimensions.
+        - state (int): The starting state. Default is None, a robot that is not placed.
+
+        Returns:
+        - tuple: (outputs, state) with the outputs of the REPORT commands.
+        """
+        if (self.board_width, self.board_height) != (program.board_width, program.board_height):
+            raise ValueError('Program was compiled for a %dx%d board, transition table is %dx%d.' % (
+                program.board_width, program.board_height, self.board_width, self.board_height))
+        if state is None:
+            state = self.unplaced
+        move, left, right, unplaced = self.move, self.left, self.right, self.unplaced
+        blocked, width = self.blocked, self.board_width
+        max_steps = max(self.board_width, self.board_height)
+        operands = program.operands
+        outputs = []
+        k = 0
+        for opcode in program.opcodes:
+            if opcode == OP_MOVE:
+                state = move[state]
+            elif opcode == OP_LEFT:
+                state = left[state]
+            elif opcode == OP_RIGHT:
+                state = right[state]
+            elif opcode == OP_PLACE:
+                x, y = operands[k], operands[k + 1]
+                # A place error, as for ToyRobot.place, if the program ignored the obstacles
+                if blocked is None or not blocked[y * width + x]:
+                    state = self.encode(x, y, operands[k + 2])
+                k += 3
+            elif opcode == OP_REPORT:
+                if state != unplaced:
+                    x, y, facing_index, _ = self.decode(state)
+                    outputs.append(f"Output: {x},{y},{FACINGS[facing_index]}")
+            elif opcode == OP_MOVE_N:
+                # Step until the robot stops: at most the board size, and no repeat() tables
+                for _ in range(min(operands[k], max_steps)):
+                    next_state = move[state]
+                    if next_state == state:
+                        break
+                    state = next_state
+                k += 1
+            elif opcode == OP_TURN:
+                for _ in range(operands[k] & 3):
+                    state = right[state]
+                k += 1
+            else:
+                k += 1
+        return outputs, state
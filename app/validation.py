@@ -1,16 +1,73 @@
+import threading
+from types import MappingProxyType
+
+def parse_count(text):
+    """
+    Parse the count argument of a command such as 'MOVE 3' or 'UNDO 2'.
+
+    Only ASCII digits are accepted: str.isdigit() is also true for digits such as '²',
+    which int() rejects.
+
+    Parameters:
+    - text (str): The argument text.
+
+    Returns:
+    - int: The count, or None if the text is not a positive integer int() can read.
+    """
+    if text.isascii() and text.isdigit():
+        try:
+            count = int(text)
+        except ValueError:  # longer than sys.get_int_max_str_digits()
+            return None
+        if count > 0:
+            return count
+
 class TableValidator:
-    
-    def __init__(self, board_width=5, board_height=5):
+
+    # Validators shared by every robot on a board of the same dimensions.
+    _shared = {}
+
+    # Commands recognized by validate_command.
+    VALID_COMMANDS = frozenset(['MOVE', 'LEFT', 'RIGHT', 'REPORT', 'PLACE'])
+
+    @classmethod
+    def for_board(cls, board_width=5, board_height=5):
+        """
+        Return the validator shared by all robots on a board of the given dimensions.
+
+        Parameters:
+        - board_width (int): The width of the board. Default is 5.
+        - board_height (int): The height of the board. Default is 5.
+
+        Returns:
+        - TableValidator: The shared validator instance.
+        """
+        validator = cls._shared.get((board_width, board_height))
+        if validator is None:
+            validator = cls._shared[(board_width, board_height)] = cls(board_width, board_height)
+        return validator
+
+    def __init__(self, board_width=5, board_height=5, cache_size=1024, obstacles=None):
         """
         Initialize the TableValidator with the board dimensions and valid facing directions.
 
         Parameters:
         - board_width (int): The width of the board. Default is 5.
         - board_height (int): The height of the board. Default is 5.
+        - cache_size (int): Number of PLACE results kept in the LRU cache. Default is 1024, 0 disables it.
+        - obstacles (ObstacleMap): Obstacles of the board, PLACE on a blocked cell is rejected. Default is None.
         """
         self.board_width = board_width
         self.board_height = board_height
-        self.valid_directions = ['NORTH', 'SOUTH', 'EAST', 'WEST']
+        self.valid_directions = ['NORTH', 'SOUTH', 'EAST', 'WEST', 'NE', 'SE', 'SW', 'NW']
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Plain dicts keep insertion order: the first key is the least recently used one
+        self._cache = {}
+        # Guards the cache updates: the validator is shared by the robots of every thread
+        self._cache_lock = threading.Lock()
+        self.obstacles = obstacles
 
     def _is_integer(self, value):
         """
@@ -62,6 +119,9 @@ class TableValidator:
         """
         Validates the PLACE command parameters.
 
+        The results, valid or not, are kept in a bounded LRU cache keyed by the command, so
+        a repeated command is validated once. The returned mapping is read-only.
+
         Parameters:
         - command (str): PLACE command in the form 'PLACE X,Y,F'.
 
@@ -73,6 +133,29 @@ class TableValidator:
             - facing (str): Robot's facing direction (if valid).
             - message (str): Describes the result of the validation.
         """
+        cache = self._cache
+        result = cache.get(command)
+        if result is not None:
+            with self._cache_lock:
+                # Another thread may have evicted the entry since the lookup
+                if cache.pop(command, None) is not None:
+                    cache[command] = result
+                self.cache_hits += 1
+            return result
+
+        result = MappingProxyType(self._validate_place(command))
+        with self._cache_lock:
+            self.cache_misses += 1
+            if self.cache_size:
+                cache[command] = result
+                if len(cache) > self.cache_size:
+                    del cache[next(iter(cache))]
+        return result
+
+    def _validate_place(self, command):
+        """
+        Validates the PLACE command parameters without the cache (see validate_place).
+        """
         params = self._parse_command(command)
         if not params:
             return {'is_valid': False, 'message': 'Invalid command format. Expected "PLACE X,Y,F".'}
@@ -98,11 +181,14 @@ class TableValidator:
         if not self._is_within_bounds(x, y):
             return {'is_valid': False, 'message': f'x or y value out of bounds. Expected x: 0 to {self.board_width - 1}, y: 0 to {self.board_height - 1}.'}
 
+        if self.obstacles is not None and self.obstacles.is_blocked(int(x), int(y)):
+            return {'is_valid': False, 'message': f'Cell ({int(x)}, {int(y)}) is blocked by an obstacle.'}
+
         # Validate facing direction
         if facing not in self.valid_directions:
             return {
                 'is_valid': False,
-                'message': 'Invalid facing direction. Allowed values: NORTH, EAST, SOUTH, WEST.'
+                'message': 'Invalid facing direction. Allowed values: NORTH, EAST, SOUTH, WEST, NE, SE, SW, NW.'
             }
 
         # Return the validated result
@@ -114,6 +200,15 @@ class TableValidator:
             'message': 'Place command validated successfully.'
         }
 
+    def cache_info(self):
+        """
+        Return the statistics of the PLACE validation cache.
+
+        Returns:
+        - info (dict): hits, misses, size and max_size of the cache.
+        """
+        return {'hits': self.cache_hits, 'misses': self.cache_misses, 'size': len(self._cache), 'max_size': self.cache_size}
+
     def validate_command(self, command):
         """
         Validate if a command is recognized.
@@ -124,7 +219,7 @@ class TableValidator:
         Returns:
         - bool: True if the command is valid, False otherwise.
         """
-        return command in ['MOVE', 'LEFT', 'RIGHT', 'REPORT'] + ['PLACE']
+        return command in self.VALID_COMMANDS
 
     def validate_placement(self, robot):
         """
@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import threading
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from board import ConcurrentBoard
+
+def _commands(seed, count, robot_ids, board_size):
+    """
+    Build the commands of one worker, driving its own robots.
+    """
+    rng = random.Random(seed)
+    commands = [f'ROBOT {robot_id} PLACE {rng.randrange(board_size)},{rng.randrange(board_size)},NORTH' for robot_id in robot_ids]
+    for _ in range(count):
+        robot_id = rng.choice(robot_ids)
+        commands.append(f"ROBOT {robot_id} {rng.choice(['MOVE', 'MOVE', 'LEFT', 'RIGHT', 'REPORT'])}")
+    return commands
+
+def run(threads, count, stripes, board_size, robots_per_thread=4, seed=0):
+    """
+    Run `threads` workers on one board and return the commands/sec.
+
+    Parameters:
+    - threads (int): Number of worker threads.
+    - count (int): Number of commands per worker.
+    - stripes (int): Number of cell locks of the board, 1 for a single lock.
+    - board_size (int): Width and height of the board.
+
+    Returns:
+    - float: Commands executed per second, all workers together.
+    """
+    board = ConcurrentBoard(board_size, board_size, quiet=True, stripes=stripes)
+    workloads = [_commands(seed + worker, count, list(range(worker * robots_per_thread, (worker + 1) * robots_per_thread)), board_size)
+                 for worker in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(commands):
+        execute = board.execute
+        barrier.wait()
+        for command in commands:
+            execute(command)
+
+    workers = [threading.Thread(target=worker, args=(commands,)) for commands in workloads]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return sum(len(commands) for commands in workloads) / elapsed
+
+def main(argv=None):
+    """
+    Measure the throughput of a ConcurrentBoard driven from 1, 2, 4 ... threads.
+
+    Threads only run in parallel on a free-threaded build of Python (3.13t and later);
+    with the GIL the results show the locking overhead instead of a speedup.
+    """
+    parser = argparse.ArgumentParser(description='Concurrent board benchmark.')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8], help='Numbers of worker threads.')
+    parser.add_argument('--count', type=int, default=100000, help='Number of commands per worker.')
+    parser.add_argument('--stripes', type=int, nargs='+', default=[1, 64], help='Numbers of cell locks.')
+    parser.add_argument('--board-size', type=int, default=64, help='Width and height of the board.')
+    args = parser.parse_args(argv)
+
+    gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled else 'disabled'}")
+    print(f"{'threads':>8} {'stripes':>8} {'commands/sec':>14} {'speedup':>8}")
+    logging.disable(logging.CRITICAL)
+    try:
+        run(1, 1000, 1, args.board_size)  # warm-up
+        for stripes in args.stripes:
+            single = None
+            for threads in args.threads:
+                rate = run(threads, args.count, stripes, args.board_size)
+                single = single or rate
+                print(f"{threads:>8} {stripes:>8} {rate:>14,.0f} {rate / single:>7.2f}x")
+    finally:
+        logging.disable(logging.NOTSET)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+import random
+import logging
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from toy_robot import ToyRobot
+from main import parse_command
+
+def _workload(count, seed=0):
+    """
+    Build a seeded list of commands starting with a PLACE.
+    """
+    rng = random.Random(seed)
+    choices = ['MOVE', 'MOVE', 'LEFT', 'RIGHT', 'PLACE 2,2,NORTH', 'REPORT']
+    return ['PLACE 0,0,NORTH'] + [rng.choice(choices) for _ in range(count - 1)]
+
+def _run(commands, quiet):
+    """
+    Run the commands on a new robot and return the commands per second.
+    """
+    robot = ToyRobot(quiet=quiet)
+    start = time.perf_counter()
+    for command in commands:
+        parse_command(robot, command)
+    return len(commands) / (time.perf_counter() - start)
+
+def main(count=200000):
+    """
+    Compare the command throughput with the per-command logs on and in quiet mode.
+
+    The log records are written to os.devnull so that the terminal does not skew the result.
+    """
+    with open(os.devnull, 'w') as devnull:
+        logging.basicConfig(stream=devnull, level=logging.INFO, format='%(levelname)s: %(message)s')
+        commands = _workload(count)
+        logged = _run(commands, quiet=False)
+        quiet = _run(commands, quiet=True)
+    print(f"logging on : {logged:12,.0f} commands/sec")
+    print(f"quiet mode : {quiet:12,.0f} commands/sec ({quiet / logged:.1f}x)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../app/main.py')
+
+COMMANDS = 'PLACE 0,0,NORTH\nMOVE\nLEFT\nREPORT\n'
+
+def _time_runs(args, runs, stdin_path=None):
+    """
+    Run a command `runs` times and return the wall-clock durations in milliseconds.
+    """
+    durations = []
+    for _ in range(runs):
+        with open(stdin_path or os.devnull, 'rb') as stdin:
+            start = time.perf_counter()
+            subprocess.run(args, stdin=stdin, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+def _import_times(args, top):
+    """
+    Run a command once with -X importtime and return the slowest imports by cumulative time.
+    """
+    result = subprocess.run([args[0], '-X', 'importtime'] + args[1:], stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+def main(argv=None):
+    """
+    Measure the cold start of a short batch run of app/main.py against a target.
+
+    The first run is discarded, so that the bytecode cache is written when Python is
+    allowed to write it (not with -B or PYTHONDONTWRITEBYTECODE).
+    """
+    parser = argparse.ArgumentParser(description='Toy robot startup benchmark.')
+    parser.add_argument('--runs', type=int, default=30, help='Number of timed runs of each case.')
+    parser.add_argument('--target-ms', type=float, default=30.0, help='Exit with 1 if the best batch start is slower.')
+    parser.add_argument('--importtime', action='store_true', help='Also list the slowest imports (python -X importtime).')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'commands.txt')
+        with open(path, 'w') as stream:
+            stream.write(COMMANDS)
+
+        cases = [
+            ('python -c pass', [sys.executable, '-c', 'pass'], None),
+            ('main.py --file', [sys.executable, MAIN, '--file', path], None),
+            ('main.py < stdin', [sys.executable, MAIN], path),
+        ]
+        results = {}
+        print(f"{'case':<20}{'best ms':>10}{'median ms':>12}")
+        for name, command, stdin_path in cases:
+            _time_runs(command, 1, stdin_path)
+            durations = _time_runs(command, args.runs, stdin_path)
+            results[name] = min(durations)
+            print(f"{name:<20}{min(durations):>10.1f}{statistics.median(durations):>12.1f}")
+
+        if args.importtime:
+            print(f"\n{'import':<30}{'cumulative ms':>15}{'self ms':>10}")
+            for cumulative_us, self_us, name in _import_times([sys.executable, MAIN, '--file', path], 15):
+                print(f"{name:<30}{cumulative_us / 1000:>15.1f}{self_us / 1000:>10.1f}")
+
+    best = results['main.py --file']
+    print(f"\nbatch cold start: {best:.1f} ms (target {args.target_ms:.0f} ms, interpreter alone {results['python -c pass']:.1f} ms)")
+    return 1 if best > args.target_ms else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
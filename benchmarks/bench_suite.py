@@ -0,0 +1,220 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tracemalloc
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from toy_robot import ToyRobot
+from validation import TableValidator
+from main import parse_command
+from compiler import compile_commands, execute
+from transitions import TransitionTable
+import pipeline as pl
+from workloads import WORKLOADS
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+def _parse(workload):
+    """
+    Full dispatch of every command through parse_command on a quiet robot.
+    """
+    commands = workload['commands']
+    def run():
+        robot = ToyRobot(workload['board_width'], workload['board_height'], quiet=True)
+        for command in commands:
+            parse_command(robot, command)
+    return run, len(commands)
+
+def _validate_place(workload):
+    """
+    TableValidator.validate_place on the PLACE commands of the workload.
+    """
+    commands = [command for command in workload['commands'] if command.startswith('PLACE')]
+    def run():
+        validator = TableValidator(workload['board_width'], workload['board_height'])
+        for command in commands:
+            validator.validate_place(command)
+    return run, len(commands)
+
+def _robot_method(name):
+    """
+    Call one ToyRobot method repeatedly on a placed robot.
+    """
+    def case(workload):
+        count = len(workload['commands'])
+        def run():
+            robot = ToyRobot(workload['board_width'], workload['board_height'], quiet=True)
+            robot.place('PLACE 2,2,NORTH')
+            method = getattr(robot, name)
+            for _ in range(count):
+                method()
+        return run, count
+    return case
+
+def _compiled(workload):
+    """
+    compiler.execute of the compiled workload on a quiet robot.
+    """
+    program = compile_commands(workload['commands'], workload['board_width'], workload['board_height'])
+    def run():
+        execute(program, ToyRobot(workload['board_width'], workload['board_height'], quiet=True))
+    return run, len(program)
+
+def _transitions(workload):
+    """
+    TransitionTable.execute of the compiled workload, with the tables built beforehand.
+    """
+    program = compile_commands(workload['commands'], workload['board_width'], workload['board_height'])
+    table = TransitionTable(workload['board_width'], workload['board_height'])
+    def run():
+        table.execute(program)
+    return run, len(program)
+
+def _pipeline(workload):
+    """
+    The tokenize, validate and execute pipeline stages on a quiet robot.
+    """
+    commands = workload['commands']
+    def run():
+        robot = ToyRobot(workload['board_width'], workload['board_height'], quiet=True)
+        pl.drain(pl.execute(pl.validate(pl.tokenize(pl.from_iterable(commands)), robot.validator, lambda command, message: None), robot))
+    return run, len(commands)
+
+CASES = [
+    ('parse', 'place_heavy', _parse),
+    ('parse', 'move_heavy', _parse),
+    ('parse', 'invalid_heavy', _parse),
+    ('parse', 'large_board', _parse),
+    ('pipeline', 'place_heavy', _pipeline),
+    ('pipeline', 'move_heavy', _pipeline),
+    ('pipeline', 'invalid_heavy', _pipeline),
+    ('validate_place', 'place_heavy', _validate_place),
+    ('validate_place', 'invalid_heavy', _validate_place),
+    ('move', 'move_heavy', _robot_method('move')),
+    ('left', 'move_heavy', _robot_method('left')),
+    ('right', 'move_heavy', _robot_method('right')),
+    ('report', 'move_heavy', _robot_method('report')),
+    ('compiled', 'move_heavy', _compiled),
+    ('transitions', 'move_heavy', _transitions),
+]
+
+def run_suite(count=100000, repeat=3, seed=0, selected=None):
+    """
+    Run the benchmark cases and return their results.
+
+    Every case is timed `repeat` times and the best run is kept. A separate run under
+    tracemalloc measures the peak memory allocated by the case. Logging is disabled so
+    that only the command processing is measured.
+
+    Parameters:
+    - count (int): Number of commands in each workload.
+    - repeat (int): Number of timed runs of each case.
+    - seed (int): Seed of the synthetic workloads.
+    - selected (list): Only run the cases whose name contains one of these strings.
+
+    Returns:
+    - dict: Results keyed by case name, with ops_per_sec and peak_kib.
+    """
+    workloads = {name: build(count, seed) for name, build in WORKLOADS.items()}
+    results = {}
+    logging.disable(logging.CRITICAL)
+    try:
+        for target, workload_name, case in CASES:
+            name = f"{target}/{workload_name}"
+            if selected and not any(pattern in name for pattern in selected):
+                continue
+            run, operations = case(workloads[workload_name])
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run()
+                best = min(best, time.perf_counter() - start)
+            tracemalloc.start()
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results[name] = {'ops_per_sec': round(operations / best), 'peak_kib': round(peak / 1024, 1)}
+    finally:
+        logging.disable(logging.NOTSET)
+    return results
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results against a baseline.
+
+    Parameters:
+    - results (dict): Results of run_suite.
+    - baseline (dict): Stored baseline results.
+    - tolerance (float): Allowed relative slowdown, e.g. 0.25 for 25%.
+
+    Returns:
+    - tuple: (regressions, missing), the names of the cases slower than the baseline by
+      more than the tolerance and of the cases without a baseline entry.
+    """
+    regressions = []
+    missing = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            missing.append(name)
+        elif result['ops_per_sec'] < reference['ops_per_sec'] * (1 - tolerance):
+            regressions.append(name)
+    return regressions, missing
+
+def main(argv=None):
+    """
+    Run the benchmark suite, print the results and optionally save or compare a baseline.
+    """
+    parser = argparse.ArgumentParser(description='Toy robot benchmark suite.')
+    parser.add_argument('cases', nargs='*', help='Only run the cases containing one of these strings.')
+    parser.add_argument('--count', type=int, default=100000, help='Number of commands per workload.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case, the best is kept.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic workloads.')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline.')
+    parser.add_argument('--compare', action='store_true', help='Compare with the stored baseline.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown when comparing.')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Path of the baseline file.')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.count, args.repeat, args.seed, args.cases)
+    baseline = {}
+    if args.compare:
+        with open(args.baseline) as stream:
+            baseline = json.load(stream)['results']
+
+    print(f"{'case':32} {'ops/sec':>14} {'peak KiB':>10} {'vs baseline':>12}")
+    for name, result in results.items():
+        change = ''
+        if name in baseline:
+            change = f"{result['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1:+.1%}"
+        print(f"{name:32} {result['ops_per_sec']:>14,} {result['peak_kib']:>10} {change:>12}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as stream:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'count': args.count,
+                'seed': args.seed,
+                'results': results,
+            }, stream, indent=2, sort_keys=True)
+            stream.write('\n')
+
+    if args.compare:
+        regressions, missing = compare(results, baseline, args.tolerance)
+        if missing:
+            print('No baseline (run with --save-baseline): ' + ', '.join(missing))
+        if regressions:
+            print('Regressions: ' + ', '.join(regressions))
+        if regressions or missing:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+import random
+
+DIRECTIONS = ['NORTH', 'EAST', 'SOUTH', 'WEST']
+
+def _place(rng, board_width, board_height):
+    """
+    Build a valid PLACE command.
+    """
+    return f"PLACE {rng.randrange(board_width)},{rng.randrange(board_height)},{rng.choice(DIRECTIONS)}"
+
+def place_heavy(count, seed=0):
+    """
+    Mostly PLACE commands drawn from a small set of positions, as in recorded logs.
+    """
+    rng = random.Random(seed)
+    places = [_place(rng, 5, 5) for _ in range(16)]
+    commands = [rng.choice(places) if rng.random() < 0.8 else rng.choice(['MOVE', 'LEFT', 'RIGHT', 'REPORT']) for _ in range(count - 1)]
+    return {'commands': [places[0]] + commands, 'board_width': 5, 'board_height': 5}
+
+def move_heavy(count, seed=0):
+    """
+    Mostly MOVE commands with some rotations, including long runs of MOVE.
+    """
+    rng = random.Random(seed)
+    commands = ['PLACE 0,0,NORTH']
+    while len(commands) < count:
+        if rng.random() < 0.1:
+            commands.append(rng.choice(['LEFT', 'RIGHT']))
+        else:
+            commands.extend(['MOVE'] * rng.randint(1, 20))
+    return {'commands': commands[:count], 'board_width': 5, 'board_height': 5}
+
+def invalid_heavy(count, seed=0):
+    """
+    Mostly invalid commands and invalid PLACE arguments.
+    """
+    rng = random.Random(seed)
+    invalid = ['JUMP', 'PLACE A,1,NORTH', 'PLACE 1,B,NORTH', 'PLACE 9,9,NORTH', 'PLACE 1,1,UP', 'PLACE 1,1', 'MOVE 0']
+    commands = [rng.choice(invalid) if rng.random() < 0.7 else rng.choice(['MOVE', 'LEFT', 'RIGHT', 'PLACE 2,2,EAST']) for _ in range(count)]
+    return {'commands': commands, 'board_width': 5, 'board_height': 5}
+
+def large_board(count, seed=0):
+    """
+    A mixed workload on a 100000x100000 board, with REPORT commands.
+    """
+    rng = random.Random(seed)
+    width = height = 100000
+    choices = ['MOVE'] * 6 + ['LEFT', 'RIGHT', 'REPORT']
+    commands = [_place(rng, width, height) if rng.random() < 0.05 else rng.choice(choices) for _ in range(count - 1)]
+    return {'commands': [_place(rng, width, height)] + commands, 'board_width': width, 'board_height': height}
+
+WORKLOADS = {
+    'place_heavy': place_heavy,
+    'move_heavy': move_heavy,
+    'invalid_heavy': invalid_heavy,
+    'large_board': large_board,
+}
@@ -0,0 +1,171 @@
+import os
+import sys
+import random
+import threading
+import unittest
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from board import Board, ConcurrentBoard
+
+class TestBoard(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a Board instance before each test.
+        """
+        self.board = Board(quiet=True)
+
+    def test_robot_commands(self):
+        """
+        Test addressing robots by id and with SWITCH.
+        """
+        self.board.execute('ROBOT 17 PLACE 0,0,NORTH')
+        self.board.execute('ROBOT 17 MOVE')
+        self.board.execute('PLACE 3,3,EAST')
+        self.board.execute('SWITCH 17')
+        self.board.execute('RIGHT')
+
+        self.assertEqual(self.board.execute('REPORT'), 'Output: 0,1,EAST')
+        self.assertEqual(self.board.execute('ROBOT 1 REPORT'), 'Output: 3,3,EAST')
+        self.assertEqual(self.board.robot_at(0, 1), 17)
+        self.assertIsNone(self.board.robot_at(0, 0))
+
+    def test_move_blocked(self):
+        """
+        Test that a robot does not move into a cell occupied by another robot.
+        """
+        self.board.execute('ROBOT 1 PLACE 1,1,NORTH')
+        self.board.execute('ROBOT 2 PLACE 1,2,SOUTH')
+        with self.assertLogs('Board', level='WARNING'):
+            self.board.execute('ROBOT 1 MOVE')
+
+        self.assertEqual(self.board.execute('ROBOT 1 REPORT'), 'Output: 1,1,NORTH')
+
+    def test_move_steps(self):
+        """
+        Test that MOVE N stops in front of another robot, and at the edge.
+        """
+        self.board.execute('ROBOT 1 PLACE 0,0,NE')
+        self.board.execute('ROBOT 2 PLACE 3,3,SOUTH')
+        with self.assertLogs('Board', level='WARNING'):
+            self.board.execute('ROBOT 1 MOVE 4')
+        self.assertEqual(self.board.execute('ROBOT 1 REPORT'), 'Output: 2,2,NE')
+        self.board.execute('ROBOT 2 MOVE 9')
+        self.assertEqual(self.board.execute('ROBOT 2 REPORT'), 'Output: 3,0,SOUTH')
+        self.assertEqual(self.board.occupied, {12: 1, 3: 2})
+        with self.assertLogs('Board', level='ERROR'):
+            self.assertFalse(self.board.execute('ROBOT 2 MOVE 0'))
+
+    def test_place_occupied(self):
+        """
+        Test that a robot cannot be placed on an occupied cell, and that re-placing frees its old cell.
+        """
+        self.board.execute('ROBOT 1 PLACE 2,2,NORTH')
+        self.board.execute('ROBOT 2 PLACE 2,2,NORTH')
+        self.assertFalse(self.board.robot(2).is_placed)
+        self.assertEqual(self.board.robot(2).message, 'Cell (2, 2) is occupied by robot 1.')
+
+        self.board.execute('ROBOT 1 PLACE 0,0,NORTH')
+        self.board.execute('ROBOT 2 PLACE 2,2,NORTH')
+        self.assertEqual(self.board.occupied, {0: 1, 12: 2})
+
+    def test_invalid_command(self):
+        """
+        Test invalid board commands.
+        """
+        with self.assertLogs('Board', level='ERROR'):
+            self.assertFalse(self.board.execute('ROBOT X MOVE'))
+            self.assertFalse(self.board.execute('SWITCH 2 MOVE'))
+            self.assertFalse(self.board.execute('ROBOT 2 JUMP'))
+            self.assertFalse(self.board.execute('ROBOT '))
+            self.assertFalse(self.board.execute('SWITCH '))
+            self.assertFalse(self.board.execute('ROBOT ² MOVE'))
+            self.assertFalse(self.board.execute('SWITCH ' + '1' * 5000))
+
+class TestConcurrentBoard(unittest.TestCase):
+
+    def test_commands(self):
+        """
+        Test that the concurrent board runs the board commands.
+        """
+        board = ConcurrentBoard(quiet=True, stripes=4)
+        board.execute('ROBOT 1 PLACE 1,1,NORTH')
+        board.execute('ROBOT 2 PLACE 1,2,SOUTH')
+        with self.assertLogs('ConcurrentBoard', level='WARNING'):
+            board.execute('ROBOT 1 MOVE')
+        board.execute('ROBOT 2 LEFT')
+        board.execute('ROBOT 2 MOVE')
+        self.assertEqual(board.execute('ROBOT 2 REPORT'), 'Output: 2,2,EAST')
+        self.assertEqual(board.occupied, {6: 1, 12: 2})
+
+    def test_stress(self):
+        """
+        Test that threads driving the same robots on a small board never put two robots on one cell.
+        """
+        board = ConcurrentBoard(4, 4, quiet=True, stripes=3)
+        errors = []
+
+        def worker(seed):
+            rng = random.Random(seed)
+            try:
+                for _ in range(3000):
+                    robot_id = rng.randrange(10)
+                    command = rng.choice(['MOVE', 'MOVE', 'LEFT', 'RIGHT', 'REPORT',
+                                          f'PLACE {rng.randrange(4)},{rng.randrange(4)},{rng.choice(["NORTH", "EAST", "NE", "SW"])}'])
+                    board.execute(f'ROBOT {robot_id} {command}')
+            except Exception as error:
+                errors.append(error)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with self.assertLogs(level='WARNING'):
+                threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertEqual(errors, [])
+        placed = {robot_id: robot.y * 4 + robot.x for robot_id, robot in board.robots.items() if robot.is_placed}
+        self.assertEqual(len(set(placed.values())), len(placed))
+        self.assertEqual(board.occupied, {cell: robot_id for robot_id, cell in placed.items()})
+
+    def test_stress_place_cache(self):
+        """
+        Test that threads placing robots with more distinct PLACE commands than the shared validator caches do not fail.
+        """
+        board = ConcurrentBoard(64, 64, quiet=True)
+        validator = board.robot(0).validator
+        errors = []
+
+        def worker(seed):
+            rng = random.Random(seed)
+            try:
+                for _ in range(3000):
+                    board.execute(f'ROBOT {rng.randrange(seed * 8, seed * 8 + 8)} PLACE {rng.randrange(64)},{rng.randrange(64)},NORTH')
+            except Exception as error:
+                errors.append(error)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertEqual(errors, [])
+        info = validator.cache_info()
+        self.assertEqual(info['size'], info['max_size'])
+        self.assertGreater(info['misses'], info['max_size'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import sys
+import random
+import unittest
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from toy_robot import ToyRobot
+from obstacles import ObstacleMap
+from main import parse_command
+from compiler import compile_commands, execute, fold_runs, OP_PLACE, OP_MOVE, OP_LEFT, OP_REPORT, OP_PLACE_ERROR, OP_INVALID, OP_MOVE_N, OP_TURN
+
+class TestCompiler(unittest.TestCase):
+
+    def test_compile_opcodes(self):
+        """
+        Test that commands are compiled into opcodes and packed PLACE operands.
+        """
+        program = compile_commands(['PLACE 1,2,SOUTH', 'move', '', 'PLACE 9,9,NORTH', 'JUMP', 'MOVE ²'])
+
+        self.assertEqual(list(program.opcodes), [OP_PLACE, OP_MOVE, OP_PLACE_ERROR, OP_INVALID, OP_INVALID])
+        self.assertEqual(list(program.operands), [1, 2, 2, 0, 1, 2])
+        self.assertEqual(program.messages[1:], ['Invalid command: JUMP', 'Invalid command: MOVE ²'])
+
+    def test_compile_stops_at_exit(self):
+        """
+        Test that compilation stops at the EXIT command.
+        """
+        program = compile_commands(['PLACE 0,0,NORTH', 'EXIT', 'MOVE'])
+        self.assertEqual(len(program), 1)
+
+    def test_compile_rejects_history_commands(self):
+        """
+        Test that UNDO and REDO raise instead of compiling to invalid commands.
+        """
+        for command in ['undo', 'UNDO 2', 'REDO']:
+            with self.assertRaises(ValueError):
+                compile_commands(['PLACE 0,0,NORTH', 'MOVE', command, 'REPORT'])
+        self.assertEqual(len(compile_commands(['PLACE 0,0,NORTH', 'UNDONE'])), 2)
+
+    def test_execute_scenarios(self):
+        """
+        Test running a compiled program, and running it again on a new robot.
+        """
+        program = compile_commands(['PLACE 1,2,EAST', 'MOVE', 'MOVE', 'LEFT', 'MOVE', 'REPORT'])
+
+        self.assertEqual(execute(program, ToyRobot()), ['Output: 3,3,NORTH'])
+        self.assertEqual(execute(program, ToyRobot()), ['Output: 3,3,NORTH'])
+
+    def test_execute_place_error(self):
+        """
+        Test that an invalid PLACE sets the robot message like ToyRobot.place does.
+        """
+        robot = ToyRobot()
+        execute(compile_commands(['PLACE 1,B,NORTH']), robot)
+        self.assertEqual(robot.message, 'Invalid y value. Please provide an integer.')
+        self.assertFalse(robot.is_placed)
+
+    def test_execute_board_mismatch(self):
+        """
+        Test that a program cannot run on a board of different dimensions.
+        """
+        program = compile_commands(['MOVE'], 5, 5)
+        with self.assertRaises(ValueError):
+            execute(program, ToyRobot(6, 6))
+
+    def test_obstacles(self):
+        """
+        Test that PLACE on an obstacle is a place error, and that the obstacles of the program and robot must match.
+        """
+        obstacles = ObstacleMap(5, 5, [(1, 1)])
+        program = compile_commands(['PLACE 1,1,NORTH', 'PLACE 0,1,EAST', 'MOVE 3', 'REPORT'], obstacles=obstacles)
+        robot = ToyRobot(quiet=True, obstacles=ObstacleMap(5, 5, [(1, 1)]))
+        with self.assertLogs(level='ERROR'):
+            self.assertEqual(execute(program, robot), ['Output: 0,1,EAST'])
+        self.assertEqual(robot.message, 'Cell (1, 1) is blocked by an obstacle.')
+
+        with self.assertRaises(ValueError):
+            execute(compile_commands(['PLACE 1,1,NORTH', 'REPORT']), ToyRobot(obstacles=obstacles))
+        with self.assertRaises(ValueError):
+            execute(program, ToyRobot(obstacles=ObstacleMap(5, 5, [(2, 1)])))
+        with self.assertRaises(ValueError):
+            compile_commands(['MOVE'], 6, 6, obstacles)
+
+    def test_execute_matches_parse_command(self):
+        """
+        Test that a random command stream gives the same reports as parse_command.
+        """
+        rng = random.Random(7)
+        choices = ['MOVE', 'MOVE 2', 'MOVE 9999999999', 'LEFT', 'RIGHT', 'REPORT', 'PLACE 2,3,WEST', 'PLACE 0,4,NORTH', 'PLACE 1,1,NE', 'PLACE 7,1,EAST']
+        commands = [rng.choice(choices) for _ in range(500)]
+
+        robot = ToyRobot()
+        expected = [output for output in (parse_command(robot, command) for command in commands) if output]
+        robot_compiled = ToyRobot()
+        self.assertEqual(execute(compile_commands(commands), robot_compiled), expected)
+        self.assertEqual((robot_compiled.x, robot_compiled.y, robot_compiled.facing), (robot.x, robot.y, robot.facing))
+
+    def test_fold_runs(self):
+        """
+        Test that runs of MOVE and rotations are collapsed, with MOVE_N capped at the board size, and rotations that cancel out are dropped.
+        """
+        commands = ['PLACE 0,0,NORTH'] + ['MOVE'] * 10000 + ['LEFT', 'RIGHT', 'JUMP', 'RIGHT', 'RIGHT', 'RIGHT', 'MOVE', 'LEFT', 'REPORT']
+        program = fold_runs(compile_commands(commands))
+
+        self.assertEqual(list(program.opcodes), [OP_PLACE, OP_MOVE_N, OP_INVALID, OP_TURN, OP_MOVE, OP_LEFT, OP_REPORT])
+        self.assertEqual(list(program.operands), [0, 0, 0, 5, 0, 3])
+        self.assertEqual(execute(program, ToyRobot()), ['Output: 0,4,SOUTH'])
+
+    def test_fold_runs_matches_stepping(self):
+        """
+        Test that a folded random command stream ends in the same state as the original one.
+        """
+        rng = random.Random(11)
+        choices = ['MOVE', 'LEFT', 'RIGHT', 'REPORT', 'PLACE 2,3,WEST', 'PLACE 3,0,NW', 'PLACE 1,B,NORTH']
+        commands = []
+        for _ in range(300):
+            commands.extend([rng.choice(choices)] * rng.randint(1, 12))
+        program = compile_commands(commands, 6, 4)
+
+        robot = ToyRobot(6, 4)
+        robot_folded = ToyRobot(6, 4)
+        self.assertEqual(execute(fold_runs(program), robot_folded), execute(program, robot))
+        self.assertEqual((robot_folded.x, robot_folded.y, robot_folded.facing), (robot.x, robot.y, robot.facing))
+
+if __name__ == '__main__':
+    unittest.main()
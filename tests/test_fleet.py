@@ -0,0 +1,76 @@
+import os
+import sys
+import random
+import unittest
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from toy_robot import ToyRobot
+from compiler import compile_commands, execute, fold_runs
+from fleet import RobotFleet, np
+from obstacles import ObstacleMap
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestRobotFleet(unittest.TestCase):
+
+    def test_run_matches_toy_robot(self):
+        """
+        Test that every robot of the fleet ends in the same state as a ToyRobot running the same commands.
+        """
+        rng = random.Random(3)
+        choices = ['MOVE', 'MOVE', 'MOVE 3', 'LEFT', 'RIGHT', 'REPORT', 'PLACE 1,1,SOUTH', 'PLACE 3,4,EAST', 'PLACE 2,2,NW', 'PLACE 1,3,SE', 'PLACE 5,0,NORTH', 'JUMP']
+        programs = [
+            compile_commands([rng.choice(choices) for _ in range(rng.randint(0, 60))], 4, 6)
+            for _ in range(200)
+        ]
+        programs += [fold_runs(program) for program in programs[:50]]
+
+        fleet = RobotFleet(len(programs), 4, 6)
+        outputs = fleet.run(programs)
+
+        for index, program in enumerate(programs):
+            robot = ToyRobot(4, 6)
+            self.assertEqual(outputs[index], execute(program, robot))
+            self.assertEqual(fleet.robot_state(index), (robot.x, robot.y, robot.facing, robot.is_placed))
+
+    def test_run_blocks(self):
+        """
+        Test that gathering the steps in small blocks gives the same outputs, with programs of very different lengths.
+        """
+        rng = random.Random(5)
+        choices = ['MOVE', 'MOVE 2', 'LEFT', 'RIGHT', 'REPORT', 'PLACE 0,0,NE', 'PLACE 3,1,WEST', 'PLACE 9,9,NORTH', 'FLY']
+        programs = [compile_commands([rng.choice(choices) for _ in range(length)], 5, 5) for length in (0, 1, 300, 0, 17, 64)]
+        programs.append(fold_runs(programs[2]))
+
+        expected = RobotFleet(len(programs)).run(programs)
+        for block_size in (1, 7, 64):
+            fleet = RobotFleet(len(programs))
+            self.assertEqual(fleet.run(programs, block_size), expected)
+        for index, program in enumerate(programs):
+            self.assertEqual(expected[index], execute(program, ToyRobot()))
+        self.assertEqual(RobotFleet(0).run([]), [])
+
+    def test_run_rejects_obstacles(self):
+        """
+        Test that programs compiled with obstacles are rejected instead of moving through them.
+        """
+        program = compile_commands(['PLACE 0,0,NORTH', 'MOVE 4', 'REPORT'], 5, 5, ObstacleMap(5, 5, [(0, 2)]))
+        with self.assertRaises(ValueError):
+            RobotFleet(1).run([program])
+
+    def test_step_edge_clamping(self):
+        """
+        Test that MOVE keeps the robots on the board and unplaced robots ignore commands.
+        """
+        fleet = RobotFleet(3)
+        opcodes = np.array([0, 0, 1], dtype=np.uint8)
+        fleet.step(opcodes, np.array([4, 0, 0]), np.array([4, 0, 0]), np.array([0, 3, 0]))
+        fleet.step(np.array([1, 1, 1], dtype=np.uint8))
+
+        self.assertEqual(fleet.robot_state(0), (4, 4, 'NORTH', True))
+        self.assertEqual(fleet.robot_state(1), (0, 0, 'WEST', True))
+        self.assertEqual(fleet.robot_state(2), (None, None, None, False))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from journal import StateJournal, pack_state, unpack_state
+
+class TestStateJournal(unittest.TestCase):
+
+    def test_pack_state(self):
+        """
+        Test packing and unpacking robot states.
+        """
+        self.assertEqual(unpack_state(pack_state(3, 99999, 2, True)), (3, 99999, 2, True))
+        self.assertEqual(unpack_state(pack_state(None, None, -1, False)), (None, None, -1, False))
+
+    def test_undo_redo(self):
+        """
+        Test undoing and redoing, and that recording after an undo discards the redo states.
+        """
+        journal = StateJournal(10)
+        for state in (1, 2, 3):
+            journal.record(state)
+
+        self.assertEqual(journal.undo(2), 1)
+        self.assertEqual(journal.redo(), 2)
+        self.assertEqual(journal.undo(5), 0)
+        self.assertEqual(journal.redo(5), 3)
+
+        journal.undo()
+        journal.record(7)
+        self.assertEqual(journal.redo_depth, 0)
+        self.assertEqual(journal.undo(), 2)
+
+    def test_capacity(self):
+        """
+        Test that the oldest states are dropped once the journal is full.
+        """
+        journal = StateJournal(3)
+        for state in range(1, 10):
+            journal.record(state)
+
+        self.assertEqual(journal.undo_depth, 2)
+        self.assertEqual(journal.undo(10), 7)
+        self.assertEqual(journal.redo(10), 9)
+
+    def test_record_same_state(self):
+        """
+        Test that recording the current state again is ignored.
+        """
+        journal = StateJournal(5, state=4)
+        journal.record(4)
+        self.assertEqual(journal.undo_depth, 0)
+
+    def test_export_load(self):
+        """
+        Test that a loaded journal undoes and redoes like the exported one, keeping the current state within the capacity.
+        """
+        journal = StateJournal(5)
+        for state in (3, 5, 7, 9):
+            journal.record(state)
+        journal.undo(1)
+
+        loaded = StateJournal(5)
+        loaded.load(*journal.export())
+        self.assertEqual((loaded.current, loaded.undo_depth, loaded.redo_depth), (7, 3, 1))
+        self.assertEqual(loaded.undo(3), 0)
+        self.assertEqual(loaded.redo(4), 9)
+
+        small = StateJournal(2)
+        small.load(*journal.export())
+        self.assertEqual((small.current, small.undo_depth, small.redo_depth), (7, 0, 1))
+        with self.assertRaises(ValueError):
+            small.load(*journal.export()[:1], 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,13 +1,20 @@
+import io
 import os
 import sys 
+import tempfile
 import unittest
-from unittest.mock import MagicMock
+from functools import partial
+from unittest.mock import MagicMock, patch
 
 # Ensure app folder is in the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
 
 from toy_robot import ToyRobot
-from main import parse_command 
+import main
+from main import parse_command, register_command, run_batch 
+from reader import run_file
+from compiler import compile_commands, execute
+from pipeline import pipeline, from_iterable, tokenize, validate, execute as execute_stage, write_reports
 
 class TestParseCommand(unittest.TestCase):
     
@@ -16,11 +23,11 @@ class TestParseCommand(unittest.TestCase):
         Set up a ToyRobot instance before each test.
         """
         self.robot = ToyRobot()
-        self.robot.place = MagicMock()
-        self.robot.move = MagicMock()
-        self.robot.left = MagicMock()
-        self.robot.right = MagicMock()
-        self.robot.report = MagicMock()
+        # ToyRobot uses __slots__, so the methods are replaced on the class
+        for name in ('place', 'move', 'left', 'right', 'report'):
+            patcher = patch.object(ToyRobot, name, MagicMock())
+            patcher.start()
+            self.addCleanup(patcher.stop)
 
     def test_parse_command_place(self):
         """
@@ -97,5 +104,133 @@ class TestParseCommand(unittest.TestCase):
             self.assertFalse(result)
             self.assertIn("Invalid command: JUMP", log.output[0])
 
+class TestMoveCommand(unittest.TestCase):
+
+    def test_parse_command_move_steps(self):
+        """
+        Test MOVE with a number of units and a diagonal heading.
+        """
+        robot = ToyRobot(quiet=True)
+        for command in ('PLACE 0,1,NE', 'MOVE 2', 'RIGHT', 'MOVE 9'):
+            parse_command(robot, command)
+        self.assertEqual(parse_command(robot, 'REPORT'), 'Output: 4,1,SE')
+
+    def test_parse_command_move_invalid(self):
+        """
+        Test MOVE commands with an invalid number of units.
+        """
+        robot = ToyRobot(quiet=True)
+        for command in ('MOVE X', 'MOVE 0', 'MOVE -1', 'MOVES', 'MOVE ²', 'MOVE ' + '9' * 5000):
+            with self.assertLogs(level='ERROR') as log:
+                self.assertFalse(parse_command(robot, command))
+            self.assertIn(f"Invalid command: {command}", log.output[0])
+
+class TestUndoCommand(unittest.TestCase):
+
+    def test_parse_command_undo_redo(self):
+        """
+        Test the UNDO and REDO commands with and without a count.
+        """
+        robot = ToyRobot(history=10)
+        for command in ('PLACE 0,0,NORTH', 'MOVE', 'MOVE', 'MOVE', 'UNDO 2', 'REDO', 'UNDO'):
+            parse_command(robot, command)
+        self.assertEqual(parse_command(robot, 'REPORT'), 'Output: 0,1,NORTH')
+
+    def test_parse_command_undo_invalid(self):
+        """
+        Test UNDO commands with an invalid count.
+        """
+        robot = ToyRobot(history=10)
+        for command in ('UNDO X', 'UNDO 0', 'UNDOS', 'REDO -1', 'UNDO ²', 'REDO ' + '1' * 5000):
+            with self.assertLogs(level='ERROR') as log:
+                self.assertFalse(parse_command(robot, command))
+            self.assertIn(f"Invalid command: {command}", log.output[0])
+
+class TestRegisterCommand(unittest.TestCase):
+
+    def setUp(self):
+        self.robot = ToyRobot(quiet=True, show_board=False)
+        self.addCleanup(main._resolved.clear)
+        self.addCleanup(main._argument_handlers.pop, 'TURN', None)
+        self.addCleanup(main._handlers.pop, 'TURN', None)
+
+    def test_register_command(self):
+        """
+        Test that a registered command is dispatched with its argument.
+        """
+        with self.assertLogs(level='ERROR'):
+            self.assertFalse(parse_command(self.robot, 'TURN 2'))
+
+        def turn(robot, command):
+            argument = command[5:]
+            if not argument.isdigit():
+                return False
+            robot.turn(int(argument))
+
+        register_command('TURN', turn, takes_argument=True)
+        parse_command(self.robot, 'PLACE 0,0,NORTH')
+        parse_command(self.robot, 'TURN 2')
+        self.assertEqual(parse_command(self.robot, 'REPORT'), 'Output: 0,0,SOUTH')
+        with self.assertLogs(level='ERROR') as log:
+            self.assertFalse(parse_command(self.robot, 'TURN X'))
+        self.assertIn('Invalid command: TURN X', log.output[0])
+
+    def test_arguments_rejected(self):
+        """
+        Test that commands registered without arguments only match their bare name.
+        """
+        for command in ('LEFT 2', 'REPORT NOW'):
+            with self.assertLogs(level='ERROR'):
+                self.assertFalse(parse_command(self.robot, command))
+
+    def test_place_prefix(self):
+        """
+        Test that a PLACE without a space is run the same way by parse_command, run_file, the compiler and the pipeline.
+        """
+        commands = ['PLACE1,1,EAST', 'MOVE', 'REPORT']
+
+        out = io.StringIO()
+        run_batch(io.StringIO('\n'.join(commands) + '\n'), out, self.robot)
+        self.assertEqual(out.getvalue(), 'Output: 2,1,EAST\n')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'commands.txt')
+            with open(path, 'w') as stream:
+                stream.write('\n'.join(commands) + '\n')
+            out = io.StringIO()
+            run_file(path, ToyRobot(quiet=True), out, parse_command)
+        self.assertEqual(out.getvalue(), 'Output: 2,1,EAST\n')
+
+        self.assertEqual(execute(compile_commands(commands), ToyRobot(quiet=True)), ['Output: 2,1,EAST'])
+
+        out = io.StringIO()
+        robot = ToyRobot(quiet=True)
+        write_reports(pipeline(from_iterable(commands), tokenize, validate, partial(execute_stage, robot=robot)), out)
+        self.assertEqual(out.getvalue(), 'Output: 2,1,EAST\n')
+
+class TestRunBatch(unittest.TestCase):
+
+    def test_run_batch_reports(self):
+        """
+        Test that batch mode writes every REPORT output to the output stream.
+        """
+        stream = io.StringIO("place 0,0,north\nMOVE\nREPORT\n\nLEFT\nREPORT\n")
+        out = io.StringIO()
+        count = run_batch(stream, out)
+
+        self.assertEqual(count, 5)
+        self.assertEqual(out.getvalue(), "Output: 0,1,NORTH\nOutput: 0,1,WEST\n")
+
+    def test_run_batch_stops_at_exit(self):
+        """
+        Test that batch mode stops reading commands after EXIT.
+        """
+        stream = io.StringIO("PLACE 1,2,EAST\nREPORT\nEXIT\nMOVE\nREPORT\n")
+        out = io.StringIO()
+        count = run_batch(stream, out)
+
+        self.assertEqual(count, 2)
+        self.assertEqual(out.getvalue(), "Output: 1,2,EAST\n")
+
 if __name__ == '__main__':
     unittest.main()
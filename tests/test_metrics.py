@@ -0,0 +1,96 @@
+import os
+import sys
+import unittest
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from metrics import Metrics, LATENCY_BUCKETS, COUNTED_COMMANDS
+from toy_robot import ToyRobot
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a quiet robot and metrics inspecting every command.
+        """
+        self.robot = ToyRobot(quiet=True, show_board=False)
+        self.metrics = Metrics(sample_every=1)
+        self.dispatch = self.metrics.dispatcher()
+
+    def run_commands(self, commands):
+        return [self.dispatch(self.robot, command) for command in commands]
+
+    def test_results_unchanged(self):
+        """
+        Test that the metrics dispatch returns the results of parse_command.
+        """
+        outputs = self.run_commands(['PLACE 1,2,EAST', 'MOVE', 'REPORT', 'JUMP'])
+        self.assertEqual(outputs[2], 'Output: 2,2,EAST')
+        self.assertIs(outputs[3], False)
+
+    def test_counts(self):
+        """
+        Test the command, invalid command and rejected move counts.
+        """
+        with self.assertLogs(level='ERROR'):
+            self.run_commands(['MOVE', 'PLACE 9,9,NORTH', 'PLACE A,B,C', 'PLACE 0,0,SOUTH', 'MOVE', 'LEFT', 'MOVE',
+                               'MOVE 0', 'JUMP', 'REPORT'])
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot['total_commands'], 10)
+        self.assertEqual(snapshot['commands'], {'PLACE': 1, 'MOVE': 3, 'LEFT': 1, 'REPORT': 1})
+        self.assertEqual(snapshot['invalid_commands'], 4)
+        self.assertEqual(snapshot['rejected_moves'], 1)
+
+    def test_latency_histogram(self):
+        """
+        Test that every valid sampled command lands in the cumulative histogram.
+        """
+        self.run_commands(['PLACE 0,0,NORTH'] + ['MOVE'] * 3)
+        latency = self.metrics.snapshot()['latency']['MOVE']
+        self.assertEqual(latency['count'], 3)
+        self.assertEqual(len(latency['buckets']), len(LATENCY_BUCKETS) + 1)
+        self.assertEqual(latency['buckets'][-1], 3)
+        self.assertGreater(latency['sum_seconds'], 0)
+
+    def test_sampling(self):
+        """
+        Test that the counts stay exact on a periodic mixed workload while only the latency is sampled.
+        """
+        metrics = Metrics(sample_every=8, seed=1)
+        dispatch = metrics.dispatcher()
+        for _ in range(2000):
+            for command in ['PLACE 0,0,NORTH'] + ['MOVE'] * 6 + ['REPORT']:
+                dispatch(self.robot, command)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['total_commands'], 16000)
+        self.assertEqual(snapshot['commands'], {'PLACE': 2000, 'MOVE': 12000, 'REPORT': 2000})
+        self.assertEqual(snapshot['rejected_moves'], 4000)
+        self.assertEqual(snapshot['invalid_commands'], 0)
+        counts = {name: latency['count'] for name, latency in snapshot['latency'].items()}
+        self.assertEqual(set(counts), {'PLACE', 'MOVE', 'REPORT'})
+        self.assertLess(abs(sum(counts.values()) - 2000), 300)
+
+    def test_distinct_commands_bounded(self):
+        """
+        Test that the command strings counted separately are bounded.
+        """
+        self.robot = ToyRobot(COUNTED_COMMANDS + 10, 1, quiet=True)
+        self.run_commands([f'PLACE {x},0,NORTH' for x in range(COUNTED_COMMANDS + 10)] + ['MOVE'])
+        self.assertLessEqual(len(self.metrics._entries), COUNTED_COMMANDS + 2)
+        self.assertEqual(self.metrics.snapshot()['commands'], {'PLACE': COUNTED_COMMANDS + 10, 'MOVE': 1})
+
+    def test_prometheus(self):
+        """
+        Test the Prometheus text exposition format.
+        """
+        self.run_commands(['PLACE 0,0,NORTH', 'MOVE', 'JUMP'])
+        text = self.metrics.to_prometheus()
+        self.assertIn('toy_robot_commands_total{command="MOVE"} 1\n', text)
+        self.assertIn('toy_robot_invalid_commands_total 1\n', text)
+        self.assertIn('# TYPE toy_robot_command_latency_seconds histogram\n', text)
+        self.assertIn('toy_robot_command_latency_seconds_bucket{command="PLACE",le="+Inf"} 1\n', text)
+        self.assertIn('toy_robot_command_latency_seconds_count{command="MOVE"} 1\n', text)
+
+if __name__ == '__main__':
+    unittest.main()
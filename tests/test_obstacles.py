@@ -0,0 +1,99 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from obstacles import ObstacleMap, save_obstacles, load_obstacles
+from toy_robot import ToyRobot, FACINGS, DELTA_X, DELTA_Y
+
+class TestObstacleMap(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a 6x5 board with a few obstacles.
+        """
+        self.obstacles = ObstacleMap(6, 5, [(3, 1), (1, 3), (4, 4)])
+        self.robot = ToyRobot(6, 5, quiet=True, obstacles=self.obstacles)
+
+    def test_move_stops_before_obstacle(self):
+        """
+        Test that MOVE and MOVE N stop in front of the first obstacle.
+        """
+        self.robot.place('PLACE 0,1,EAST')
+        self.robot.move(10)
+        self.assertEqual((self.robot.x, self.robot.y), (2, 1))
+        self.robot.move()
+        self.assertEqual((self.robot.x, self.robot.y), (2, 1))
+
+        self.robot.place('PLACE 1,0,NORTH')
+        self.robot.move(4)
+        self.assertEqual((self.robot.x, self.robot.y), (1, 2))
+
+        self.robot.place('PLACE 2,2,NE')
+        self.robot.move(3)
+        self.assertEqual((self.robot.x, self.robot.y), (3, 3))
+
+    def test_matches_cell_by_cell_scan(self):
+        """
+        Test the precomputed tables against walking the board cell by cell.
+        """
+        width, height = 6, 5
+        for index in range(len(FACINGS)):
+            for y in range(height):
+                for x in range(width):
+                    if self.obstacles.is_blocked(x, y):
+                        continue
+                    robot = ToyRobot(width, height, quiet=True, obstacles=self.obstacles)
+                    robot.place_at(x, y, index)
+                    robot.move(width + height)
+
+                    expected_x, expected_y = x, y
+                    while (0 <= expected_x + DELTA_X[index] < width and 0 <= expected_y + DELTA_Y[index] < height
+                           and not self.obstacles.is_blocked(expected_x + DELTA_X[index], expected_y + DELTA_Y[index])):
+                        expected_x += DELTA_X[index]
+                        expected_y += DELTA_Y[index]
+                    self.assertEqual((robot.x, robot.y), (expected_x, expected_y))
+
+    def test_place_on_obstacle(self):
+        """
+        Test that PLACE on a blocked cell is rejected.
+        """
+        self.robot.place('PLACE 3,1,NORTH')
+        self.assertFalse(self.robot.is_placed)
+        self.assertEqual(self.robot.message, 'Cell (3, 1) is blocked by an obstacle.')
+
+    def test_render_board(self):
+        """
+        Test that the obstacles are drawn on the board.
+        """
+        self.robot.place('PLACE 0,1,NORTH')
+        rows = list(self.robot.render_board())
+        self.assertEqual(rows[0], '[ ] [ ] [ ] [ ] [#] [ ]')
+        self.assertEqual(rows[3], '[^] [ ] [ ] [#] [ ] [ ]')
+
+    def test_save_and_load(self):
+        """
+        Test that an obstacle map survives a save and load.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'board.obstacles')
+            save_obstacles(path, self.obstacles)
+            loaded = load_obstacles(path)
+        self.assertEqual((loaded.board_width, loaded.board_height), (6, 5))
+        self.assertEqual(list(loaded.cells()), [(3, 1), (1, 3), (4, 4)])
+        self.assertEqual(loaded.rooms, self.obstacles.rooms)
+
+    def test_invalid_obstacles(self):
+        """
+        Test that obstacles outside the board and mismatched boards are rejected.
+        """
+        with self.assertRaises(ValueError):
+            ObstacleMap(3, 3, [(3, 0)])
+        with self.assertRaises(ValueError):
+            ToyRobot(5, 5, obstacles=self.obstacles)
+
+if __name__ == '__main__':
+    unittest.main()
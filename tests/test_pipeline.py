@@ -0,0 +1,101 @@
+import io
+import os
+import sys
+import random
+import tempfile
+import unittest
+from functools import partial
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from toy_robot import ToyRobot
+from main import run_batch
+from obstacles import ObstacleMap
+from pipeline import (pipeline, from_iterable, from_stream, from_file, tokenize, validate, execute,
+                      filter_items, map_items, tap, write_reports, collect_states, count_commands, drain)
+
+class TestPipeline(unittest.TestCase):
+
+    def _commands(self, seed, count):
+        rng = random.Random(seed)
+        choices = ['MOVE', 'MOVE 2', 'LEFT', 'RIGHT', 'REPORT', 'PLACE 1,2,EAST', 'PLACE 4,0,NW',
+                   'PLACE 9,9,NORTH', 'MOVE 0', 'LEFT 2', 'JUMP', 'UNDO', 'REDO 2', '', ' report ']
+        return [rng.choice(choices) for _ in range(count)]
+
+    def test_matches_run_batch(self):
+        """
+        Test that the pipeline writes the same reports and leaves the robot in the same state as run_batch.
+        """
+        commands = self._commands(3, 2000)
+        expected_out = io.StringIO()
+        expected = ToyRobot(quiet=True, history=10)
+        with self.assertLogs(level='ERROR'):
+            run_batch(io.StringIO('\n'.join(commands) + '\n'), expected_out, expected)
+
+        for batch_size in (1, 7, 1024):
+            robot = ToyRobot(quiet=True, history=10)
+            out = io.StringIO()
+            with self.assertLogs(level='ERROR'):
+                batches = pipeline(from_iterable(commands, batch_size), tokenize,
+                                   partial(validate, validator=robot.validator), partial(execute, robot=robot))
+                write_reports(batches, out)
+            self.assertEqual(out.getvalue(), expected_out.getvalue())
+            self.assertEqual(robot.state, expected.state)
+
+    def test_sources_and_exit(self):
+        """
+        Test the stream and file sources, which stop at EXIT.
+        """
+        text = 'PLACE 0,0,NORTH\nMOVE 3\n\nREPORT\nEXIT\nREPORT\n'
+        robot = ToyRobot(quiet=True)
+        out = io.StringIO()
+        self.assertEqual(write_reports(pipeline(from_stream(io.BytesIO(text.encode())), tokenize, validate,
+                                                partial(execute, robot=robot)), out), 3)
+        self.assertEqual(out.getvalue(), 'Output: 0,3,NORTH\n')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'commands.txt')
+            with open(path, 'w') as stream:
+                stream.write(text)
+            robot = ToyRobot(quiet=True)
+            states = collect_states(pipeline(from_file(path, 2), tokenize, validate, partial(execute, robot=robot, states=True)))
+        self.assertEqual(len(states), 3)
+        self.assertEqual(states[-1], robot.state)
+
+    def test_validate(self):
+        """
+        Test that invalid commands are reported to on_invalid and dropped, using the board obstacles.
+        """
+        obstacles = ObstacleMap(5, 5, [(1, 1)])
+        invalid = []
+        batches = pipeline(from_iterable(['PLACE 1,1,NORTH', 'PLACE 0,1,EAST', 'MOVE 0', 'MOVE 12', 'REPORT 1', 'FLY', 'UNDO ²']), tokenize,
+                           partial(validate, validator=obstacles.validator, on_invalid=lambda *args: invalid.append(args)))
+        self.assertEqual(list(batches), [[('PLACE 0,1,EAST', 'PLACE', (0, 1, 'EAST')), ('MOVE 12', 'MOVE', 12)]])
+        self.assertEqual(invalid, [
+            ('PLACE 1,1,NORTH', 'Cell (1, 1) is blocked by an obstacle.'),
+            ('MOVE 0', 'Invalid command: MOVE 0'),
+            ('REPORT 1', 'Invalid command: REPORT 1'),
+            ('FLY', 'Invalid command: FLY'),
+            ('UNDO ²', 'Invalid command: UNDO ²'),
+        ])
+
+    def test_custom_stages(self):
+        """
+        Test filter, map and tap stages inserted in the chain.
+        """
+        robot = ToyRobot(quiet=True)
+        seen = []
+        batches = pipeline(
+            from_iterable(['place 2,2,north', '# comment', 'move', 'report', 'left', 'report'], 2),
+            filter_items(lambda line: not line.startswith('#')),
+            map_items(lambda line: line.replace('LEFT', 'RIGHT').replace('left', 'right')),
+            tokenize, validate, partial(execute, robot=robot),
+            tap(seen.append))
+        self.assertEqual(count_commands(batches), {'PLACE': 1, 'MOVE': 1, 'REPORT': 2, 'RIGHT': 1})
+        self.assertEqual([output for batch in seen for _, _, output, _ in batch if output],
+                         ['Output: 2,3,NORTH', 'Output: 2,3,EAST'])
+        self.assertEqual(drain(from_iterable(range(10), 3)), 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import random
+import unittest
+from collections import deque
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from planner import Planner
+from obstacles import ObstacleMap
+from toy_robot import ToyRobot, FACINGS
+
+def _simulate(robot, start, commands):
+    robot.place_at(*start)
+    for command in commands:
+        getattr(robot, command.lower())()
+    return (robot.x, robot.y, robot.facing)
+
+def _brute_force_distance(width, height, obstacles, start, goal):
+    """
+    Breadth-first search by simulating a ToyRobot for every command.
+    """
+    robot = ToyRobot(width, height, quiet=True, obstacles=obstacles)
+    seen = {start: 0}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        if state == goal:
+            return seen[state]
+        for command in ('MOVE', 'LEFT', 'RIGHT'):
+            following = _simulate(robot, state, [command])
+            if following not in seen:
+                seen[following] = seen[state] + 1
+                queue.append(following)
+    return None
+
+class TestPlanner(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a 7x5 board with a wall that leaves a gap.
+        """
+        self.obstacles = ObstacleMap(7, 5, [(3, 0), (3, 1), (3, 2), (3, 3), (1, 1)])
+        self.planner = Planner(7, 5, self.obstacles)
+
+    def test_plan_matches_brute_force(self):
+        """
+        Test that the plans are as short as a search simulating ToyRobot, and reach the goal.
+        """
+        rng = random.Random(2)
+        free = [(x, y) for y in range(5) for x in range(7) if not self.obstacles.is_blocked(x, y)]
+        robot = ToyRobot(7, 5, quiet=True, obstacles=self.obstacles)
+        for _ in range(40):
+            start = rng.choice(free) + (rng.choice(FACINGS[:4]),)
+            goal = rng.choice(free) + (rng.choice(FACINGS[:4]),)
+            commands = self.planner.plan(start, goal)
+            self.assertEqual(len(commands), _brute_force_distance(7, 5, self.obstacles, start, goal))
+            self.assertEqual(self.planner.distance(start, goal), len(commands))
+            self.assertEqual(_simulate(robot, start, commands), goal)
+
+    def test_plan_diagonal(self):
+        """
+        Test planning between diagonal headings.
+        """
+        planner = Planner(4, 4)
+        commands = planner.plan((0, 0, 'NE'), (3, 3, 'SW'))
+        self.assertEqual(len(commands), 5)
+        self.assertEqual(_simulate(ToyRobot(4, 4, quiet=True), (0, 0, 'NE'), commands), (3, 3, 'SW'))
+        self.assertIsNone(planner.plan((0, 0, 'NE'), (3, 3, 'NORTH')))
+
+    def test_unreachable(self):
+        """
+        Test goals behind obstacles and invalid states.
+        """
+        planner = Planner(3, 3, ObstacleMap(3, 3, [(1, 0), (1, 1), (1, 2)]))
+        self.assertIsNone(planner.plan((0, 0, 'NORTH'), (2, 2, 'NORTH')))
+        self.assertEqual(planner.plan((0, 0, 'NORTH'), (0, 0, 'NORTH')), [])
+        visited = planner.reachable(0, 0, 'NORTH')
+        self.assertEqual(sum(visited), 3 * 4)
+        with self.assertRaises(ValueError):
+            planner.plan((1, 1, 'NORTH'), (0, 0, 'NORTH'))
+        with self.assertRaises(ValueError):
+            planner.plan((0, 0, 'NORTH'), (5, 0, 'NORTH'))
+
+    def test_distance_tables_cached(self):
+        """
+        Test that the distance table of a goal is reused and the cache is bounded.
+        """
+        planner = Planner(5, 5, cache_size=2)
+        table = planner.distances(4, 4, 'EAST')
+        self.assertIs(planner.distances(4, 4, FACINGS.index('EAST')), table)
+        planner.distances(0, 0, 'EAST')
+        planner.distances(0, 1, 'EAST')
+        self.assertEqual(len(planner._tables), 2)
+        self.assertIsNot(planner.distances(4, 4, 'EAST'), table)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from toy_robot import ToyRobot
+from reader import iter_lines, run_file
+from main import parse_command
+
+class TestReader(unittest.TestCase):
+
+    def _write(self, content):
+        """
+        Write the content to a temporary file and return its path.
+        """
+        handle, path = tempfile.mkstemp()
+        with os.fdopen(handle, 'wb') as stream:
+            stream.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_iter_lines(self):
+        """
+        Test that the lines are stripped bytes and blank lines are skipped.
+        """
+        path = self._write(b'PLACE 0,0,NORTH\r\n\n  MOVE \nREPORT')
+        self.assertEqual(list(iter_lines(path)), [b'PLACE 0,0,NORTH', b'MOVE', b'REPORT'])
+
+    def test_iter_lines_empty_file(self):
+        """
+        Test that an empty file yields no lines.
+        """
+        self.assertEqual(list(iter_lines(self._write(b''))), [])
+
+    def test_run_file(self):
+        """
+        Test running a command file, including lower case commands and EXIT.
+        """
+        path = self._write(b'place 1,2,east\nMOVE\nmove\nLEFT\nMOVE\nREPORT\nEXIT\nMOVE\nREPORT\n')
+        out = io.StringIO()
+        count = run_file(path, ToyRobot(quiet=True), out)
+
+        self.assertEqual(count, 6)
+        self.assertEqual(out.getvalue(), 'Output: 3,3,NORTH\n')
+
+    def test_run_file_invalid_command(self):
+        """
+        Test that invalid commands are logged and skipped.
+        """
+        path = self._write(b'JUMP\nPLACE 0,0,NORTH\nREPORT\n')
+        out = io.StringIO()
+        with self.assertLogs(level='ERROR') as log:
+            run_file(path, ToyRobot(quiet=True), out)
+        self.assertIn('Invalid command: JUMP', log.output[0])
+        self.assertEqual(out.getvalue(), 'Output: 0,0,NORTH\n')
+
+    def test_run_file_dispatch(self):
+        """
+        Test that the other commands are handed to the dispatch function.
+        """
+        path = self._write(b'PLACE 0,0,NORTH\nMOVE\nMOVE\nundo\nREPORT\nEXIT\nUNDO\n')
+        out = io.StringIO()
+        count = run_file(path, ToyRobot(quiet=True, history=10), out, parse_command)
+
+        self.assertEqual(count, 5)
+        self.assertEqual(out.getvalue(), 'Output: 0,1,NORTH\n')
+
+if __name__ == '__main__':
+    unittest.main()
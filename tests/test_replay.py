@@ -0,0 +1,49 @@
+import os
+import sys
+import random
+import tempfile
+import unittest
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from replay import replay_session, replay_sessions
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Write a few seeded command files to a temporary directory.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        rng = random.Random(5)
+        choices = ['MOVE', 'LEFT', 'RIGHT', 'REPORT', 'PLACE 1,1,NORTH', 'PLACE 3,0,WEST']
+        self.paths = []
+        for index in range(12):
+            path = os.path.join(self.directory.name, f'session_{index}.txt')
+            with open(path, 'w') as stream:
+                stream.write('\n'.join(rng.choice(choices) for _ in range(200)))
+            self.paths.append(path)
+
+    def test_replay_session(self):
+        """
+        Test replaying one command file.
+        """
+        path = os.path.join(self.directory.name, 'example.txt')
+        with open(path, 'w') as stream:
+            stream.write('PLACE 1,2,EAST\nMOVE\nMOVE\nLEFT\nMOVE\nREPORT\n')
+
+        result = replay_session(path)
+        self.assertEqual(result, {'path': path, 'x': 3, 'y': 3, 'facing': 'NORTH', 'outputs': ['Output: 3,3,NORTH']})
+
+    def test_replay_sessions_order(self):
+        """
+        Test that the pooled replay returns the same results, in order, as a single process.
+        """
+        expected = replay_sessions(self.paths, processes=1)
+        self.assertEqual([result['path'] for result in expected], self.paths)
+        self.assertEqual(replay_sessions(self.paths, processes=3), expected)
+
+if __name__ == '__main__':
+    unittest.main()
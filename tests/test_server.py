@@ -0,0 +1,109 @@
+import os
+import sys
+import asyncio
+import unittest
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from server import start_server, RobotConnection, MAX_LINE_SIZE
+from loadgen import run_load
+
+class TestRobotConnection(unittest.TestCase):
+
+    def test_execute(self):
+        """
+        Test the responses of the commands and switching sessions.
+        """
+        connection = RobotConnection()
+        with self.assertLogs(level='ERROR'):
+            self.assertEqual(connection.execute('REPORT'), 'ERROR REPORT command ignored: Robot is not placed on the table.')
+            self.assertEqual(connection.execute('MOVE'), 'ERROR MOVE command ignored: Robot is not placed on the table.')
+            self.assertEqual(connection.execute('UNDO'), 'ERROR UNDO command ignored: History is not enabled.')
+        self.assertEqual(connection.execute('PLACE 1,1,NORTH'), 'OK')
+        self.assertEqual(connection.execute('PLACE 9,1,NORTH'), 'ERROR x or y value out of bounds. Expected x: 0 to 4, y: 0 to 4.')
+        self.assertEqual(connection.execute('MOVE'), 'OK')
+        self.assertEqual(connection.execute('SESSION 2'), 'OK')
+        self.assertEqual(connection.execute('PLACE 3,3,EAST'), 'OK')
+        self.assertEqual(connection.execute('SESSION 1'), 'OK')
+        self.assertEqual(connection.execute('REPORT'), 'Output: 1,2,NORTH')
+        with self.assertLogs(level='ERROR'):
+            self.assertEqual(connection.execute('JUMP'), 'ERROR Invalid command: JUMP')
+            self.assertEqual(connection.execute('MOVE ²'), 'ERROR Invalid command: MOVE ²')
+        self.assertEqual(connection.execute('SESSION ²'), 'ERROR Invalid command: SESSION ²')
+        self.assertTrue(connection.execute('SESSION ' + '1' * 5000).startswith('ERROR Invalid command: SESSION 1'))
+
+    def test_session_limit(self):
+        """
+        Test that a connection cannot create more than max_sessions sessions, but can still switch between them.
+        """
+        connection = RobotConnection(max_sessions=3)
+        self.assertEqual([connection.execute(f'SESSION {session_id}') for session_id in (2, 3, 4)],
+                         ['OK', 'OK', 'ERROR Too many sessions, the limit is 3 per connection.'])
+        self.assertEqual(len(connection.sessions), 3)
+        self.assertEqual(connection.execute('PLACE 0,0,EAST'), 'OK')
+        self.assertEqual(connection.execute('SESSION 1'), 'OK')
+        self.assertEqual(connection.execute('SESSION 3'), 'OK')
+        self.assertEqual(connection.execute('REPORT'), 'Output: 0,0,EAST')
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        """
+        Start a server on a free port.
+        """
+        self.server = await start_server(port=0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_pipelined_commands(self):
+        """
+        Test sending pipelined commands and reading one response per command.
+        """
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        writer.write(b'place 1,2,east\nMOVE\nMOVE\nLEFT\nMOVE\nREPORT\nEXIT\n')
+        await writer.drain()
+        responses = (await reader.read()).decode('ascii').splitlines()
+        writer.close()
+
+        self.assertEqual(responses, ['OK'] * 5 + ['Output: 3,3,NORTH'])
+
+    async def test_invalid_bytes(self):
+        """
+        Test that commands with non-ASCII bytes are answered with an error.
+        """
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        with self.assertLogs(level='ERROR'):
+            writer.write('MOVE ²\nSESSION ²\nREPORT\nEXIT\n'.encode('utf-8'))
+            await writer.drain()
+            responses = (await reader.read()).decode('ascii').splitlines()
+        writer.close()
+
+        self.assertEqual(responses, ['ERROR Invalid command: MOVE ??', 'ERROR Invalid command: SESSION ??',
+                                     'ERROR REPORT command ignored: Robot is not placed on the table.'])
+
+    async def test_line_too_long(self):
+        """
+        Test that a line longer than MAX_LINE_SIZE is answered with an error and closes the connection.
+        """
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        writer.write(b'PLACE 0,0,NORTH\n' + b'M' * (MAX_LINE_SIZE + 1))
+        await writer.drain()
+        responses = (await reader.read()).decode('ascii').splitlines()
+        writer.close()
+
+        self.assertEqual(responses, ['OK', f'ERROR Line too long, the limit is {MAX_LINE_SIZE} bytes.'])
+
+    async def test_load_generator(self):
+        """
+        Test the load generator against the server.
+        """
+        result = await run_load(port=self.port, connections=20, commands=50, pipeline=8)
+        self.assertEqual(result['commands'], 1000)
+        self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+
+if __name__ == '__main__':
+    unittest.main()
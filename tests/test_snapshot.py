@@ -0,0 +1,135 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from functools import partial
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from toy_robot import ToyRobot
+from reader import run_file
+from main import parse_command, run_checkpointed
+from fleet import RobotFleet, np
+from snapshot import save_robot, load_robot, save_fleet, load_fleet, load_states
+
+class Crash(Exception):
+    """
+    Raised to interrupt a replay.
+    """
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a temporary directory for the snapshot files.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'robot.snapshot')
+
+    def test_robot_round_trip(self):
+        """
+        Test saving and loading the state of a robot.
+        """
+        robot = ToyRobot(100000, 100000, quiet=True)
+        robot.place('PLACE 99999,12345,WEST')
+        save_robot(robot, self.path, position=42)
+
+        loaded, position = load_robot(self.path)
+        self.assertEqual(position, 42)
+        self.assertEqual((loaded.board_width, loaded.x, loaded.y, loaded.facing), (100000, 99999, 12345, 'WEST'))
+
+        save_robot(ToyRobot(), self.path)
+        loaded, _ = load_robot(self.path)
+        self.assertFalse(loaded.is_placed)
+
+    def test_board_mismatch(self):
+        """
+        Test that a snapshot cannot be loaded into a robot on a board of other dimensions.
+        """
+        save_robot(ToyRobot(), self.path)
+        with self.assertRaises(ValueError):
+            load_robot(self.path, ToyRobot(6, 6))
+
+    def test_invalid_file(self):
+        """
+        Test loading a file that is not a snapshot.
+        """
+        with open(self.path, 'wb') as stream:
+            stream.write(b'PLACE 0,0,NORTH\n' * 4)
+        with self.assertRaises(ValueError):
+            load_states(self.path)
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_fleet_round_trip(self):
+        """
+        Test saving and loading a fleet of robots.
+        """
+        fleet = RobotFleet(3, 7, 9)
+        fleet.step(np.array([0, 255, 0], dtype=np.uint8), np.array([6, 0, 1]), np.array([8, 0, 2]), np.array([3, 0, 1]))
+        save_fleet(fleet, self.path, position=5)
+
+        loaded, position = load_fleet(self.path)
+        self.assertEqual(position, 5)
+        self.assertEqual([loaded.robot_state(index) for index in range(3)], [fleet.robot_state(index) for index in range(3)])
+
+    def test_resume_from_checkpoint(self):
+        """
+        Test that a crashed replay resumes from its last checkpoint with the same final result.
+        """
+        commands_path = os.path.join(self.directory.name, 'commands.txt')
+        with open(commands_path, 'w') as stream:
+            stream.write('PLACE 0,0,NORTH\nMOVE\nREPORT\nRIGHT\nMOVE\nREPORT\nCRASH\nMOVE\nLEFT\nMOVE\nREPORT\n')
+        expected = io.StringIO()
+        with self.assertLogs(level='ERROR'):
+            run_file(commands_path, ToyRobot(quiet=True), expected, parse_command)
+
+        def crash(robot, command):
+            if command == 'CRASH':
+                raise Crash()
+            return parse_command(robot, command)
+
+        out = io.StringIO()
+        robot = ToyRobot(quiet=True)
+        with self.assertRaises(Crash):
+            run_file(commands_path, robot, out, crash, checkpoint=partial(save_robot, robot, self.path), checkpoint_every=4)
+        self.assertTrue(os.path.exists(self.path))
+
+        with self.assertLogs(level='ERROR'):
+            run_checkpointed(commands_path, ToyRobot(quiet=True), out, self.path, checkpoint_every=4)
+        self.assertEqual(out.getvalue(), expected.getvalue())
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_resume_with_history(self):
+        """
+        Test that a resumed replay can undo the commands run before the checkpoint.
+        """
+        commands_path = os.path.join(self.directory.name, 'commands.txt')
+        with open(commands_path, 'w') as stream:
+            stream.write('PLACE 0,0,NORTH\nMOVE\nRIGHT\nCRASH\nMOVE\nUNDO 3\nREPORT\nREDO\nREPORT\n')
+        expected = io.StringIO()
+        with self.assertLogs(level='ERROR'):
+            run_file(commands_path, ToyRobot(quiet=True, history=10), expected, parse_command)
+        self.assertEqual(expected.getvalue(), 'Output: 0,0,NORTH\nOutput: 0,1,NORTH\n')
+
+        def crash(robot, command):
+            if command == 'CRASH':
+                raise Crash()
+            return parse_command(robot, command)
+
+        out = io.StringIO()
+        robot = ToyRobot(quiet=True, history=10)
+        with self.assertRaises(Crash):
+            run_file(commands_path, robot, out, crash, checkpoint=partial(save_robot, robot, self.path), checkpoint_every=3)
+        run_checkpointed(commands_path, ToyRobot(quiet=True, history=10), out, self.path, checkpoint_every=3)
+        self.assertEqual(out.getvalue(), expected.getvalue())
+
+        # A snapshot without a journal restarts the history from the loaded state
+        save_robot(ToyRobot(quiet=True), self.path)
+        loaded, _ = load_robot(self.path, ToyRobot(quiet=True, history=10))
+        self.assertEqual(loaded.journal.undo_depth, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -56,7 +56,7 @@ class TestTableValidator(unittest.TestCase):
         result = self.validator.validate_place(command)
         
         self.assertFalse(result['is_valid'])
-        self.assertEqual(result['message'], 'Invalid facing direction. Allowed values: NORTH, EAST, SOUTH, WEST.')
+        self.assertEqual(result['message'], 'Invalid facing direction. Allowed values: NORTH, EAST, SOUTH, WEST, NE, SE, SW, NW.')
 
     def test_validate_place_invalid_format(self):
         """
@@ -111,5 +111,35 @@ class TestTableValidator(unittest.TestCase):
         robot.is_placed = False
         self.assertFalse(self.validator.validate_placement(robot))
 
+    def test_validate_place_cache(self):
+        """
+        Test that repeated PLACE commands, valid or not, are served from the cache.
+        """
+        first = self.validator.validate_place("PLACE 1,2,NORTH")
+        self.assertIs(self.validator.validate_place("PLACE 1,2,NORTH"), first)
+        invalid = self.validator.validate_place("PLACE A,2,NORTH")
+        self.assertIs(self.validator.validate_place("PLACE A,2,NORTH"), invalid)
+        self.assertFalse(invalid['is_valid'])
+
+        self.assertEqual(self.validator.cache_info(), {'hits': 2, 'misses': 2, 'size': 2, 'max_size': 1024})
+        with self.assertRaises(TypeError):
+            first['x'] = 3
+
+    def test_validate_place_cache_eviction(self):
+        """
+        Test that the least recently used result is evicted once the cache is full.
+        """
+        validator = TableValidator(5, 5, cache_size=2)
+        validator.validate_place("PLACE 0,0,NORTH")
+        validator.validate_place("PLACE 1,1,NORTH")
+        validator.validate_place("PLACE 0,0,NORTH")
+        validator.validate_place("PLACE 2,2,NORTH")
+
+        validator.validate_place("PLACE 0,0,NORTH")
+        self.assertEqual(validator.cache_hits, 2)
+        validator.validate_place("PLACE 1,1,NORTH")
+        self.assertEqual(validator.cache_misses, 4)
+        self.assertEqual(validator.cache_info()['size'], 2)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -91,7 +91,7 @@ class TestToyRobot(unittest.TestCase):
         Test the place method with an y parameter.
         """
         self.robot.place('PLACE 1,1,TEST')
-        self.assertEqual(self.robot.message, 'Invalid facing direction. Allowed values: NORTH, EAST, SOUTH, WEST.')
+        self.assertEqual(self.robot.message, 'Invalid facing direction. Allowed values: NORTH, EAST, SOUTH, WEST, NE, SE, SW, NW.')
 
 
     def test_place_invalid_range_command(self):
@@ -147,6 +147,57 @@ class TestToyRobot(unittest.TestCase):
         self.assertEqual(self.robot.x, 1)
         self.assertEqual(self.robot.y, 0)
 
+    def test_move_several_units(self):
+        """
+        Test moving several units at once stops at the edge of the board.
+        """
+        self.robot.place('PLACE 1,1,EAST')
+        self.robot.move(2)
+        self.assertEqual((self.robot.x, self.robot.y), (3, 1))
+        self.robot.move(10000)
+        self.assertEqual((self.robot.x, self.robot.y), (4, 1))
+
+    def test_move_diagonal(self):
+        """
+        Test that a diagonal move stops when either coordinate reaches the edge of the board.
+        """
+        self.robot.place('PLACE 1,2,NE')
+        self.robot.move()
+        self.assertEqual((self.robot.x, self.robot.y), (2, 3))
+        self.robot.move(5)
+        self.assertEqual((self.robot.x, self.robot.y), (3, 4))
+        self.robot.move()
+        self.assertEqual((self.robot.x, self.robot.y), (3, 4))
+
+        self.robot.place('PLACE 1,2,SW')
+        self.robot.move(5)
+        self.assertEqual((self.robot.x, self.robot.y), (0, 1))
+
+    def test_move_steps_matches_single_moves(self):
+        """
+        Test that moving n units ends where n single moves end, in every direction.
+        """
+        for facing in ('NORTH', 'EAST', 'SOUTH', 'WEST', 'NE', 'SE', 'SW', 'NW'):
+            for steps in range(7):
+                robot = ToyRobot(5, 4, quiet=True)
+                stepping = ToyRobot(5, 4, quiet=True)
+                robot.place(f'PLACE 1,2,{facing}')
+                stepping.place(f'PLACE 1,2,{facing}')
+                robot.move(steps)
+                for _ in range(steps):
+                    stepping.move()
+                self.assertEqual((robot.x, robot.y), (stepping.x, stepping.y))
+
+    def test_turn(self):
+        """
+        Test the turn method with clockwise and counterclockwise quarter turns.
+        """
+        self.robot.place('PLACE 1,1,NORTH')
+        self.robot.turn(2)
+        self.assertEqual(self.robot.facing, 'SOUTH')
+        self.robot.turn(-7)
+        self.assertEqual(self.robot.facing, 'WEST')
+
     def test_left_rotation(self):
         """
         Test the left rotation method.
@@ -155,6 +206,19 @@ class TestToyRobot(unittest.TestCase):
         self.robot.left()
         self.assertEqual(self.robot.facing, 'WEST')
 
+    def test_diagonal_rotation(self):
+        """
+        Test that rotating a diagonal heading keeps it diagonal.
+        """
+        self.robot.place('PLACE 1,1,NE')
+        self.robot.right()
+        self.assertEqual(self.robot.facing, 'SE')
+        self.robot.left()
+        self.robot.left()
+        self.assertEqual(self.robot.facing, 'NW')
+        self.robot.turn(3)
+        self.assertEqual(self.robot.facing, 'SW')
+
     def test_right_rotation(self):
         """
         Test the right rotation method.
@@ -171,6 +235,84 @@ class TestToyRobot(unittest.TestCase):
         output = self.robot.report()
         self.assertEqual(output, 'Output: 1,1,NORTH')
 
+    def test_quiet_mode(self):
+        """
+        Test that a quiet robot skips the per-command logs but still reports errors.
+        """
+        robot = ToyRobot(quiet=True)
+        with self.assertNoLogs('ToyRobot', level='INFO'):
+            robot.place('PLACE 4,4,NORTH')
+            robot.move()
+            robot.left()
+            robot.right()
+            self.assertEqual(robot.report(), 'Output: 4,4,NORTH')
+        with self.assertLogs('ToyRobot', level='ERROR'):
+            robot.place('PLACE 9,9,NORTH')
+
+    def test_compact_state(self):
+        """
+        Test that robots have no instance dict, store the facing as an index and share their validator.
+        """
+        other = ToyRobot()
+        self.assertFalse(hasattr(self.robot, '__dict__'))
+        self.assertIs(self.robot.validator, other.validator)
+
+        self.robot.place('PLACE 1,1,WEST')
+        self.assertEqual(self.robot.facing_index, 3)
+        self.robot.right()
+        self.assertEqual(self.robot.facing_index, 0)
+        self.assertEqual(self.robot.facing, 'NORTH')
+
+    def test_render_board(self):
+        """
+        Test rendering the whole board and a window around the robot.
+        """
+        self.robot.place('PLACE 1,3,EAST')
+        rows = list(self.robot.render_board())
+        self.assertEqual(rows[1], '[ ] [>] [ ] [ ] [ ]')
+        self.assertEqual(rows[0], '[ ] [ ] [ ] [ ] [ ]')
+        self.assertEqual(len(rows), 5)
+
+        self.assertEqual(list(self.robot.render_board(radius=1)), ['[ ] [ ] [ ]', '[ ] [>] [ ]', '[ ] [ ] [ ]'])
+
+    def test_report_large_board(self):
+        """
+        Test that REPORT on a very large board only prints the cells around the robot.
+        """
+        robot = ToyRobot(100000, 100000)
+        robot.place('PLACE 50000,99999,NORTH')
+        with self.assertLogs('ToyRobot', level='INFO') as log:
+            self.assertEqual(robot.report(), 'Output: 50000,99999,NORTH')
+        self.assertEqual(len(log.output), 13)
+        self.assertIn('[ ] [^] [ ]', log.output[1])
+
+    def test_undo_redo(self):
+        """
+        Test undoing and redoing the state changes of the robot.
+        """
+        robot = ToyRobot(history=100)
+        robot.place('PLACE 0,0,NORTH')
+        robot.move()
+        robot.right()
+        robot.move()
+
+        robot.undo(2)
+        self.assertEqual(robot.report(), 'Output: 0,1,NORTH')
+        robot.redo()
+        self.assertEqual(robot.report(), 'Output: 0,1,EAST')
+        robot.undo(10)
+        self.assertFalse(robot.is_placed)
+        self.assertEqual(robot.facing, None)
+
+    def test_undo_without_history(self):
+        """
+        Test that UNDO is rejected when the history is not enabled.
+        """
+        self.robot.place('PLACE 0,0,NORTH')
+        with self.assertLogs('ToyRobot', level='ERROR'):
+            self.robot.undo()
+        self.assertEqual(self.robot.report(), 'Output: 0,0,NORTH')
+
     def test_move_when_not_placed(self):
         """
         Test the move method when the robot is not placed on the board.
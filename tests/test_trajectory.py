@@ -0,0 +1,85 @@
+import os
+import sys
+import random
+import tempfile
+import unittest
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from trajectory import Trajectory
+from toy_robot import ToyRobot
+from main import parse_command
+
+class TestTrajectory(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Record a seeded random walk in chunks of 100 records.
+        """
+        self.trajectory = Trajectory(chunk_size=100)
+        self.addCleanup(self.trajectory.close)
+        rng = random.Random(5)
+        self.records = []
+        step = 0
+        for _ in range(1050):
+            step += rng.randint(1, 3)
+            record = (step, rng.randrange(6), rng.randrange(6), rng.randrange(8))
+            self.trajectory.record(record[1], record[2], record[3], step)
+            self.records.append(record)
+
+    def test_chunks_spilled(self):
+        """
+        Test that full chunks are written to disk and only the last one is kept in memory.
+        """
+        self.assertEqual(len(self.trajectory), 1050)
+        self.assertEqual(len(os.listdir(self.trajectory.directory)), 10)
+        self.assertEqual(len(self.trajectory._columns[0]), 50)
+
+    def test_window(self):
+        """
+        Test range queries by step across chunks and the records in memory.
+        """
+        for start, stop in ((0, 10), (150, 700), (1500, 5000), (0, None)):
+            expected = [record for record in self.records if start <= record[0] and (stop is None or record[0] < stop)]
+            self.assertEqual(list(self.trajectory.window(start, stop)), expected)
+
+    def test_visits(self):
+        """
+        Test that the visits of a cell match a scan of every record.
+        """
+        for x, y in ((0, 0), (3, 5), (5, 2)):
+            expected = [(step, facing) for step, cell_x, cell_y, facing in self.records if (cell_x, cell_y) == (x, y)]
+            self.assertEqual(list(self.trajectory.visits(x, y)), expected)
+
+    def test_open(self):
+        """
+        Test reopening the chunk files of a recording and appending to it.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            trajectory = Trajectory(directory, chunk_size=100)
+            for step, x, y, facing in self.records:
+                trajectory.record(x, y, facing, step)
+            trajectory.close()
+
+            reopened = Trajectory.open(directory)
+            self.assertEqual(list(reopened.window()), self.records)
+            self.assertEqual(list(reopened.visits(3, 5)), list(self.trajectory.visits(3, 5)))
+            reopened.record(1, 1, 0)
+            self.assertEqual(list(reopened.window(self.records[-1][0] + 1)), [(self.records[-1][0] + 1, 1, 1, 0)])
+
+    def test_robot_recording(self):
+        """
+        Test that a robot records its position after every command.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            trajectory = Trajectory(directory)
+            robot = ToyRobot(quiet=True, trajectory=trajectory)
+            for command in ('MOVE', 'PLACE 0,0,NORTH', 'MOVE', 'RIGHT', 'MOVE 3', 'REPORT', 'MOVE 9'):
+                parse_command(robot, command)
+            self.assertEqual(list(trajectory.window()), [
+                (0, 0, 0, 0), (1, 0, 1, 0), (2, 0, 1, 1), (3, 3, 1, 1), (4, 4, 1, 1)])
+            self.assertEqual(list(trajectory.window(1, 3)), [(1, 0, 1, 0), (2, 0, 1, 1)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import sys
+import random
+import unittest
+
+# Ensure app folder is in the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../app'))
+
+from transitions import TransitionTable
+from compiler import compile_commands, fold_runs, execute
+from obstacles import ObstacleMap
+from toy_robot import ToyRobot
+
+class TestTransitionTable(unittest.TestCase):
+
+    def test_tables_match_toy_robot(self):
+        """
+        Test every transition against a ToyRobot running the same command.
+        """
+        obstacles = ObstacleMap(4, 3, [(2, 1)])
+        table = TransitionTable(4, 3, obstacles)
+        robot = ToyRobot(4, 3, quiet=True, obstacles=obstacles)
+        for state in range(table.unplaced):
+            x, y, facing_index, _ = table.decode(state)
+            if obstacles.is_blocked(x, y):
+                continue
+            for command, transitions in (('move', table.move), ('left', table.left), ('right', table.right)):
+                robot.place_at(x, y, facing_index)
+                getattr(robot, command)()
+                self.assertEqual(table.decode(transitions[state]), (robot.x, robot.y, robot.facing_index, True))
+        self.assertEqual(table.move[table.unplaced], table.unplaced)
+
+    def test_execute_matches_compiler(self):
+        """
+        Test that running a compiled program on the tables gives the same reports and state as on a ToyRobot.
+        """
+        rng = random.Random(4)
+        choices = ['MOVE', 'MOVE', 'MOVE 3', 'LEFT', 'RIGHT', 'REPORT', 'PLACE 1,2,EAST', 'PLACE 4,0,NW', 'PLACE 9,9,NORTH', 'JUMP']
+        table = TransitionTable(6, 5)
+        for _ in range(30):
+            commands = []
+            for _ in range(100):
+                commands.extend([rng.choice(choices)] * rng.randint(1, 6))
+            for program in (compile_commands(commands, 6, 5), fold_runs(compile_commands(commands, 6, 5))):
+                robot = ToyRobot(6, 5, quiet=True)
+                outputs = execute(program, robot)
+                with self.assertNoLogs(level='ERROR'):
+                    self.assertEqual(table.execute(program), (outputs, table.encode(robot.x, robot.y, robot.facing_index) if robot.is_placed else table.unplaced))
+
+    def test_repeat(self):
+        """
+        Test that repeating a block matches running it over and over.
+        """
+        table = TransitionTable(7, 7)
+        block = ('MOVE', 'MOVE', 'RIGHT', 'MOVE', 'LEFT', 'LEFT')
+        transform = table.compose(block)
+        state = table.encode(1, 3, 'NORTH')
+        for count in (0, 1, 2, 5, 13, 64, 100):
+            expected = state
+            for _ in range(count):
+                expected = transform[expected]
+            self.assertEqual(table.repeat(state, block, count), expected)
+        self.assertEqual(table.repeat(state, ('MOVE',), 10 ** 18), table.encode(1, 6, 'NORTH'))
+
+    def test_repeat_cache_bounded(self):
+        """
+        Test that only the transforms of the cache_size most recently used blocks are kept.
+        """
+        table = TransitionTable(4, 4, cache_size=2)
+        state = table.encode(0, 0, 'NORTH')
+        blocks = [('MOVE',), ('MOVE', 'RIGHT'), ('LEFT', 'MOVE')]
+        results = [table.repeat(state, block, 37) for block in blocks]
+        self.assertEqual(list(table._powers), blocks[1:])
+        self.assertEqual([table.repeat(state, block, 37) for block in blocks], results)
+        self.assertEqual(len(table._powers), 2)
+
+    def test_execute_move_n_without_tables(self):
+        """
+        Test that MOVE_N stops at the edge or an obstacle without building repeat() tables, whatever its count.
+        """
+        obstacles = ObstacleMap(6, 6, [(2, 4)])
+        table = TransitionTable(6, 6, obstacles)
+        program = compile_commands(['PLACE 2,0,NORTH', 'MOVE 3', 'REPORT', 'RIGHT', 'MOVE 9999999999', 'REPORT'], 6, 6, obstacles)
+        program.operands[4] = 2 ** 31 - 1
+        self.assertEqual(table.execute(program), (['Output: 2,3,NORTH', 'Output: 5,3,EAST'], table.encode(5, 3, 'EAST')))
+        self.assertEqual(table._powers, {})
+
+    def test_execute_board_mismatch(self):
+        """
+        Test that a program compiled for another board is rejected.
+        """
+        with self.assertRaises(ValueError):
+            TransitionTable(5, 5).execute(compile_commands(['MOVE'], 6, 6))
+
+    def test_execute_place_on_obstacle(self):
+        """
+        Test that a PLACE on an obstacle leaves the state unchanged, even in a program compiled without the obstacles.
+        """
+        obstacles = ObstacleMap(5, 5, [(1, 1)])
+        table = TransitionTable(5, 5, obstacles)
+        for program in (compile_commands(['PLACE 1,1,NORTH', 'REPORT', 'PLACE 0,1,EAST', 'PLACE 1,1,NORTH', 'REPORT']),
+                        compile_commands(['PLACE 1,1,NORTH', 'REPORT', 'PLACE 0,1,EAST', 'PLACE 1,1,NORTH', 'REPORT'], obstacles=obstacles)):
+            self.assertEqual(table.execute(program), (['Output: 0,1,EAST'], table.encode(0, 1, 'EAST')))
+        with self.assertRaises(ValueError):
+            TransitionTable(6, 5, obstacles)
+
+if __name__ == '__main__':
+    unittest.main()